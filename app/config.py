@@ -6,10 +6,105 @@ load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 NCBI_API_KEY = os.getenv("NCBI_API_KEY", "")
 
-# PubMed E-utilities base URLs
-PUBMED_ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-PUBMED_EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+# PubMed E-utilities base URLs (벤치마크 시 로컬 스텁 서버로 교체 가능)
+PUBMED_EUTILS_BASE_URL = os.getenv(
+    "PUBMED_EUTILS_BASE_URL", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+).rstrip("/")
+PUBMED_ESEARCH_URL = f"{PUBMED_EUTILS_BASE_URL}/esearch.fcgi"
+PUBMED_EFETCH_URL = f"{PUBMED_EUTILS_BASE_URL}/efetch.fcgi"
+
+# iCite API URL
+ICITE_API_URL = os.getenv("ICITE_API_URL", "https://icite.od.nih.gov/api/pubs")
+
+# Groq API URL (비워두면 SDK 기본값 사용)
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None
 
 # Default settings
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
+
+# 이 시간(ms)을 넘는 요청은 스팬 트리와 함께 슬로우 로그에 기록
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "2000"))
+
+# 앱 워커 프로세스 수 (uvicorn도 같은 환경 변수를 --workers 기본값으로 사용)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# 워커들이 함께 쓰는 캐시와 레이트 리밋 상태 저장소 (sqlite:///경로, redis://host:port/db, memory)
+# 여러 워커로 실행하면서 지정하지 않으면 SQLite 파일을 사용
+SHARED_STATE_URL = os.getenv("SHARED_STATE_URL") or ("sqlite:///data/shared.db" if WEB_CONCURRENCY > 1 else "")
+# 공유 저장소 응답을 기다리는 최대 시간 (초, SQLite 잠금 대기와 Redis 소켓 타임아웃). 넘기면 프로세스 안 상태로 진행
+SHARED_STATE_TIMEOUT = float(os.getenv("SHARED_STATE_TIMEOUT", "0.25"))
+
+# CPU 작업(XML 파싱, 분석) 실행 방식: thread, process, inline(이벤트 루프에서 직접 실행)
+CPU_EXECUTOR = os.getenv("CPU_EXECUTOR", "thread")
+# 기본값은 코어 수를 워커 프로세스들이 나눠 가진 값
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", "0")) or max((os.cpu_count() or 1) // WEB_CONCURRENCY, 1)
+
+# efetch XML을 이 논문 수 단위로 나누어 병렬 파싱
+PARSE_CHUNK_SIZE = int(os.getenv("PARSE_CHUNK_SIZE", "100"))
+
+# 이벤트 루프 지연 측정 주기 (초)
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+
+# 캐시 설정 (CACHE_DIR에 주기적으로 저장하고 시작 시 복원)
+CACHE_DIR = os.getenv("CACHE_DIR", "data/cache")
+CACHE_SAVE_INTERVAL = float(os.getenv("CACHE_SAVE_INTERVAL", "300"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "600"))
+PAPER_CACHE_TTL = float(os.getenv("PAPER_CACHE_TTL", "86400"))
+CITATION_CACHE_TTL = float(os.getenv("CITATION_CACHE_TTL", "86400"))
+PAPER_CACHE_SIZE = int(os.getenv("PAPER_CACHE_SIZE", "20000"))
+
+# 빠른 시작 모드: 포트 바인딩 후 백그라운드에서 캐시 복원과 커넥션 예열 수행
+FAST_STARTUP = os.getenv("FAST_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# 백그라운드 작업 설정
+JOBS_DIR = os.getenv("JOBS_DIR", "data/jobs")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "50"))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# 로컬 논문 저장소 (python -m app.ingest 로 NCBI baseline/update 파일을 수집)
+PAPER_STORE_PATH = os.getenv("PAPER_STORE_PATH", "data/papers.db")
+
+# 저장된 검색 (주기적으로 새 논문만 가져와 병합)
+SAVED_SEARCHES_DIR = os.getenv("SAVED_SEARCHES_DIR", "data/saved_searches")
+
+# NCBI E-utilities 초당 요청 한도 (API 키가 있으면 10, 없으면 3)
+NCBI_RATE_LIMIT = float(os.getenv("NCBI_RATE_LIMIT", "10" if NCBI_API_KEY else "3"))
+
+# 다음 검색 페이지 미리 가져오기 (클라이언트가 prefetch=true로 요청한 경우에만 동작)
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+# 미리 가져오기는 사용자 요청 몫으로 이만큼의 토큰을 남겨둔 상태에서만 호출
+PREFETCH_RESERVE_TOKENS = float(os.getenv("PREFETCH_RESERVE_TOKENS", "1"))
+IR_CACHE_TTL = float(os.getenv("IR_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Groq 호출 한도 (초당 요청 수와 순간 최대 요청 수)
+GROQ_RATE_LIMIT = float(os.getenv("GROQ_RATE_LIMIT", "0.5"))
+GROQ_RATE_BURST = float(os.getenv("GROQ_RATE_BURST", "30"))
+
+# 요청 처리 마감 시간 (초). 응답을 시작하기 전에 지나면 업스트림 호출을 취소하고 504 반환
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "60"))
+
+# efetch는 이 PMID 수 단위로 나누어 동시에 최대 EFETCH_CONCURRENCY개까지 요청
+EFETCH_CHUNK_SIZE = int(os.getenv("EFETCH_CHUNK_SIZE", "200"))
+EFETCH_CONCURRENCY = int(os.getenv("EFETCH_CONCURRENCY", "3"))
+
+# 논문 채팅 프롬프트에 넣을 검색 구절의 토큰 예산 (대략 4글자 = 1토큰)
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "2000"))
+
+# 유사 논문/중복 탐지용 MinHash LSH 인덱스 경로와 중복 판정 기준 (추정 Jaccard 유사도)
+MINHASH_INDEX_PATH = os.getenv("MINHASH_INDEX_PATH", "data/minhash.db")
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+
+# MeSH 트리 인덱스 (python -m app.mesh_index 로 디스크립터 파일에서 생성)
+MESH_INDEX_PATH = os.getenv("MESH_INDEX_PATH", "data/mesh_tree.idx")
+
+# LLM(Groq) 작업 전체 동시 실행 수. 엔드포인트 종류별 한도와 대기열 길이는 app/services/admission.py 참고
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+
+# 업스트림(E-utilities, iCite) 지연 적응: 타임아웃은 최근 p95의 FACTOR배 (FLOOR초 이상, 호출별 기본값 이하)
+UPSTREAM_TIMEOUT_FACTOR = float(os.getenv("UPSTREAM_TIMEOUT_FACTOR", "3"))
+UPSTREAM_TIMEOUT_FLOOR = float(os.getenv("UPSTREAM_TIMEOUT_FLOOR", "3"))
+# 멱등 GET이 최근 응답 시간의 이 분위수를 넘기면 같은 요청을 한 번 더 보내고 먼저 온 응답 사용
+UPSTREAM_HEDGING = os.getenv("UPSTREAM_HEDGING", "true").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
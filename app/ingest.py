@@ -0,0 +1,175 @@
+"""NCBI PubMed baseline/update 파일을 로컬 논문 저장소로 수집합니다.
+
+사용법:
+    python -m app.ingest /path/to/pubmed --workers 4
+
+디렉터리의 pubmed*.xml.gz 파일을 이름순(baseline → update 순서)으로 처리합니다.
+파일 파싱은 프로세스 풀에서 병렬로 하고, 저장은 파일 순서대로 파일당 한 트랜잭션으로 기록해
+나중 update 파일의 개정/삭제가 항상 앞선 파일보다 뒤에 적용됩니다.
+완료된 파일은 체크포인트로 남으므로 중단 후 다시 실행하면 남은 파일부터 이어서 수집합니다.
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from app.config import PAPER_STORE_PATH, MINHASH_INDEX_PATH
+from app.models.record import PaperRecord
+from app.services.pubmed import parse_article
+from app.services.store import PaperStore
+from app.services.similarity import MinHashIndex, compute_signatures
+
+
+@dataclass
+class ParsedFile:
+    name: str
+    size: int
+    mtime: float
+    records: list[PaperRecord]
+    signatures: list[tuple[str, bytes]]
+    deleted: list[str]
+    errors: int
+    seconds: float
+
+
+def parse_file(path: Path) -> ParsedFile:
+    """gzip XML 파일 하나를 스트리밍 파싱합니다 (워커 프로세스에서 실행).
+
+    파싱이 끝난 요소는 바로 비워 파일 전체를 메모리에 올리지 않습니다.
+    """
+
+    start = time.perf_counter()
+    stat = path.stat()
+    records: list[PaperRecord] = []
+    deleted: list[str] = []
+    errors = 0
+
+    with gzip.open(path, "rb") as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event != "end":
+                continue
+            if elem.tag == "PubmedArticle":
+                try:
+                    records.append(parse_article(elem))
+                except Exception as e:
+                    errors += 1
+                    print(f"Error parsing article in {path.name}: {e}", file=sys.stderr)
+                elem.clear()
+                root.clear()
+            elif elem.tag == "DeleteCitation":
+                deleted.extend(pmid.text for pmid in elem.findall("PMID") if pmid.text)
+                elem.clear()
+
+    return ParsedFile(
+        name=path.name,
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        records=records,
+        signatures=compute_signatures(records),
+        deleted=deleted,
+        errors=errors,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def find_files(directory: Path) -> list[Path]:
+    return sorted(directory.glob("pubmed*.xml.gz"), key=lambda p: p.name)
+
+
+def ingest(directory: Path, store: PaperStore, index: MinHashIndex, workers: int) -> None:
+    files = find_files(directory)
+    pending = []
+    for path in files:
+        stat = path.stat()
+        if store.is_ingested(path.name, stat.st_size, stat.st_mtime):
+            continue
+        pending.append(path)
+
+    print(f"파일 {len(files)}개 중 {len(files) - len(pending)}개는 이미 수집됨, {len(pending)}개 처리 (워커 {workers}개)")
+    if not pending:
+        return
+
+    total_articles = 0
+    total_deleted = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # 파싱 결과가 메모리에 너무 쌓이지 않도록 앞서 제출하는 파일 수를 제한
+        window: deque[Future] = deque()
+        remaining = iter(pending)
+
+        def fill() -> None:
+            while len(window) < workers * 2:
+                path = next(remaining, None)
+                if path is None:
+                    return
+                window.append(pool.submit(parse_file, path))
+
+        fill()
+        while window:
+            parsed: ParsedFile = window.popleft().result()
+            fill()
+
+            write_start = time.perf_counter()
+            # 유사 논문 인덱스를 먼저 갱신해, 체크포인트가 남은 파일은 인덱스에도 반영되어 있도록 함
+            index.write_batch(parsed.signatures, parsed.deleted)
+            store.write_batch(
+                parsed.records,
+                parsed.deleted,
+                checkpoint={
+                    "name": parsed.name,
+                    "size": parsed.size,
+                    "mtime": parsed.mtime,
+                    "articles": len(parsed.records),
+                    "deleted": len(parsed.deleted),
+                },
+            )
+            write_seconds = time.perf_counter() - write_start
+
+            total_articles += len(parsed.records)
+            total_deleted += len(parsed.deleted)
+            rate = len(parsed.records) / max(parsed.seconds, 1e-9)
+            print(
+                f"{parsed.name}: {len(parsed.records)}편, 삭제 {len(parsed.deleted)}건, 오류 {parsed.errors}건 "
+                f"(파싱 {parsed.seconds:.1f}s, {rate:,.0f} articles/s, 저장 {write_seconds:.1f}s)"
+            )
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"완료: {total_articles}편, 삭제 {total_deleted}건, {elapsed:.1f}s "
+        f"({total_articles / max(elapsed, 1e-9):,.0f} articles/s), 저장소 {store.count()}편"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="NCBI PubMed baseline/update 파일 수집")
+    parser.add_argument("directory", type=Path, help="pubmed*.xml.gz 파일이 있는 디렉터리")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="파싱 프로세스 수")
+    parser.add_argument("--store", type=Path, default=Path(PAPER_STORE_PATH), help="논문 저장소 경로")
+    parser.add_argument(
+        "--minhash-index", type=Path, default=Path(MINHASH_INDEX_PATH), help="유사 논문 MinHash 인덱스 경로"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.directory.is_dir():
+        parser.error(f"디렉터리가 없습니다: {args.directory}")
+
+    store = PaperStore(args.store)
+    index = MinHashIndex(args.minhash_index)
+    try:
+        ingest(args.directory, store, index, max(1, args.workers))
+    finally:
+        store.close()
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,72 @@
-from fastapi import FastAPI, Request
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 
-from app.routers import search_router, analysis_router, export_router
+from app.routers import search_router, analysis_router, export_router, jobs_router, saved_searches_router
+from app.middleware import CompressionMiddleware, RequestScopeMiddleware
+from app.config import (
+    SLOW_REQUEST_THRESHOLD_MS,
+    LOOP_LAG_INTERVAL,
+    FAST_STARTUP,
+    CACHE_SAVE_INTERVAL,
+    REQUEST_TIMEOUT_SECONDS,
+)
+from app.services.executor import get_executor, shutdown_executor
+from app.services.loop_monitor import monitor_event_loop_lag
+from app.services.http import close_http_client
+from app.services.warmup import prewarm, restore_caches, save_caches, periodic_cache_save
+from app.services.jobs import job_manager
+from app.services.prefetch import prefetcher
+from app.services.admission import AdmissionRejected
+from app.services.metrics import HTTP_REQUEST_SECONDS, render_metrics, mark_process_dead
+from app.services.timing import start_trace, server_timing_header, log_slow_request
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 시 백그라운드 작업과 executor를 관리합니다."""
+
+    get_executor()
+    background = [
+        asyncio.create_task(monitor_event_loop_lag(LOOP_LAG_INTERVAL)),
+        asyncio.create_task(periodic_cache_save(CACHE_SAVE_INTERVAL)),
+    ]
+
+    if FAST_STARTUP:
+        # 시작을 기다리지 않고 요청을 받으면서 예열
+        background.append(asyncio.create_task(prewarm()))
+    else:
+        await restore_caches()
+
+    await job_manager.start()
+
+    yield
+
+    await job_manager.stop()
+    await prefetcher.stop()
+    for task in background:
+        task.cancel()
+    try:
+        await save_caches()
+    except Exception as e:
+        print(f"캐시 저장 오류: {e}")
+    await close_http_client()
+    shutdown_executor()
+    mark_process_dead()
+
 
 # FastAPI 앱 생성
 app = FastAPI(
     title="PubMed 논문 분석기",
     description="PubMed 논문 검색, 키워드/트렌드 분석, AI 요약 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -20,8 +76,68 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing"],
 )
 
+# 응답 압축 (brotli 우선, gzip 대체)
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """라우트별 요청 처리 시간을 기록합니다."""
+
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # 경로 파라미터(pmid 등)로 레이블이 폭증하지 않도록 라우트 템플릿 사용
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        HTTP_REQUEST_SECONDS.labels(
+            method=request.method,
+            route=route_path,
+            status=str(status),
+        ).observe(time.perf_counter() - start)
+
+
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    """요청 단계별 시간을 Server-Timing 헤더로 내보내고 느린 요청을 기록합니다."""
+
+    root = start_trace()
+    response = await call_next(request)
+    root.end = time.perf_counter()
+
+    response.headers["Server-Timing"] = server_timing_header(root)
+    log_slow_request(
+        root,
+        method=request.method,
+        path=request.url.path,
+        status=response.status_code,
+        threshold_ms=SLOW_REQUEST_THRESHOLD_MS,
+    )
+    return response
+
+
+# 요청별 취소 범위와 마감 시각 (가장 바깥에서 요청 전체를 감싸도록 마지막에 추가)
+app.add_middleware(RequestScopeMiddleware, timeout=REQUEST_TIMEOUT_SECONDS)
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """LLM 대기열이 가득 찬 요청은 기다리게 하지 않고 바로 503으로 돌려보냅니다."""
+
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # 정적 파일 및 템플릿 설정
 BASE_DIR = Path(__file__).resolve().parent.parent
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
@@ -31,6 +147,8 @@ templates = Jinja2Templates(directory=str(BASE_DIR / "app" / "templates"))
 app.include_router(search_router)
 app.include_router(analysis_router)
 app.include_router(export_router)
+app.include_router(jobs_router)
+app.include_router(saved_searches_router)
 
 
 @app.get("/")
@@ -45,6 +163,13 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 메트릭 엔드포인트"""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,95 @@
+"""NLM MeSH 디스크립터 파일로 MeSH 트리 인덱스를 만듭니다.
+
+사용법:
+    python -m app.mesh_index /path/to/desc2025.xml
+    python -m app.mesh_index /path/to/d2025.bin --out data/mesh_tree.idx
+
+XML(desc*.xml)과 ASCII(d*.bin) 형식을 모두 지원하며 .gz로 압축된 파일도 읽습니다.
+만들어진 인덱스는 서버가 메모리 매핑해 MeSH 롤업 분석에 사용하며, 파일을 교체하면 다음 요청부터 반영됩니다.
+"""
+
+import argparse
+import gzip
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import IO, Iterator
+from app.config import MESH_INDEX_PATH
+from app.services.mesh import write_mesh_index
+
+Descriptor = tuple[str, str, list[str]]
+
+
+def _open(path: Path) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def parse_descriptor_xml(f: IO[bytes]) -> Iterator[Descriptor]:
+    """desc*.xml을 스트리밍 파싱해 (UI, 이름, 트리 번호 목록)을 반환합니다."""
+
+    context = ET.iterparse(f, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event != "end" or elem.tag != "DescriptorRecord":
+            continue
+        ui = elem.findtext("DescriptorUI", "")
+        name = elem.findtext("DescriptorName/String", "")
+        trees = [t.text for t in elem.findall("TreeNumberList/TreeNumber") if t.text]
+        if ui and name:
+            yield ui, name, trees
+        root.clear()
+
+
+def parse_descriptor_ascii(f: IO[bytes]) -> Iterator[Descriptor]:
+    """d*.bin (MeSH ASCII 형식)을 읽어 (UI, 이름, 트리 번호 목록)을 반환합니다."""
+
+    ui, name, trees = "", "", []
+    for raw in f:
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if line == "*NEWRECORD":
+            if ui and name:
+                yield ui, name, trees
+            ui, name, trees = "", "", []
+            continue
+        key, sep, value = line.partition(" = ")
+        if not sep:
+            continue
+        if key == "MH":
+            name = value
+        elif key == "MN":
+            trees.append(value)
+        elif key == "UI":
+            ui = value
+    if ui and name:
+        yield ui, name, trees
+
+
+def read_descriptors(path: Path) -> list[Descriptor]:
+    with _open(path) as f:
+        is_xml = f.read(64).lstrip().startswith(b"<")
+    with _open(path) as f:
+        parser = parse_descriptor_xml if is_xml else parse_descriptor_ascii
+        return list(parser(f))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="MeSH 트리 인덱스 생성")
+    parser.add_argument("descriptor_file", type=Path, help="MeSH 디스크립터 파일 (desc*.xml 또는 d*.bin, .gz 가능)")
+    parser.add_argument("--out", type=Path, default=Path(MESH_INDEX_PATH), help="인덱스 파일 경로")
+    args = parser.parse_args(argv)
+
+    if not args.descriptor_file.is_file():
+        parser.error(f"파일이 없습니다: {args.descriptor_file}")
+
+    start = time.perf_counter()
+    descriptors = read_descriptors(args.descriptor_file)
+    header = write_mesh_index(args.out, descriptors, source=args.descriptor_file.name)
+    print(
+        f"완료: 디스크립터 {header['descriptors']:,}개, 트리 노드 {header['nodes']:,}개, "
+        f"최대 깊이 {header['max_depth']}, {args.out.stat().st_size / 1e6:.1f}MB "
+        f"({time.perf_counter() - start:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
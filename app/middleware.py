@@ -0,0 +1,255 @@
+import asyncio
+import json
+import zlib
+from app.services.deadline import set_deadline, reset_deadline
+from app.services.metrics import REQUESTS_CANCELLED
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip만 사용
+    brotli = None
+
+# 압축 효과가 있는 텍스트 계열 타입만 압축 (SSE는 이벤트 단위 전송이 지연되므로 제외)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "text/html",
+    "text/css",
+    "text/csv",
+    "text/plain",
+    "text/javascript",
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Accept-Encoding 헤더에서 사용할 인코딩(br 우선, 그다음 gzip)을 고릅니다."""
+
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token.strip()] = q
+
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    available = [enc for enc in candidates if weights.get(enc, weights.get("*", 0.0)) > 0]
+    if not available:
+        return None
+    return max(available, key=lambda enc: (weights.get(enc, weights.get("*", 0.0)), enc == "br"))
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _add_vary(headers: list) -> list:
+    """Vary 헤더에 Accept-Encoding을 추가합니다 (이미 있으면 그대로)."""
+
+    headers = list(headers)
+    for i, (key, value) in enumerate(headers):
+        if key.lower() == b"vary":
+            if b"accept-encoding" not in value.lower() and value.strip() != b"*":
+                headers[i] = (key, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+class CompressionMiddleware:
+    """brotli/gzip 응답 압축 ASGI 미들웨어
+
+    한 번에 끝나는 응답은 minimum_size 이상일 때만 압축하고,
+    스트리밍 응답은 청크 단위로 압축해 그대로 흘려보냅니다.
+    압축 가능한 형식의 응답에는 실제 압축 여부와 관계없이 Vary: Accept-Encoding을 붙여
+    공유 캐시가 다른 인코딩의 응답을 섞어 쓰지 않게 합니다.
+    """
+
+    def __init__(self, app, minimum_size: int = 500, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                response_headers = dict(message.get("headers") or [])
+                content_type = response_headers.get(b"content-type", b"").decode("latin-1")
+                compressible = content_type.startswith(COMPRESSIBLE_TYPES)
+                if compressible:
+                    message = {**message, "headers": _add_vary(message.get("headers") or [])}
+                passthrough = encoding is None or not compressible or b"content-encoding" in response_headers
+                if passthrough:
+                    await send(message)
+                else:
+                    # 본문을 보기 전까지 헤더 전송을 미룸 (작은 응답은 압축하지 않기 위해)
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start_message)
+                    await send(message)
+                    start_message = None
+                    passthrough = True
+                    return
+
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                response_headers = [
+                    (k, v) for k, v in start_message.get("headers", [])
+                    if k.lower() != b"content-length"
+                ]
+                response_headers.append((b"content-encoding", encoding.encode("latin-1")))
+
+                if not more_body:
+                    compressed = compressor.compress(body) + compressor.flush()
+                    response_headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+                    await send({**start_message, "headers": response_headers})
+                    await send({"type": "http.response.body", "body": compressed})
+                    start_message = None
+                    return
+
+                await send({**start_message, "headers": response_headers})
+                start_message = None
+
+            chunk = compressor.compress(body)
+            if not more_body:
+                chunk += compressor.flush()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class RequestScopeMiddleware:
+    """요청마다 취소 범위와 마감 시각을 두는 ASGI 미들웨어
+
+    요청 처리를 별도 태스크로 실행하고, 클라이언트 연결이 끊기면 그 태스크를 취소해
+    진행 중인 업스트림 호출(esearch, efetch, iCite, Groq)까지 함께 멈춥니다.
+    응답을 시작하기 전에 마감 시각이 지나면 취소 후 504를 반환하며,
+    응답이 시작된 스트리밍 요청은 연결이 끊길 때만 취소합니다.
+    클라이언트는 X-Request-Timeout 헤더(초)로 마감을 기본값보다 짧게 줄일 수 있습니다.
+    """
+
+    def __init__(self, app, timeout: float):
+        self.app = app
+        self.timeout = timeout
+
+    def _timeout_for(self, scope) -> float:
+        headers = dict(scope.get("headers") or [])
+        try:
+            requested = float(headers.get(b"x-request-timeout", b""))
+        except ValueError:
+            return self.timeout
+        return min(self.timeout, requested) if requested > 0 else self.timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = self._timeout_for(scope)
+        messages: asyncio.Queue = asyncio.Queue()
+        response_started = False
+        response_complete = False
+
+        async def receive_wrapper():
+            return await messages.get()
+
+        async def send_wrapper(message):
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        async def listen_for_disconnect():
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        # 마감 시각은 요청 처리 태스크의 컨텍스트로 전달됨
+        token = set_deadline(timeout)
+        try:
+            app_task = asyncio.create_task(self.app(scope, receive_wrapper, send_wrapper))
+        finally:
+            reset_deadline(token)
+        listener = asyncio.create_task(listen_for_disconnect())
+
+        try:
+            done, _ = await asyncio.wait({app_task, listener}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done and response_started:
+                # 스트리밍 응답은 마감 없이 끝나거나 연결이 끊길 때까지 진행
+                done, _ = await asyncio.wait({app_task, listener}, return_when=asyncio.FIRST_COMPLETED)
+
+            if app_task in done or response_complete:
+                # 응답을 다 보낸 뒤의 연결 종료는 정상 종료이므로 마무리 작업을 기다림
+                await app_task
+                return
+
+            app_task.cancel()
+            await asyncio.gather(app_task, return_exceptions=True)
+
+            if listener in done:
+                REQUESTS_CANCELLED.labels(reason="disconnect").inc()
+                return
+
+            REQUESTS_CANCELLED.labels(reason="deadline").inc()
+            if not response_started:
+                body = json.dumps({"detail": "요청 처리 시간이 초과되었습니다."}, ensure_ascii=False).encode("utf-8")
+                await send({
+                    "type": "http.response.start",
+                    "status": 504,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode("latin-1")),
+                    ],
+                })
+                await send({"type": "http.response.body", "body": body})
+        finally:
+            listener.cancel()
+            if not app_task.done():
+                app_task.cancel()
@@ -1,27 +1,64 @@
 from .schemas import (
     Paper,
+    MeshTerm,
     SearchRequest,
     SearchResponse,
+    RelatedPaper,
+    RelatedPapersResponse,
     SummarizeRequest,
     SummaryResponse,
     KeywordAnalysis,
     TrendAnalysis,
     AuthorAnalysis,
+    NetworkNode,
+    NetworkEdge,
+    NetworkAnalysis,
+    MeshRollupItem,
+    MeshRollup,
     ChatMessage,
     ChatRequest,
     ChatResponse,
+    JobRequest,
+    JobStatus,
+    SavedSearchCreate,
+    SavedSearchInfo,
+    SavedSearchRefresh,
+    BatchSearchQuery,
+    BatchSearchRequest,
+    BatchSearchResult,
+    BatchSearchResponse,
 )
+from .record import PaperRecord, MeshHeading
 
 __all__ = [
     "Paper",
+    "MeshTerm",
     "SearchRequest",
     "SearchResponse",
+    "RelatedPaper",
+    "RelatedPapersResponse",
     "SummarizeRequest",
     "SummaryResponse",
     "KeywordAnalysis",
     "TrendAnalysis",
     "AuthorAnalysis",
+    "NetworkNode",
+    "NetworkEdge",
+    "NetworkAnalysis",
+    "MeshRollupItem",
+    "MeshRollup",
     "ChatMessage",
     "ChatRequest",
     "ChatResponse",
+    "JobRequest",
+    "JobStatus",
+    "SavedSearchCreate",
+    "SavedSearchInfo",
+    "SavedSearchRefresh",
+    "BatchSearchQuery",
+    "BatchSearchRequest",
+    "BatchSearchResult",
+    "BatchSearchResponse",
+    "PaperRecord",
+    "MeshHeading",
 ]
@@ -0,0 +1,93 @@
+import sys
+from dataclasses import dataclass, fields, MISSING
+from typing import NamedTuple
+from app.models.schemas import Paper, MeshTerm
+
+
+class MeshHeading(NamedTuple):
+    """MeSH 주제어 하나 (디스크립터 UI, 이름, 한정어 이름 목록, 주요 주제 여부)"""
+
+    ui: str
+    name: str
+    qualifiers: tuple[str, ...] = ()
+    major: bool = False
+
+
+@dataclass(slots=True)
+class PaperRecord:
+    """내부 파이프라인용 경량 논문 레코드
+
+    pydantic 검증 비용 없이 생성되며, 저자/키워드는 튜플로 저장하고 저자명·저널명·MeSH 용어처럼
+    여러 논문에 반복되는 문자열은 intern하여 같은 객체를 공유합니다.
+    API 응답 직전에만 to_paper()로 Paper 모델로 변환합니다.
+    """
+
+    pmid: str
+    title: str
+    authors: tuple[str, ...]
+    abstract: str
+    pub_date: str
+    journal: str
+    keywords: tuple[str, ...] = ()  # 저자 키워드
+    pmc_id: str | None = None
+    citation_count: int | None = None
+    is_ir_related: bool = False
+    # 구조화 초록의 섹션 위치: (섹션 이름, abstract 내 시작, 끝) 오프셋
+    abstract_sections: tuple[tuple[str, int, int], ...] = ()
+    mesh: tuple[MeshHeading, ...] = ()
+
+    def __post_init__(self):
+        self.authors = tuple(sys.intern(author) for author in self.authors)
+        self.keywords = tuple(sys.intern(keyword) for keyword in self.keywords)
+        self.journal = sys.intern(self.journal)
+        self.abstract_sections = tuple(
+            (sys.intern(label), start, end) for label, start, end in self.abstract_sections
+        )
+        self.mesh = tuple(
+            MeshHeading(
+                sys.intern(heading.ui),
+                sys.intern(heading.name),
+                tuple(sys.intern(q) for q in heading.qualifiers),
+                heading.major,
+            )
+            for heading in self.mesh
+        )
+
+    def __setstate__(self, state):
+        # 필드가 추가되기 전에 저장된 캐시 스냅샷도 복원되도록 빠진 필드는 기본값으로 채움
+        _, slots = state
+        for f in fields(self):
+            if f.name in slots:
+                setattr(self, f.name, slots[f.name])
+            elif f.default is not MISSING:
+                setattr(self, f.name, f.default)
+
+    def sections(self) -> list[tuple[str, str]]:
+        """초록을 (섹션 이름, 본문) 목록으로 반환합니다. 비구조화 초록은 이름 없는 섹션 하나입니다."""
+
+        if self.abstract_sections:
+            return [(label, self.abstract[start:end]) for label, start, end in self.abstract_sections]
+        return [("", self.abstract)] if self.abstract else []
+
+    def terms(self) -> tuple[str, ...]:
+        """저자 키워드와 MeSH 디스크립터 이름 (키워드 빈도/네트워크 분석과 API keywords 필드용)"""
+        return self.keywords + tuple(heading.name for heading in self.mesh)
+
+    def to_paper(self) -> Paper:
+        """API 응답용 Paper 모델로 변환합니다."""
+        return Paper(
+            pmid=self.pmid,
+            title=self.title,
+            authors=list(self.authors),
+            abstract=self.abstract,
+            pub_date=self.pub_date,
+            journal=self.journal,
+            keywords=list(self.terms()),
+            mesh=[
+                MeshTerm(ui=h.ui, name=h.name, qualifiers=list(h.qualifiers), major=h.major)
+                for h in self.mesh
+            ],
+            pmc_id=self.pmc_id,
+            citation_count=self.citation_count,
+            is_ir_related=self.is_ir_related,
+        )
@@ -1,8 +1,15 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
 from datetime import date
 
 
+class MeshTerm(BaseModel):
+    ui: str  # MeSH 디스크립터 UI (예: D006528)
+    name: str
+    qualifiers: list[str] = []
+    major: bool = False  # 주요 주제 여부 (디스크립터나 한정어 중 하나라도 MajorTopicYN="Y")
+
+
 class Paper(BaseModel):
     pmid: str
     title: str
@@ -10,7 +17,8 @@ class Paper(BaseModel):
     abstract: str
     pub_date: str
     journal: str
-    keywords: list[str] = []
+    keywords: list[str] = []  # 저자 키워드와 MeSH 용어 이름
+    mesh: list[MeshTerm] = []  # MeSH 주제어 (UI, 한정어 포함)
     pmc_id: str | None = None  # PMC ID (무료 전문 PDF 제공 시)
     citation_count: int | None = None  # 피인용 횟수 (iCite)
     is_ir_related: bool = False  # 인터벤션 영상의학과 관련 여부
@@ -30,6 +38,17 @@ class SearchResponse(BaseModel):
     page: int
     page_size: int
     papers: list[Paper]
+    # dedup 요청 시 목록에서 뺀 중복 논문 (남긴 논문 PMID → 중복 PMID 목록)
+    duplicates: dict[str, list[str]] = {}
+
+
+class RelatedPaper(Paper):
+    similarity: float  # 제목·초록 단어 집합의 추정 Jaccard 유사도
+
+
+class RelatedPapersResponse(BaseModel):
+    pmid: str
+    papers: list[RelatedPaper]
 
 
 class SummarizeRequest(BaseModel):
@@ -57,6 +76,45 @@ class AuthorAnalysis(BaseModel):
     count: int
 
 
+class NetworkNode(BaseModel):
+    id: int
+    label: str
+    count: int  # 항목이 나온 논문 수
+    degree: int  # 연결된 항목 수
+    strength: int  # 동시 출현 횟수 합
+    component: int  # 연결 요소 번호
+
+
+class NetworkEdge(BaseModel):
+    source: int
+    target: int
+    weight: int  # 함께 나온 논문 수
+    jaccard: float
+
+
+class NetworkAnalysis(BaseModel):
+    kind: str  # keyword / coauthor
+    papers: int
+    nodes: list[NetworkNode]
+    edges: list[NetworkEdge]
+
+
+class MeshRollupItem(BaseModel):
+    ui: str
+    name: str
+    tree_numbers: list[str]
+    count: int  # 이 디스크립터(또는 그 하위 디스크립터)가 달린 논문 수
+    percentage: float  # MeSH가 달린 논문 중 비율 (%)
+
+
+class MeshRollup(BaseModel):
+    depth: int
+    category: Optional[str] = None  # 트리 범주 (예: C = 질병)
+    papers: int  # 분석한 논문 수
+    tagged: int  # 인덱스에 있는 MeSH가 하나 이상 달린 논문 수
+    items: list[MeshRollupItem]
+
+
 class ChatMessage(BaseModel):
     role: str
     content: str
@@ -72,3 +130,97 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     response: str
     pmids: list[str]
+    # 이번 답변의 컨텍스트로 사용된 논문 PMID (관련도 순)
+    sources: list[str] = []
+
+
+class JobRequest(BaseModel):
+    type: Literal["search", "export", "analysis", "summary"]
+    query: Optional[str] = None
+    author: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    source: Literal["pubmed", "local"] = "pubmed"
+    max_results: int = Field(500, ge=1, le=10000)
+    analysis: Literal["keywords", "trends", "authors", "keyword_network", "coauthor_network"] = "keywords"
+    top_n: int = Field(20, ge=1, le=100)
+    pmids: list[str] = []
+    language: str = "korean"
+
+
+class JobStatus(BaseModel):
+    id: str
+    type: str
+    status: str
+    progress: float
+    message: str = ""
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    download_url: Optional[str] = None
+
+
+class SavedSearchCreate(BaseModel):
+    name: str
+    query: str
+    author: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    max_results: int = Field(500, ge=1, le=10000)
+
+
+class SavedSearchInfo(BaseModel):
+    id: str
+    name: str
+    query: str
+    author: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    max_results: int
+    total: int  # 저장된 논문 수
+    ir_related: int  # 그중 IR 관련 논문 수
+    unclassified: int = 0  # IR 판정이 실패해 다음 갱신 때 다시 판정할 논문 수
+    watermark: Optional[str] = None  # 마지막 갱신 기준 등록일 (YYYY/MM/DD, EDAT)
+    created_at: float
+    refreshed_at: Optional[float] = None
+
+
+class SavedSearchRefresh(BaseModel):
+    id: str
+    new_pmids: list[str]  # 이번 갱신에서 추가된 PMID
+    total: int
+    watermark: str
+    elapsed: float
+
+
+class BatchSearchQuery(BaseModel):
+    id: Optional[str] = None  # 결과를 구분하는 이름 (생략 시 순번)
+    query: str
+    author: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    page: int = Field(1, ge=1)
+    page_size: int = Field(20, ge=1, le=100)
+    sort_by: Literal["relevance", "date", "citations"] = "relevance"
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[BatchSearchQuery] = Field(..., min_length=1, max_length=50)
+    detect_ir: bool = True
+
+
+class BatchSearchResult(BaseModel):
+    id: str
+    ok: bool
+    error: Optional[str] = None
+    total: int = 0
+    page: int
+    page_size: int
+    papers: list[Paper] = []
+
+
+class BatchSearchResponse(BaseModel):
+    results: list[BatchSearchResult]
+    succeeded: int
+    failed: int
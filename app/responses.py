@@ -0,0 +1,56 @@
+import hashlib
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    # NamedTuple(MeshHeading 등)은 orjson이 직접 직렬화하지 않으므로 필드 이름이 있는 객체로 변환
+    if isinstance(obj, tuple) and hasattr(obj, "_asdict"):
+        return obj._asdict()
+    raise TypeError(f"JSON으로 직렬화할 수 없는 타입: {type(obj).__name__}")
+
+
+def json_bytes(content) -> bytes:
+    """응답 내용을 JSON 바이트로 직렬화합니다.
+
+    pydantic 모델은 내장 직렬화기(model_dump_json)를, 그 외(모델 리스트, dict, dataclass)는
+    orjson을 사용해 jsonable_encoder + json.dumps 경로를 거치지 않습니다.
+    """
+
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    return orjson.dumps(content, default=_default)
+
+
+def make_etag(body: bytes) -> str:
+    # 압축 등 표현만 다른 응답도 같은 리소스로 보도록 약한 ETag 사용
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+
+    # 약한 비교: W/ 접두어를 무시하고 태그 값만 비교
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cached_json_response(request: Request, content) -> Response:
+    """콘텐츠 해시 기반 ETag를 붙인 JSON 응답을 만들고, 변경이 없으면 304를 반환합니다."""
+
+    body = json_bytes(content)
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,5 +1,7 @@
 from .search import router as search_router
 from .analysis import router as analysis_router
 from .export import router as export_router
+from .jobs import router as jobs_router
+from .saved_searches import router as saved_searches_router
 
-__all__ = ["search_router", "analysis_router", "export_router"]
+__all__ = ["search_router", "analysis_router", "export_router", "jobs_router", "saved_searches_router"]
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Query, HTTPException, Body
-from typing import Optional
+from fastapi import APIRouter, Query, HTTPException, Body, Request
+from typing import Literal, Optional
 from app.services.pubmed import search_pubmed, fetch_paper_details
+from app.services.store import search_local
 from app.services.analyzer import analyze_keywords, analyze_trends, analyze_authors
+from app.services.network import analyze_keyword_network, analyze_coauthor_network
+from app.services.mesh import analyze_mesh_rollup, get_mesh_tree, MESH_INDEX_MISSING
 from app.services.ai_summary import summarize_paper, summarize_multiple_papers, chat_with_papers
+from app.services.admission import admission, AdmissionRejected
+from app.services.timing import span
+from app.services.executor import run_cpu
+from app.responses import cached_json_response
 from app.models.schemas import (
     KeywordAnalysis,
     TrendAnalysis,
     AuthorAnalysis,
+    NetworkAnalysis,
+    MeshRollup,
     SummarizeRequest,
     SummaryResponse,
     ChatRequest,
@@ -18,17 +27,20 @@ router = APIRouter(prefix="/api", tags=["analysis"])
 
 @router.get("/analyze/keywords", response_model=list[KeywordAnalysis])
 async def get_keyword_analysis(
+    request: Request,
     query: str = Query(..., description="검색 키워드"),
     author: Optional[str] = Query(None, description="저자명"),
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY)"),
     end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY)"),
+    source: Literal["pubmed", "local"] = Query("pubmed", description="검색 대상 (local: 수집된 로컬 저장소)"),
     top_n: int = Query(20, ge=1, le=50, description="상위 N개 키워드"),
 ):
     """검색 결과에서 키워드 빈도를 분석합니다."""
 
     try:
         # 분석을 위해 최대 100개 논문 가져오기
-        _, pmids = await search_pubmed(
+        search = search_local if source == "local" else search_pubmed
+        _, pmids = await search(
             query=query,
             author=author,
             start_date=start_date,
@@ -38,22 +50,27 @@ async def get_keyword_analysis(
         )
 
         papers = await fetch_paper_details(pmids) if pmids else []
-        return analyze_keywords(papers, top_n)
+        with span("analyze"):
+            result = await run_cpu(analyze_keywords, papers, top_n)
+        return cached_json_response(request, result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
 
 @router.get("/analyze/trends", response_model=list[TrendAnalysis])
 async def get_trend_analysis(
+    request: Request,
     query: str = Query(..., description="검색 키워드"),
     author: Optional[str] = Query(None, description="저자명"),
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY)"),
     end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY)"),
+    source: Literal["pubmed", "local"] = Query("pubmed", description="검색 대상 (local: 수집된 로컬 저장소)"),
 ):
     """연도별 논문 수 트렌드를 분석합니다."""
 
     try:
-        _, pmids = await search_pubmed(
+        search = search_local if source == "local" else search_pubmed
+        _, pmids = await search(
             query=query,
             author=author,
             start_date=start_date,
@@ -63,23 +80,28 @@ async def get_trend_analysis(
         )
 
         papers = await fetch_paper_details(pmids) if pmids else []
-        return analyze_trends(papers)
+        with span("analyze"):
+            result = await run_cpu(analyze_trends, papers)
+        return cached_json_response(request, result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
 
 @router.get("/analyze/authors", response_model=list[AuthorAnalysis])
 async def get_author_analysis(
+    request: Request,
     query: str = Query(..., description="검색 키워드"),
     author: Optional[str] = Query(None, description="저자명"),
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY)"),
     end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY)"),
+    source: Literal["pubmed", "local"] = Query("pubmed", description="검색 대상 (local: 수집된 로컬 저장소)"),
     top_n: int = Query(20, ge=1, le=50, description="상위 N명 저자"),
 ):
     """저자별 논문 수를 분석합니다."""
 
     try:
-        _, pmids = await search_pubmed(
+        search = search_local if source == "local" else search_pubmed
+        _, pmids = await search(
             query=query,
             author=author,
             start_date=start_date,
@@ -89,7 +111,114 @@ async def get_author_analysis(
         )
 
         papers = await fetch_paper_details(pmids) if pmids else []
-        return analyze_authors(papers, top_n)
+        with span("analyze"):
+            result = await run_cpu(analyze_authors, papers, top_n)
+        return cached_json_response(request, result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+
+
+NETWORK_ANALYZERS = {
+    "keyword": analyze_keyword_network,
+    "coauthor": analyze_coauthor_network,
+}
+
+
+async def _network_analysis(request: Request, kind: str, source: str, max_results: int, top_k: int, min_count: int, **criteria):
+    search = search_local if source == "local" else search_pubmed
+    _, pmids = await search(**criteria, page=1, page_size=max_results)
+
+    papers = await fetch_paper_details(pmids) if pmids else []
+    with span("analyze"):
+        result = await run_cpu(NETWORK_ANALYZERS[kind], papers, top_k, min_count)
+    return cached_json_response(request, result)
+
+
+@router.get("/analyze/keyword-network", response_model=NetworkAnalysis)
+async def get_keyword_network(
+    request: Request,
+    query: str = Query(..., description="검색 키워드"),
+    author: Optional[str] = Query(None, description="저자명"),
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY)"),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY)"),
+    source: Literal["pubmed", "local"] = Query("pubmed", description="검색 대상 (local: 수집된 로컬 저장소)"),
+    max_results: int = Query(500, ge=1, le=10000, description="분석할 최대 논문 수"),
+    top_k: int = Query(100, ge=1, le=2000, description="상위 K개 간선"),
+    min_count: int = Query(2, ge=1, description="최소 출현 논문 수"),
+):
+    """키워드 동시 출현 네트워크 (상위 간선, 노드 연결 수, 연결 요소)를 분석합니다."""
+
+    try:
+        return await _network_analysis(
+            request, "keyword", source, max_results, top_k, min_count,
+            query=query, author=author, start_date=start_date, end_date=end_date,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+
+
+@router.get("/analyze/coauthor-network", response_model=NetworkAnalysis)
+async def get_coauthor_network(
+    request: Request,
+    query: str = Query(..., description="검색 키워드"),
+    author: Optional[str] = Query(None, description="저자명"),
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY)"),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY)"),
+    source: Literal["pubmed", "local"] = Query("pubmed", description="검색 대상 (local: 수집된 로컬 저장소)"),
+    max_results: int = Query(500, ge=1, le=10000, description="분석할 최대 논문 수"),
+    top_k: int = Query(100, ge=1, le=2000, description="상위 K개 간선"),
+    min_count: int = Query(2, ge=1, description="최소 출현 논문 수"),
+):
+    """공저자 네트워크 (상위 간선, 노드 연결 수, 연결 요소)를 분석합니다."""
+
+    try:
+        return await _network_analysis(
+            request, "coauthor", source, max_results, top_k, min_count,
+            query=query, author=author, start_date=start_date, end_date=end_date,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
+
+
+@router.get("/analyze/mesh", response_model=MeshRollup)
+async def get_mesh_rollup(
+    request: Request,
+    query: str = Query(..., description="검색 키워드"),
+    author: Optional[str] = Query(None, description="저자명"),
+    start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY)"),
+    end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY)"),
+    source: Literal["pubmed", "local"] = Query("pubmed", description="검색 대상 (local: 수집된 로컬 저장소)"),
+    depth: int = Query(2, ge=1, le=15, description="묶을 MeSH 트리 깊이 (1 = 최상위)"),
+    category: Optional[str] = Query(None, pattern="^[A-Z]+$", description="트리 범주 (예: C = 질병, E = 기법 및 장비)"),
+    major_only: bool = Query(False, description="주요 주제(MajorTopicYN)만 집계"),
+    max_results: int = Query(500, ge=1, le=10000, description="분석할 최대 논문 수"),
+    top_n: int = Query(20, ge=1, le=200, description="상위 N개 디스크립터"),
+):
+    """MeSH 주제어를 트리의 지정한 깊이로 묶어 논문 수를 분석합니다.
+
+    예를 들어 depth=2, category=C이면 "Carcinoma, Hepatocellular"와 "Liver Neoplasms"가 달린 논문은
+    모두 "Neoplasms by Site", "Digestive System Neoplasms" 등 상위 디스크립터로 집계됩니다.
+    """
+
+    # 인덱스가 없는 것은 서버 오류가 아니라 배포 상태이므로 검색 전에 503으로 안내
+    if get_mesh_tree() is None:
+        raise HTTPException(status_code=503, detail=MESH_INDEX_MISSING)
+
+    try:
+        search = search_local if source == "local" else search_pubmed
+        _, pmids = await search(
+            query=query,
+            author=author,
+            start_date=start_date,
+            end_date=end_date,
+            page=1,
+            page_size=max_results,
+        )
+
+        papers = await fetch_paper_details(pmids) if pmids else []
+        with span("analyze"):
+            result = await run_cpu(analyze_mesh_rollup, papers, depth, top_n, category, major_only)
+        return cached_json_response(request, result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"분석 중 오류 발생: {str(e)}")
 
@@ -104,13 +233,14 @@ async def summarize(request: SummarizeRequest):
         if not papers:
             raise HTTPException(status_code=404, detail="논문을 찾을 수 없습니다.")
 
-        if len(papers) == 1:
-            summary = await summarize_paper(papers[0], request.language)
-        else:
-            summary = await summarize_multiple_papers(papers, request.language)
+        async with admission.admit("summary"):
+            if len(papers) == 1:
+                summary = await summarize_paper(papers[0], request.language)
+            else:
+                summary = await summarize_multiple_papers(papers, request.language)
 
         return SummaryResponse(summary=summary, pmids=request.pmids)
-    except HTTPException:
+    except (HTTPException, AdmissionRejected):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"요약 중 오류 발생: {str(e)}")
@@ -129,15 +259,16 @@ async def chat(request: ChatRequest):
         # 대화 기록 변환
         history = [{"role": msg.role, "content": msg.content} for msg in request.history]
 
-        response = await chat_with_papers(
-            papers=papers,
-            user_message=request.message,
-            chat_history=history,
-            language=request.language,
-        )
+        async with admission.admit("chat"):
+            response, sources = await chat_with_papers(
+                papers=papers,
+                user_message=request.message,
+                chat_history=history,
+                language=request.language,
+            )
 
-        return ChatResponse(response=response, pmids=request.pmids)
-    except HTTPException:
+        return ChatResponse(response=response, pmids=request.pmids, sources=sources)
+    except (HTTPException, AdmissionRejected):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"채팅 중 오류 발생: {str(e)}")
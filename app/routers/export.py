@@ -1,25 +1,63 @@
 from fastapi import APIRouter, Query, HTTPException
 from fastapi.responses import StreamingResponse
-from typing import Optional
+from typing import Literal, Optional
 import io
 import csv
 from app.services.pubmed import search_pubmed, fetch_paper_details
+from app.services.store import search_local
+from app.models.record import PaperRecord
+from app.services.timing import span
+from app.services.executor import run_cpu
 
 router = APIRouter(prefix="/api", tags=["export"])
 
 
+def build_csv_content(papers: list[PaperRecord]) -> str:
+    """논문 목록을 CSV 문자열로 변환합니다."""
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+
+    # 헤더
+    writer.writerow([
+        "PMID", "제목", "저자", "초록", "출판일", "저널명", "키워드", "MeSH"
+    ])
+
+    # 데이터
+    for paper in papers:
+        writer.writerow([
+            paper.pmid,
+            paper.title,
+            "; ".join(paper.authors),
+            paper.abstract,
+            paper.pub_date,
+            paper.journal,
+            "; ".join(paper.keywords),
+            "; ".join(heading.name for heading in paper.mesh),
+        ])
+
+    output.seek(0)
+
+    # UTF-8 BOM 추가 (Excel 호환)
+    content = "\ufeff" + output.getvalue()
+
+    return content
+
+
 @router.get("/export/csv")
 async def export_csv(
     query: str = Query(..., description="검색 키워드"),
     author: Optional[str] = Query(None, description="저자명"),
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY)"),
     end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY)"),
+    source: Literal["pubmed", "local"] = Query("pubmed", description="검색 대상 (local: 수집된 로컬 저장소)"),
     max_results: int = Query(100, ge=1, le=500, description="최대 결과 수"),
 ):
     """검색 결과를 CSV 파일로 내보냅니다."""
 
     try:
-        _, pmids = await search_pubmed(
+        search = search_local if source == "local" else search_pubmed
+        _, pmids = await search(
             query=query,
             author=author,
             start_date=start_date,
@@ -30,31 +68,8 @@ async def export_csv(
 
         papers = await fetch_paper_details(pmids) if pmids else []
 
-        # CSV 생성
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # 헤더
-        writer.writerow([
-            "PMID", "제목", "저자", "초록", "출판일", "저널명", "키워드"
-        ])
-
-        # 데이터
-        for paper in papers:
-            writer.writerow([
-                paper.pmid,
-                paper.title,
-                "; ".join(paper.authors),
-                paper.abstract,
-                paper.pub_date,
-                paper.journal,
-                "; ".join(paper.keywords),
-            ])
-
-        output.seek(0)
-
-        # UTF-8 BOM 추가 (Excel 호환)
-        content = "\ufeff" + output.getvalue()
+        with span("csv"):
+            content = await run_cpu(build_csv_content, papers)
 
         return StreamingResponse(
             io.BytesIO(content.encode("utf-8")),
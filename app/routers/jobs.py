@@ -0,0 +1,186 @@
+import json
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from app.services.pubmed import search_pubmed, iter_paper_details
+from app.services.store import search_local
+from app.services.icite import fetch_citation_counts
+from app.services.analyzer import analyze_keywords, analyze_trends, analyze_authors
+from app.services.network import analyze_keyword_network, analyze_coauthor_network
+from app.services.ai_summary import summarize_papers_map_reduce
+from app.services.executor import run_cpu
+from app.services.jobs import job_manager, Job, JobContext, JobQueueFull
+from app.models.record import PaperRecord
+from app.models.schemas import JobRequest, JobStatus
+from app.responses import json_bytes
+from app.routers.export import build_csv_content
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+
+def _analyze_trends(papers: list[PaperRecord], top_n: int):
+    return analyze_trends(papers)
+
+
+# CPU_EXECUTOR=process에서는 분석 함수를 pickle로 넘기므로 람다가 아닌 모듈 수준 함수만 사용
+ANALYZERS = {
+    "keywords": analyze_keywords,
+    "trends": _analyze_trends,
+    "authors": analyze_authors,
+    "keyword_network": analyze_keyword_network,
+    "coauthor_network": analyze_coauthor_network,
+}
+
+
+async def _collect_papers(ctx: JobContext, with_citations: bool, share: float) -> list[PaperRecord]:
+    """검색(또는 지정 PMID) 결과의 논문 정보를 모읍니다. 진행률은 0 ~ share 구간을 사용합니다."""
+
+    request = ctx.request
+
+    if request.pmids:
+        pmids = request.pmids[:request.max_results]
+    else:
+        search = search_local if request.source == "local" else search_pubmed
+        _, pmids = await search(
+            query=request.query,
+            author=request.author,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            page=1,
+            page_size=request.max_results,
+        )
+    ctx.progress(share * 0.05, f"{len(pmids)}편 검색됨")
+
+    # 청크별 efetch는 동시에 진행되고, 앞쪽 청크가 끝나는 대로 진행률을 갱신
+    papers: list[PaperRecord] = []
+    async for chunk in iter_paper_details(pmids):
+        papers.extend(chunk)
+        done = len(papers)
+        ctx.progress(share * (0.05 + 0.85 * done / len(pmids)), f"논문 정보 {done}/{len(pmids)}")
+
+    if with_citations and papers:
+        citation_counts = await fetch_citation_counts([p.pmid for p in papers])
+        for paper in papers:
+            paper.citation_count = citation_counts.get(paper.pmid, 0)
+
+    ctx.progress(share, f"논문 {len(papers)}편 준비 완료")
+    return papers
+
+
+async def run_search_job(ctx: JobContext) -> None:
+    papers = await _collect_papers(ctx, with_citations=True, share=0.95)
+    # /api/search와 같은 Paper 형식으로 저장 (내부 필드는 내보내지 않음)
+    await ctx.write_artifact(json_bytes([paper.to_paper() for paper in papers]), "json", "application/json")
+
+
+async def run_export_job(ctx: JobContext) -> None:
+    papers = await _collect_papers(ctx, with_citations=False, share=0.9)
+    content = await run_cpu(build_csv_content, papers)
+    await ctx.write_artifact(content, "csv", "text/csv; charset=utf-8")
+
+
+async def run_analysis_job(ctx: JobContext) -> None:
+    request = ctx.request
+    papers = await _collect_papers(ctx, with_citations=False, share=0.9)
+    result = await run_cpu(ANALYZERS[request.analysis], papers, request.top_n)
+    await ctx.write_artifact(json_bytes(result), "json", "application/json")
+
+
+async def run_summary_job(ctx: JobContext) -> None:
+    request = ctx.request
+    papers = await _collect_papers(ctx, with_citations=False, share=0.2)
+    if not papers:
+        raise ValueError("요약할 논문이 없습니다.")
+
+    summary = await summarize_papers_map_reduce(
+        papers,
+        request.language,
+        on_progress=lambda value: ctx.progress(0.2 + 0.8 * value, "요약 생성 중"),
+    )
+    await ctx.write_artifact(summary, "md", "text/markdown; charset=utf-8")
+
+
+job_manager.register("search", run_search_job)
+job_manager.register("export", run_export_job)
+job_manager.register("analysis", run_analysis_job)
+job_manager.register("summary", run_summary_job)
+
+
+def _to_status(job: Job) -> JobStatus:
+    download_url = f"/api/jobs/{job.id}/download" if job.status == "succeeded" and job.artifact else None
+    return JobStatus(
+        id=job.id,
+        type=job.type,
+        status=job.status,
+        progress=job.progress,
+        message=job.message,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        download_url=download_url,
+    )
+
+
+def _get_job(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(request: JobRequest):
+    """검색/내보내기/분석/요약 작업을 백그라운드로 실행합니다."""
+
+    if not request.query and not request.pmids:
+        raise HTTPException(status_code=400, detail="query 또는 pmids가 필요합니다.")
+
+    try:
+        job = job_manager.submit(request)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+    return _to_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """작업 상태와 진행률을 조회합니다."""
+    return _to_status(_get_job(job_id))
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """작업 상태 변경을 Server-Sent Events로 전송합니다."""
+
+    _get_job(job_id)
+
+    async def stream():
+        async for job in job_manager.events(job_id):
+            data = json.dumps(_to_status(job).model_dump(), ensure_ascii=False)
+            yield f"event: {job.status}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_job_result(job_id: str):
+    """완료된 작업의 결과 파일을 내려받습니다."""
+
+    job = _get_job(job_id)
+    path = job_manager.artifact_path(job)
+    if job.status != "succeeded" or path is None or not path.exists():
+        raise HTTPException(status_code=409, detail="작업 결과가 아직 없습니다.")
+
+    return FileResponse(path, media_type=job.media_type, filename=f"pubmed_{job.type}_{job.id[:8]}{path.suffix}")
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatus)
+async def cancel_job(job_id: str):
+    """대기 중이거나 실행 중인 작업을 취소합니다."""
+    _get_job(job_id)
+    return _to_status(job_manager.cancel(job_id))
@@ -0,0 +1,121 @@
+import time
+from fastapi import APIRouter, Query, HTTPException, Request
+from app.services.pubmed import fetch_paper_details
+from app.services.icite import fetch_citation_counts
+from app.services.saved_searches import saved_search_manager, SavedSearch
+from app.models.schemas import (
+    SavedSearchCreate,
+    SavedSearchInfo,
+    SavedSearchRefresh,
+    SearchResponse,
+)
+from app.responses import cached_json_response
+
+router = APIRouter(prefix="/api", tags=["saved-searches"])
+
+
+def _to_info(saved: SavedSearch) -> SavedSearchInfo:
+    return SavedSearchInfo(
+        id=saved.id,
+        name=saved.name,
+        query=saved.query,
+        author=saved.author,
+        start_date=saved.start_date,
+        end_date=saved.end_date,
+        max_results=saved.max_results,
+        total=len(saved.pmids),
+        ir_related=len(saved.ir_pmids),
+        unclassified=len(saved.unclassified),
+        watermark=saved.watermark,
+        created_at=saved.created_at,
+        refreshed_at=saved.refreshed_at,
+    )
+
+
+async def _get_saved(search_id: str) -> SavedSearch:
+    saved = await saved_search_manager.get(search_id)
+    if saved is None:
+        raise HTTPException(status_code=404, detail="저장된 검색을 찾을 수 없습니다.")
+    return saved
+
+
+@router.post("/saved-searches", response_model=SavedSearchInfo, status_code=201)
+async def create_saved_search(request: SavedSearchCreate):
+    """검색 조건을 저장합니다. 결과는 첫 갱신 때 가져옵니다."""
+    return _to_info(await saved_search_manager.create(request))
+
+
+@router.get("/saved-searches", response_model=list[SavedSearchInfo])
+async def list_saved_searches():
+    """저장된 검색 목록을 조회합니다."""
+    return [_to_info(saved) for saved in await saved_search_manager.list_all()]
+
+
+@router.get("/saved-searches/{search_id}", response_model=SavedSearchInfo)
+async def get_saved_search(search_id: str):
+    """저장된 검색 정보를 조회합니다."""
+    return _to_info(await _get_saved(search_id))
+
+
+@router.post("/saved-searches/{search_id}/refresh", response_model=SavedSearchRefresh)
+async def refresh_saved_search(search_id: str):
+    """마지막 갱신 이후 PubMed에 등록된 논문만 가져와 저장된 결과에 추가합니다."""
+
+    start = time.perf_counter()
+    try:
+        result = await saved_search_manager.refresh(search_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"갱신 중 오류 발생: {str(e)}")
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="저장된 검색을 찾을 수 없습니다.")
+
+    saved, new_pmids = result
+    return SavedSearchRefresh(
+        id=saved.id,
+        new_pmids=new_pmids,
+        total=len(saved.pmids),
+        watermark=saved.watermark,
+        elapsed=round(time.perf_counter() - start, 3),
+    )
+
+
+@router.get("/saved-searches/{search_id}/papers", response_model=SearchResponse)
+async def get_saved_search_papers(
+    request: Request,
+    search_id: str,
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    page_size: int = Query(20, ge=1, le=100, description="페이지당 결과 수"),
+    ir_only: bool = Query(False, description="IR 관련 논문만"),
+):
+    """저장된 결과를 최근 추가된 순으로 조회합니다 (IR 분류는 저장된 판정을 사용)."""
+
+    saved = await _get_saved(search_id)
+    pmids = saved.ir_pmids if ir_only else saved.pmids
+    page_pmids = pmids[(page - 1) * page_size:page * page_size]
+
+    try:
+        papers = await fetch_paper_details(page_pmids) if page_pmids else []
+        if papers:
+            citation_counts = await fetch_citation_counts([p.pmid for p in papers])
+            ir_pmids = set(saved.ir_pmids)
+            for paper in papers:
+                paper.citation_count = citation_counts.get(paper.pmid, 0)
+                paper.is_ir_related = paper.pmid in ir_pmids
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"조회 중 오류 발생: {str(e)}")
+
+    return cached_json_response(request, SearchResponse(
+        total=len(pmids),
+        page=page,
+        page_size=page_size,
+        papers=[paper.to_paper() for paper in papers],
+    ))
+
+
+@router.delete("/saved-searches/{search_id}", status_code=204)
+async def delete_saved_search(search_id: str):
+    """저장된 검색을 삭제합니다."""
+
+    if not await saved_search_manager.delete(search_id):
+        raise HTTPException(status_code=404, detail="저장된 검색을 찾을 수 없습니다.")
@@ -1,10 +1,23 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import Optional, Literal
 from app.services.pubmed import search_pubmed, fetch_paper_details, get_paper_by_pmid
 from app.services.ai_summary import generate_search_query, detect_ir_related_papers
 from app.services.icite import fetch_citation_counts
-from app.models.schemas import SearchResponse, Paper
+from app.services.prefetch import prefetcher, next_page_criteria
+from app.services.similarity import find_duplicates, find_related
+from app.services.admission import admission, AdmissionRejected
+from app.config import PREFETCH_ENABLED, DEDUP_THRESHOLD
+from app.models.schemas import (
+    SearchResponse,
+    Paper,
+    RelatedPaper,
+    RelatedPapersResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
+    BatchSearchResult,
+)
+from app.responses import cached_json_response, json_bytes
 
 
 class NaturalQueryRequest(BaseModel):
@@ -22,6 +35,7 @@ router = APIRouter(prefix="/api", tags=["search"])
 
 @router.get("/search", response_model=SearchResponse)
 async def search_papers(
+    request: Request,
     query: str = Query(..., description="검색 키워드"),
     author: Optional[str] = Query(None, description="저자명"),
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY)"),
@@ -29,22 +43,38 @@ async def search_papers(
     page: int = Query(1, ge=1, description="페이지 번호"),
     page_size: int = Query(20, ge=1, le=100, description="페이지당 결과 수"),
     sort_by: str = Query("relevance", description="정렬 기준: relevance, date, citations"),
+    prefetch: bool = Query(False, description="다음 페이지를 미리 가져오기"),
+    client_id: Optional[str] = Query(None, max_length=64, description="미리 가져오기 작업을 구분하는 클라이언트 ID"),
+    dedup: bool = Query(False, description="거의 같은 논문(정오표, 재게재 초록 등)을 하나만 표시"),
 ):
     """PubMed에서 논문을 검색합니다."""
 
+    criteria = dict(
+        query=query,
+        author=author,
+        start_date=start_date,
+        end_date=end_date,
+        page=page,
+        page_size=page_size,
+        sort_by=sort_by,
+    )
+    prefetch = prefetch and PREFETCH_ENABLED and bool(client_id)
+
     try:
-        total, pmids = await search_pubmed(
-            query=query,
-            author=author,
-            start_date=start_date,
-            end_date=end_date,
-            page=page,
-            page_size=page_size,
-            sort_by=sort_by,
-        )
+        if prefetch:
+            await prefetcher.before_search(client_id, criteria)
+
+        total, pmids = await search_pubmed(**criteria)
 
         papers = await fetch_paper_details(pmids) if pmids else []
 
+        # 중복 논문은 목록에서 먼저 나온(관련도/날짜 순위가 높은) 논문만 남김
+        duplicates = {}
+        if dedup and len(papers) > 1:
+            duplicates = await find_duplicates(papers, DEDUP_THRESHOLD)
+            hidden = {pmid for group in duplicates.values() for pmid in group}
+            papers = [paper for paper in papers if paper.pmid not in hidden]
+
         # 피인용 횟수 가져오기 + IR 관련 감지 (병렬 실행)
         if papers:
             import asyncio
@@ -61,25 +91,137 @@ async def search_papers(
         if sort_by == "citations":
             papers.sort(key=lambda p: p.citation_count or 0, reverse=True)
 
-        return SearchResponse(
+        if prefetch and (next_criteria := next_page_criteria(criteria, total)) is not None:
+            prefetcher.schedule(client_id, next_criteria)
+
+        return cached_json_response(request, SearchResponse(
             total=total,
             page=page,
             page_size=page_size,
-            papers=papers,
-        )
+            papers=[paper.to_paper() for paper in papers],
+            duplicates=duplicates,
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"검색 중 오류 발생: {str(e)}")
 
 
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_papers_batch(body: BatchSearchRequest):
+    """여러 검색을 한 번에 실행합니다.
+
+    검색(esearch)은 NCBI 요청 한도 안에서 동시에 실행하고, 모든 검색의 PMID를 합쳐
+    논문 정보(efetch)와 피인용 수(iCite)를 한 번씩만 가져옵니다. 실패한 검색은 해당 결과에만 오류로 표시됩니다.
+    """
+
+    import asyncio
+
+    specs = body.queries
+    searches = await asyncio.gather(
+        *(
+            search_pubmed(
+                query=spec.query,
+                author=spec.author,
+                start_date=spec.start_date,
+                end_date=spec.end_date,
+                page=spec.page,
+                page_size=spec.page_size,
+                sort_by=spec.sort_by,
+            )
+            for spec in specs
+        ),
+        return_exceptions=True,
+    )
+
+    all_pmids = list(dict.fromkeys(
+        pmid for result in searches if not isinstance(result, BaseException) for pmid in result[1]
+    ))
+
+    papers_by_pmid = {}
+    fetch_error = None
+    if all_pmids:
+        try:
+            papers = await fetch_paper_details(all_pmids)
+            citation_task = fetch_citation_counts(all_pmids)
+            # IR 감지는 한 번에 20편씩 판단
+            ir_tasks = [
+                detect_ir_related_papers(papers[i:i + 20]) for i in range(0, len(papers), 20)
+            ] if body.detect_ir else []
+            citation_counts, *ir_batches = await asyncio.gather(citation_task, *ir_tasks)
+            ir_results = {pmid: related for batch in ir_batches for pmid, related in batch.items()}
+
+            for paper in papers:
+                paper.citation_count = citation_counts.get(paper.pmid, 0)
+                paper.is_ir_related = ir_results.get(paper.pmid, False)
+                papers_by_pmid[paper.pmid] = paper
+        except Exception as e:
+            fetch_error = f"논문 정보 조회 중 오류 발생: {str(e)}"
+
+    results = []
+    for index, (spec, search) in enumerate(zip(specs, searches)):
+        result = BatchSearchResult(
+            id=spec.id or str(index),
+            ok=False,
+            page=spec.page,
+            page_size=spec.page_size,
+        )
+        if isinstance(search, BaseException):
+            result.error = f"검색 중 오류 발생: {str(search)}"
+        elif fetch_error and search[1]:
+            result.total = search[0]
+            result.error = fetch_error
+        else:
+            total, pmids = search
+            papers = [papers_by_pmid[pmid] for pmid in pmids if pmid in papers_by_pmid]
+            if spec.sort_by == "citations":
+                papers.sort(key=lambda p: p.citation_count or 0, reverse=True)
+            result.ok = True
+            result.total = total
+            result.papers = [paper.to_paper() for paper in papers]
+        results.append(result)
+
+    succeeded = sum(1 for result in results if result.ok)
+    content = BatchSearchResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+    return Response(json_bytes(content), media_type="application/json")
+
+
 @router.get("/paper/{pmid}", response_model=Paper)
-async def get_paper(pmid: str):
+async def get_paper(request: Request, pmid: str):
     """특정 PMID의 논문 상세 정보를 조회합니다."""
 
     paper = await get_paper_by_pmid(pmid)
     if not paper:
         raise HTTPException(status_code=404, detail="논문을 찾을 수 없습니다.")
 
-    return paper
+    return cached_json_response(request, paper.to_paper())
+
+
+@router.get("/paper/{pmid}/related", response_model=RelatedPapersResponse)
+async def get_related_papers(
+    request: Request,
+    pmid: str,
+    limit: int = Query(10, ge=1, le=50, description="최대 결과 수"),
+    min_similarity: float = Query(0.2, ge=0.0, le=1.0, description="최소 유사도 (추정 Jaccard)"),
+):
+    """지금까지 파싱된 논문 중 제목·초록이 비슷한 논문을 찾습니다 (MinHash LSH)."""
+
+    paper = await get_paper_by_pmid(pmid)
+    if not paper:
+        raise HTTPException(status_code=404, detail="논문을 찾을 수 없습니다.")
+
+    try:
+        related = await find_related(paper, limit, min_similarity)
+        similarity = dict(related)
+        papers = await fetch_paper_details([p for p, _ in related]) if related else []
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"유사 논문 조회 중 오류 발생: {str(e)}")
+
+    return cached_json_response(request, RelatedPapersResponse(
+        pmid=pmid,
+        papers=[
+            RelatedPaper(**p.to_paper().model_dump(), similarity=round(similarity[p.pmid], 4))
+            for p in papers
+        ],
+    ))
 
 
 @router.post("/generate-query", response_model=NaturalQueryResponse)
@@ -87,7 +229,8 @@ async def generate_query(request: NaturalQueryRequest):
     """자연어를 PubMed 검색 쿼리로 변환합니다."""
 
     try:
-        result = await generate_search_query(request.query)
+        async with admission.admit("query"):
+            result = await generate_search_query(request.query)
 
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
@@ -98,7 +241,7 @@ async def generate_query(request: NaturalQueryRequest):
             explanation=result["explanation"],
             keywords=result["keywords"],
         )
-    except HTTPException:
+    except (HTTPException, AdmissionRejected):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"쿼리 생성 중 오류 발생: {str(e)}")
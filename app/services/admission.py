@@ -0,0 +1,152 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from app.config import LLM_CONCURRENCY
+from app.services.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_WAIT_SECONDS,
+    ADMISSION_REJECTED,
+)
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 차 LLM 작업을 받을 수 없는 경우 (503 + Retry-After로 응답)"""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} 요청이 많아 처리할 수 없습니다. {retry_after}초 후 다시 시도하세요.")
+        self.name = name
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Class:
+    name: str
+    priority: int  # 작을수록 먼저 실행
+    concurrency: int  # 이 종류가 동시에 쓸 수 있는 최대 슬롯 수
+    queue_size: int  # 기다릴 수 있는 최대 작업 수
+    active: int = 0
+    waiters: deque = field(default_factory=deque)
+
+
+class AdmissionController:
+    """LLM 호출 엔드포인트의 입장 제어
+
+    전체 capacity개의 실행 슬롯을 엔드포인트 종류(class)들이 나눠 쓰며, 종류마다 동시 실행 한도와
+    길이 제한이 있는 대기열을 둡니다. 슬롯이 비면 우선순위가 가장 높은 종류의 가장 오래 기다린
+    작업부터 실행하고, 대기열이 가득 차면 기다리지 않고 바로 AdmissionRejected를 냅니다.
+    """
+
+    def __init__(self, capacity: int, classes: list[_Class]):
+        self.capacity = capacity
+        self.classes = {c.name: c for c in classes}
+        self._by_priority = sorted(classes, key=lambda c: c.priority)
+        self._active = 0
+        # 슬롯 점유 시간의 지수 이동 평균 (Retry-After 추정용)
+        self._hold_seconds = 5.0
+
+    def _runnable(self, cls: _Class) -> bool:
+        return self._active < self.capacity and cls.active < cls.concurrency
+
+    def _grant(self, cls: _Class) -> None:
+        self._active += 1
+        cls.active += 1
+        ADMISSION_IN_FLIGHT.labels(cls.name).set(cls.active)
+
+    def _dispatch(self) -> None:
+        for cls in self._by_priority:
+            while cls.waiters and self._runnable(cls):
+                future = cls.waiters.popleft()
+                ADMISSION_QUEUE_DEPTH.labels(cls.name).set(len(cls.waiters))
+                if future.done():
+                    continue
+                self._grant(cls)
+                future.set_result(None)
+
+    def _release(self, cls: _Class, held: float) -> None:
+        self._active -= 1
+        cls.active -= 1
+        ADMISSION_IN_FLIGHT.labels(cls.name).set(cls.active)
+        self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held
+        self._dispatch()
+
+    def _retry_after(self, cls: _Class) -> int:
+        # 앞선 작업들이 모두 빠질 때까지의 대략적인 시간
+        ahead = sum(len(c.waiters) for c in self._by_priority if c.priority <= cls.priority) + self._active
+        return max(1, round(ahead * self._hold_seconds / max(min(self.capacity, cls.concurrency), 1)))
+
+    def under_pressure(self, name: str) -> bool:
+        """name 종류 작업이 지금 바로 실행될 수 없으면 True입니다 (부가 기능 생략 판단용)."""
+
+        cls = self.classes[name]
+        if not self._runnable(cls):
+            return True
+        return any(c.waiters for c in self._by_priority if c.priority <= cls.priority)
+
+    async def _acquire(self, cls: _Class) -> None:
+        # 같거나 높은 우선순위 대기 작업이 없을 때만 바로 실행 (새치기 방지)
+        if self._runnable(cls) and not any(c.waiters for c in self._by_priority if c.priority <= cls.priority):
+            self._grant(cls)
+            return
+        if len(cls.waiters) >= cls.queue_size:
+            ADMISSION_REJECTED.labels(cls.name).inc()
+            raise AdmissionRejected(cls.name, self._retry_after(cls))
+
+        future = asyncio.get_running_loop().create_future()
+        cls.waiters.append(future)
+        ADMISSION_QUEUE_DEPTH.labels(cls.name).set(len(cls.waiters))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소됨: 받은 슬롯을 돌려줌
+                self._release(cls, 0.0)
+            else:
+                try:
+                    cls.waiters.remove(future)
+                except ValueError:
+                    pass
+                ADMISSION_QUEUE_DEPTH.labels(cls.name).set(len(cls.waiters))
+            raise
+
+    @asynccontextmanager
+    async def admit(self, name: str, retry: bool = False):
+        """name 종류의 실행 슬롯을 얻은 동안 블록을 실행합니다.
+
+        retry=True이면 대기열이 가득 찼을 때 AdmissionRejected 대신 Retry-After만큼 기다렸다 다시 줄을 섭니다
+        (응답을 기다리는 사용자가 없는 백그라운드 작업용).
+        """
+
+        cls = self.classes[name]
+        start = time.perf_counter()
+
+        while True:
+            try:
+                await self._acquire(cls)
+                break
+            except AdmissionRejected as e:
+                if not retry:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+        ADMISSION_WAIT_SECONDS.labels(cls.name).observe(time.perf_counter() - start)
+        granted = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(cls, time.perf_counter() - granted)
+
+
+# 엔드포인트 종류: 대화형 채팅 > 검색어 생성 > 요약 > 검색 결과 IR 분류 > 백그라운드 작업(대량 요약 등)
+admission = AdmissionController(
+    LLM_CONCURRENCY,
+    [
+        _Class("chat", priority=0, concurrency=LLM_CONCURRENCY, queue_size=20),
+        _Class("query", priority=1, concurrency=max(LLM_CONCURRENCY // 2, 1), queue_size=10),
+        _Class("summary", priority=2, concurrency=max(LLM_CONCURRENCY // 2, 1), queue_size=5),
+        _Class("classify", priority=3, concurrency=max(LLM_CONCURRENCY // 2, 1), queue_size=16),
+        _Class("background", priority=4, concurrency=max(LLM_CONCURRENCY // 4, 1), queue_size=8),
+    ],
+)
@@ -1,9 +1,24 @@
-from groq import AsyncGroq
-from app.config import GROQ_API_KEY
-from app.models.schemas import Paper
-from typing import Optional
+from app.config import GROQ_API_KEY, GROQ_BASE_URL, IR_CACHE_TTL
+from app.models.record import PaperRecord
+from app.services.metrics import track_upstream, record_llm_usage, ERRORS, LOAD_SHED
+from app.services.admission import admission, AdmissionRejected
+from app.services.cache import get_cache
+from app.services.ratelimit import groq_limiter, RateBudgetExhausted
+from app.services.deadline import upstream_timeout
+from app.services.executor import run_cpu
+from app.services.retrieval import build_chat_context
+from typing import Callable, Optional
 import json
 
+# groq SDK는 import 비용이 커서 첫 호출(또는 시작 후 예열) 시점에 불러옴
+_groq_client = None
+
+# Groq 호출 기본 타임아웃 (초, 요청 마감이 더 가까우면 남은 시간 사용)
+GROQ_TIMEOUT = 60.0
+
+# 논문별 IR 관련 여부 판정 결과 (PMID → bool)
+ir_cache = get_cache("ir_verdicts", maxsize=50000, ttl=IR_CACHE_TTL)
+
 
 # 전문분야별 프롬프트 설정
 SPECIALTY_PROMPTS = {
@@ -27,8 +42,30 @@ IR_INSIGHT_PROMPT = """
 해당 내용이 없으면 이 섹션은 "해당 없음"으로 표시하세요."""
 
 
+def get_groq_client():
+    """공유 AsyncGroq 클라이언트를 반환합니다 (최초 호출 시 SDK import)."""
+
+    global _groq_client
+
+    if _groq_client is None:
+        from groq import AsyncGroq
+        _groq_client = AsyncGroq(api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL)
+    return _groq_client
+
+
+async def _create_completion(client, operation: str, **kwargs):
+    """Groq 채팅 완성 API를 호출하고 지연 시간과 토큰 사용량을 기록합니다."""
+
+    await groq_limiter.acquire()
+    with track_upstream("groq", span_name=f"groq.{operation}"):
+        response = await client.chat.completions.create(**kwargs, timeout=upstream_timeout(GROQ_TIMEOUT))
+
+    record_llm_usage(operation, getattr(response, "usage", None))
+    return response
+
+
 async def summarize_paper(
-    paper: Paper,
+    paper: PaperRecord,
     language: str = "korean",
     specialty: str = "radiology"
 ) -> str:
@@ -40,7 +77,7 @@ async def summarize_paper(
     if not paper.abstract:
         return "초록이 없습니다."
 
-    client = AsyncGroq(api_key=GROQ_API_KEY)
+    client = get_groq_client()
 
     lang_instruction = "한국어로 작성해주세요." if language == "korean" else "Please write in English."
     specialty_prompt = SPECIALTY_PROMPTS.get(specialty, SPECIALTY_PROMPTS["general"])
@@ -79,7 +116,9 @@ async def summarize_paper(
 (위 분석 내용 작성)
 """
 
-    response = await client.chat.completions.create(
+    response = await _create_completion(
+        client,
+        "summarize",
         model="llama-3.1-8b-instant",
         messages=[
             {"role": "user", "content": prompt}
@@ -92,7 +131,7 @@ async def summarize_paper(
 
 
 async def summarize_multiple_papers(
-    papers: list[Paper],
+    papers: list[PaperRecord],
     language: str = "korean",
     specialty: str = "radiology"
 ) -> str:
@@ -104,7 +143,7 @@ async def summarize_multiple_papers(
     if not papers:
         return "요약할 논문이 없습니다."
 
-    client = AsyncGroq(api_key=GROQ_API_KEY)
+    client = get_groq_client()
 
     lang_instruction = "한국어로 작성해주세요." if language == "korean" else "Please write in English."
     specialty_prompt = SPECIALTY_PROMPTS.get(specialty, SPECIALTY_PROMPTS["general"])
@@ -154,7 +193,9 @@ async def summarize_multiple_papers(
 (위 분석 내용 작성 - 해당 내용이 없으면 "해당 없음")
 """
 
-    response = await client.chat.completions.create(
+    response = await _create_completion(
+        client,
+        "summarize_multiple",
         model="llama-3.1-8b-instant",
         messages=[
             {"role": "user", "content": prompt}
@@ -166,52 +207,117 @@ async def summarize_multiple_papers(
     return response.choices[0].message.content or "요약을 생성할 수 없습니다."
 
 
+async def summarize_papers_map_reduce(
+    papers: list[PaperRecord],
+    language: str = "korean",
+    specialty: str = "radiology",
+    batch_size: int = 10,
+    on_progress: Optional[Callable[[float], None]] = None,
+) -> str:
+    """논문이 많을 때 batch_size편씩 부분 요약(map)한 뒤 부분 요약들을 종합(reduce)합니다.
+
+    백그라운드 작업용이므로 LLM 호출마다 가장 낮은 우선순위("background")로 입장 제어를 받으며,
+    대기열이 가득 차면 실패하지 않고 기다렸다 다시 시도합니다.
+    """
+
+    if len(papers) <= batch_size:
+        async with admission.admit("background", retry=True):
+            return await summarize_multiple_papers(papers, language, specialty)
+
+    if not GROQ_API_KEY:
+        return "Groq API 키가 설정되지 않았습니다."
+
+    batches = [papers[i:i + batch_size] for i in range(0, len(papers), batch_size)]
+    partial_summaries = []
+    for i, batch in enumerate(batches, 1):
+        async with admission.admit("background", retry=True):
+            partial_summaries.append(await summarize_multiple_papers(batch, language, specialty))
+        if on_progress:
+            on_progress(i / (len(batches) + 1))
+
+    client = get_groq_client()
+
+    lang_instruction = "한국어로 작성해주세요." if language == "korean" else "Please write in English."
+    specialty_prompt = SPECIALTY_PROMPTS.get(specialty, SPECIALTY_PROMPTS["general"])
+
+    summaries_text = "\n\n".join(
+        f"**[부분 요약 {i}]** (논문 {len(batch)}편)\n{summary}"
+        for i, (batch, summary) in enumerate(zip(batches, partial_summaries), 1)
+    )
+
+    prompt = f"""{specialty_prompt}
+
+{lang_instruction}
+
+아래는 총 {len(papers)}편의 논문을 {len(batches)}개 묶음으로 나누어 각각 종합 분석한 결과입니다.
+부분 요약들을 하나의 일관된 종합 분석으로 통합해주세요. 중복되는 내용은 합치고, 묶음 간 상충되는 결과가 있으면 언급하세요.
+
+{summaries_text}
+
+## 종합 분석 형식
+### 📚 연구 동향 개요
+### 📊 핵심 발견 종합
+### 💡 임상 적용 포인트
+### 🔮 향후 연구 방향
+### 🩺 인터벤션 영상의학과 관점
+"""
+
+    async with admission.admit("background", retry=True):
+        response = await _create_completion(
+            client,
+            "summarize_reduce",
+            model="llama-3.1-8b-instant",
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=2000,
+            temperature=0.3,
+        )
+
+    if on_progress:
+        on_progress(1.0)
+
+    return response.choices[0].message.content or "요약을 생성할 수 없습니다."
+
+
 async def chat_with_papers(
-    papers: list[Paper],
+    papers: list[PaperRecord],
     user_message: str,
     chat_history: list[dict],
     language: str = "korean",
     specialty: str = "radiology"
-) -> str:
-    """논문 기반으로 AI와 대화합니다."""
+) -> tuple[str, list[str]]:
+    """논문 기반으로 AI와 대화합니다.
+
+    매 턴마다 질문과 관련된 초록 구절만 골라 프롬프트에 넣으며, (답변, 인용 가능한 PMID 목록)을 반환합니다.
+    """
 
     if not GROQ_API_KEY:
-        return "Groq API 키가 설정되지 않았습니다."
+        return "Groq API 키가 설정되지 않았습니다.", []
 
     if not papers:
-        return "선택된 논문이 없습니다."
+        return "선택된 논문이 없습니다.", []
 
-    client = AsyncGroq(api_key=GROQ_API_KEY)
+    client = get_groq_client()
 
     lang_instruction = "한국어로 답변해주세요." if language == "korean" else "Please answer in English."
     specialty_context = "사용자는 인터벤션 영상의학과 전문의입니다. 일반적인 의학 관점에서 답변하되, 인터벤션 시술(혈관/비혈관 중재술, 영상유도 시술 등)과 관련된 내용이 있다면 추가로 언급해주세요." if specialty == "radiology" else ""
 
-    # 논문 컨텍스트 생성
-    papers_context = []
-    for i, paper in enumerate(papers[:10], 1):
-        abstract = paper.abstract[:800] if len(paper.abstract) > 800 else paper.abstract
-        papers_context.append(
-            f"[논문 {i}]\n"
-            f"제목: {paper.title}\n"
-            f"저자: {', '.join(paper.authors[:5])}\n"
-            f"저널: {paper.journal}\n"
-            f"출판일: {paper.pub_date}\n"
-            f"초록: {abstract}"
-        )
-
-    context = "\n\n".join(papers_context)
+    # 논문 컨텍스트 생성: 이번 질문과 직전 사용자 질문으로 관련 구절 검색
+    previous = next((msg["content"] for msg in reversed(chat_history) if msg["role"] == "user"), "")
+    context, sources = await run_cpu(build_chat_context, papers, f"{user_message}\n{previous}")
 
     system_prompt = f"""당신은 학술 논문 분석 전문가입니다. 사용자가 제공한 논문들을 기반으로 질문에 답변합니다.
 {specialty_context}
 {lang_instruction}
 
-## 제공된 논문 정보:
+## 제공된 논문 정보 ({len(papers)}편 중 질문과 관련된 구절):
 {context}
 
 ## 답변 가이드라인:
 - 제공된 논문 내용을 기반으로 정확하게 답변하세요
 - 논문에 없는 내용은 추측하지 말고 "제공된 논문에서 해당 정보를 찾을 수 없습니다"라고 답변하세요
-- 가능하면 어떤 논문에서 정보를 가져왔는지 언급하세요
+- 정보를 가져온 논문은 문장 끝에 [PMID 번호] 형식으로 표시하세요
 - 답변은 명확하고 구조화된 형식으로 작성하세요
 - 영상의학적 관점에서 실용적인 정보를 제공하세요"""
 
@@ -225,14 +331,16 @@ async def chat_with_papers(
     # 현재 사용자 메시지 추가
     messages.append({"role": "user", "content": user_message})
 
-    response = await client.chat.completions.create(
+    response = await _create_completion(
+        client,
+        "chat",
         model="llama-3.1-8b-instant",
         messages=messages,
         max_tokens=1500,
         temperature=0.4,
     )
 
-    return response.choices[0].message.content or "응답을 생성할 수 없습니다."
+    return response.choices[0].message.content or "응답을 생성할 수 없습니다.", sources
 
 
 async def generate_search_query(natural_query: str, language: str = "korean") -> dict:
@@ -241,7 +349,7 @@ async def generate_search_query(natural_query: str, language: str = "korean") ->
     if not GROQ_API_KEY:
         return {"error": "Groq API 키가 설정되지 않았습니다."}
 
-    client = AsyncGroq(api_key=GROQ_API_KEY)
+    client = get_groq_client()
 
     prompt = f"""당신은 PubMed 검색 전문가입니다. 사용자의 자연어 질문을 최적의 PubMed 검색 쿼리로 변환해주세요.
 
@@ -264,7 +372,9 @@ QUERY: (lung cancer[MeSH Terms]) AND (CT scan[Title/Abstract]) AND (diagnosis[Me
 EXPLANATION: 폐암의 CT 진단에 관한 논문을 찾기 위해 MeSH 용어와 제목/초록 검색을 조합했습니다.
 KEYWORDS: lung cancer, CT, diagnosis, imaging"""
 
-    response = await client.chat.completions.create(
+    response = await _create_completion(
+        client,
+        "generate_query",
         model="llama-3.1-8b-instant",
         messages=[
             {"role": "user", "content": prompt}
@@ -300,17 +410,33 @@ KEYWORDS: lung cancer, CT, diagnosis, imaging"""
     return result
 
 
-async def detect_ir_related_papers(papers: list[Paper]) -> dict[str, bool]:
-    """AI를 사용하여 논문이 인터벤션 영상의학과와 관련있는지 판단합니다."""
+async def detect_ir_related_papers(papers: list[PaperRecord], degrade: bool = True) -> dict[str, bool]:
+    """AI를 사용하여 논문이 인터벤션 영상의학과와 관련있는지 판단합니다.
+
+    degrade=True이면 LLM 작업이 밀려 있을 때 새로 판정하지 않고 캐시된 판정만 반환합니다
+    (검색 응답은 IR 표시 없이 나감). 결과를 빠짐없이 채워야 하는 호출은 False로 대기열에서 기다립니다.
+    """
 
     if not GROQ_API_KEY or not papers:
         return {}
 
-    client = AsyncGroq(api_key=GROQ_API_KEY)
+    # 이미 판정한 논문은 캐시를 쓰고 나머지만 LLM에 질의
+    papers = papers[:20]  # 최대 20개
+    verdicts = await ir_cache.get_many([paper.pmid for paper in papers])
+    pending = [paper for paper in papers if paper.pmid not in verdicts]
+
+    if not pending:
+        return verdicts
+
+    if degrade and admission.under_pressure("classify"):
+        LOAD_SHED.labels(feature="ir_detection").inc()
+        return verdicts
+
+    client = get_groq_client()
 
     # 논문 정보를 간단히 정리
     papers_info = []
-    for paper in papers[:20]:  # 최대 20개
+    for paper in pending:
         papers_info.append({
             "pmid": paper.pmid,
             "title": paper.title,
@@ -339,12 +465,15 @@ async def detect_ir_related_papers(papers: list[Paper]) -> dict[str, bool]:
 true = IR 관련, false = IR 관련 아님"""
 
     try:
-        response = await client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=500,
-            temperature=0.1,
-        )
+        async with admission.admit("classify"):
+            response = await _create_completion(
+                client,
+                "detect_ir",
+                model="llama-3.1-8b-instant",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=500,
+                temperature=0.1,
+            )
 
         result_text = response.choices[0].message.content or "{}"
 
@@ -354,9 +483,24 @@ true = IR 관련, false = IR 관련 아님"""
         end = result_text.rfind("}") + 1
         if start != -1 and end > start:
             json_str = result_text[start:end]
-            return json.loads(json_str)
-
-        return {}
+            result = json.loads(json_str)
+            judged = {}
+            for paper in pending:
+                related = result.get(paper.pmid)
+                if isinstance(related, bool):
+                    judged[paper.pmid] = related
+            verdicts.update(judged)
+            await ir_cache.set_many(judged)
+
+        return verdicts
+    except RateBudgetExhausted:
+        raise  # 미리 가져오기 예산 부족은 호출 측에서 처리
+    except AdmissionRejected:
+        if not degrade:
+            raise
+        LOAD_SHED.labels(feature="ir_detection").inc()
+        return verdicts
     except Exception as e:
+        ERRORS.labels(component="detect_ir_related_papers").inc()
         print(f"IR 감지 오류: {e}")
-        return {}
+        return verdicts
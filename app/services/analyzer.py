@@ -1,13 +1,14 @@
 from collections import Counter
-from app.models.schemas import Paper, KeywordAnalysis, TrendAnalysis, AuthorAnalysis
+from app.models.schemas import KeywordAnalysis, TrendAnalysis, AuthorAnalysis
+from app.models.record import PaperRecord
 
 
-def analyze_keywords(papers: list[Paper], top_n: int = 20) -> list[KeywordAnalysis]:
+def analyze_keywords(papers: list[PaperRecord], top_n: int = 20) -> list[KeywordAnalysis]:
     """논문 목록에서 키워드 빈도를 분석합니다."""
 
     all_keywords = []
     for paper in papers:
-        all_keywords.extend(paper.keywords)
+        all_keywords.extend(paper.terms())
 
     # 키워드 빈도 계산
     keyword_counts = Counter(all_keywords)
@@ -19,7 +20,7 @@ def analyze_keywords(papers: list[Paper], top_n: int = 20) -> list[KeywordAnalys
     ]
 
 
-def analyze_trends(papers: list[Paper]) -> list[TrendAnalysis]:
+def analyze_trends(papers: list[PaperRecord]) -> list[TrendAnalysis]:
     """연도별 논문 수를 분석합니다."""
 
     year_counts = Counter()
@@ -39,7 +40,7 @@ def analyze_trends(papers: list[Paper]) -> list[TrendAnalysis]:
     ]
 
 
-def analyze_authors(papers: list[Paper], top_n: int = 20) -> list[AuthorAnalysis]:
+def analyze_authors(papers: list[PaperRecord], top_n: int = 20) -> list[AuthorAnalysis]:
     """저자별 논문 수를 분석합니다."""
 
     all_authors = []
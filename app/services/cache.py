@@ -0,0 +1,211 @@
+import asyncio
+import os
+import pickle
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional
+from app.services.metrics import record_cache, record_shared_cache, ERRORS
+from app.services.shared import SharedBackend, get_shared_backend
+
+_MISSING = object()
+
+
+class TTLCache:
+    """만료 시간이 있는 LRU 캐시
+
+    maxsize를 넘으면 가장 오래 사용하지 않은 항목부터 제거하고,
+    ttl(초)이 지난 항목은 조회 시 만료 처리합니다. 조회 결과는 메트릭에 기록됩니다.
+
+    backend가 있으면 2단 캐시로 동작합니다. get_many/set_many는 프로세스 안 캐시와 함께 공유 저장소에도
+    읽고 쓰며, 프로세스 안에서 못 찾은 키들은 한 번에 공유 저장소(다른 워커가 저장한 값)에서 조회해
+    원래 만료 시각 그대로 프로세스 안에 다시 채웁니다. 공유 저장소 I/O는 이벤트 루프를 막지 않도록
+    스레드에서 실행합니다. 동기 메서드 get/set은 프로세스 안 캐시만 사용합니다.
+    공유 저장소 오류는 기록만 하고 프로세스 안 캐시로 계속 동작합니다.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, backend: Optional[SharedBackend] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def _shared_key(self, key: Hashable) -> str:
+        return f"{self.name}:{key!r}"
+
+    def _get_local(self, key: Hashable) -> Any:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return _MISSING
+        if item[0] < time.time():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return item[1]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._get_local(key)
+        record_cache(self.name, hit=value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def _load_shared(self, shared_keys: list[str]) -> dict[str, tuple[float, Any]]:
+        """공유 저장소에서 읽어 (만료 시각, 값)으로 복원합니다 (스레드에서 실행).
+
+        복원할 수 없는 항목(손상되었거나 다른 버전이 저장한 값)은 오류로 기록하고 없는 것으로 취급합니다.
+        """
+
+        items = {}
+        for shared_key, data in self.backend.get_many(shared_keys).items():
+            try:
+                items[shared_key] = pickle.loads(data)
+            except Exception as e:
+                ERRORS.labels(component="shared_cache").inc()
+                print(f"공유 캐시 항목 복원 오류 ({self.name}): {e}")
+        return items
+
+    async def get_many(self, keys: list[Hashable]) -> dict[Hashable, Any]:
+        """찾은 키의 값만 담은 딕셔너리를 반환합니다 (공유 저장소는 한 번만 조회)."""
+
+        found = {}
+        missing = []
+        for key in keys:
+            value = self._get_local(key)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing and self.backend is not None:
+            shared_keys = {self._shared_key(key): key for key in missing}
+            try:
+                items = await asyncio.to_thread(self._load_shared, list(shared_keys))
+            except Exception as e:
+                ERRORS.labels(component="shared_cache").inc()
+                print(f"공유 캐시 조회 오류 ({self.name}): {e}")
+                items = {}
+
+            now = time.time()
+            for shared_key, key in shared_keys.items():
+                item = items.get(shared_key)
+                record_shared_cache(self.name, hit=item is not None)
+                if item is not None and item[0] >= now:
+                    self._store(key, *item)
+                    found[key] = item[1]
+
+        for key in keys:
+            record_cache(self.name, hit=key in found)
+        return found
+
+    def _store(self, key: Hashable, expires_at: float, value: Any) -> None:
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._store(key, time.time() + ttl, value)
+
+    async def set_many(self, items: dict[Hashable, Any], ttl: Optional[float] = None) -> None:
+        """여러 항목을 저장합니다 (공유 저장소에는 한 번에 씀)."""
+
+        if not items:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl
+        for key, value in items.items():
+            self._store(key, expires_at, value)
+
+        if self.backend is not None:
+            try:
+                data = {
+                    self._shared_key(key): pickle.dumps((expires_at, value), protocol=pickle.HIGHEST_PROTOCOL)
+                    for key, value in items.items()
+                }
+                await asyncio.to_thread(self.backend.set_many, data, ttl)
+            except Exception as e:
+                ERRORS.labels(component="shared_cache").inc()
+                print(f"공유 캐시 저장 오류 ({self.name}): {e}")
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[0] >= time.time()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def dump(self) -> list[tuple[Hashable, float, Any]]:
+        """만료되지 않은 항목을 (key, 만료 시각, 값) 목록으로 반환합니다."""
+        now = time.time()
+        return [(key, exp, value) for key, (exp, value) in self._data.items() if exp >= now]
+
+    def restore(self, items: list[tuple[Hashable, float, Any]]) -> int:
+        """dump() 결과를 복원합니다. 복원 중 만료된 항목은 건너뜁니다."""
+        now = time.time()
+        restored = 0
+        for key, expires_at, value in items:
+            if expires_at >= now and key not in self._data:
+                self._data[key] = (expires_at, value)
+                restored += 1
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return restored
+
+
+_registry: dict[str, TTLCache] = {}
+
+
+def get_cache(name: str, maxsize: int, ttl: float) -> TTLCache:
+    """이름별로 하나의 캐시 인스턴스를 반환합니다 (디스크 저장/복원 대상으로 등록).
+
+    여러 워커 모드(SHARED_STATE_URL 설정)에서는 워커들이 함께 쓰는 공유 저장소 앞에 두는 2단 캐시가 됩니다.
+    """
+
+    if name not in _registry:
+        _registry[name] = TTLCache(name, maxsize, ttl, backend=get_shared_backend())
+    return _registry[name]
+
+
+def snapshot_caches() -> dict[str, list]:
+    """등록된 모든 캐시의 유효 항목을 스냅샷으로 만듭니다 (이벤트 루프 스레드에서 호출)."""
+    return {name: cache.dump() for name, cache in _registry.items()}
+
+
+def write_snapshot(path: Path, snapshot: dict[str, list]) -> None:
+    """스냅샷을 디스크에 저장합니다 (임시 파일에 쓴 뒤 교체). 스레드에서 실행해도 안전합니다."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 여러 워커가 동시에 저장해도 임시 파일이 겹치지 않도록 프로세스별 이름 사용
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+
+
+def read_snapshot(path: Path) -> dict[str, list]:
+    """디스크의 스냅샷을 읽습니다. 없거나 손상되었으면 빈 스냅샷을 반환합니다."""
+
+    if not path.exists():
+        return {}
+
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"캐시 복원 오류: {e}")
+        return {}
+
+
+def restore_snapshot(snapshot: dict[str, list]) -> int:
+    """스냅샷을 캐시에 복원하고 복원된 항목 수를 반환합니다 (이벤트 루프 스레드에서 호출)."""
+
+    restored = 0
+    for name, items in snapshot.items():
+        cache = _registry.get(name)
+        if cache is not None:
+            restored += cache.restore(items)
+    return restored
@@ -0,0 +1,36 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# 현재 요청의 마감 시각 (time.monotonic 기준, 없으면 None)
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# 업스트림 타임아웃은 마감보다 조금 늦게 잡아, 마감 처리(요청 취소)가 먼저 일어나게 함
+TIMEOUT_MARGIN = 0.25
+
+
+def set_deadline(seconds: float):
+    """지금부터 seconds초 뒤를 현재 컨텍스트의 마감 시각으로 설정하고 토큰을 반환합니다."""
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """마감까지 남은 시간(초)을 반환합니다. 마감이 없으면 None입니다."""
+
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def upstream_timeout(default: float) -> float:
+    """업스트림 호출 타임아웃: 기본값과 마감까지 남은 시간 중 짧은 쪽"""
+
+    left = remaining()
+    if left is None:
+        return default
+    return max(0.001, min(default, left + TIMEOUT_MARGIN))
@@ -0,0 +1,60 @@
+import asyncio
+import contextvars
+import multiprocessing
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Optional, TypeVar
+from app.config import CPU_EXECUTOR, CPU_WORKERS
+
+T = TypeVar("T")
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Optional[Executor]:
+    """설정에 맞는 CPU 작업용 executor를 반환합니다. inline 모드면 None입니다."""
+
+    global _executor
+
+    if CPU_EXECUTOR == "inline":
+        return None
+
+    if _executor is None:
+        if CPU_EXECUTOR == "process":
+            # 스레드가 있는 프로세스에서 fork하면 락이 꼬일 수 있으므로 spawn 사용
+            _executor = ProcessPoolExecutor(
+                max_workers=CPU_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            _executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="cpu")
+
+    return _executor
+
+
+async def run_cpu(func: Callable[..., T], *args) -> T:
+    """CPU 작업을 executor에서 실행하여 이벤트 루프가 막히지 않게 합니다."""
+
+    executor = get_executor()
+    if executor is None:
+        return func(*args)
+
+    call = partial(func, *args)
+    if isinstance(executor, ThreadPoolExecutor):
+        # 스레드에서도 요청 스팬이 이어지도록 컨텍스트 전달
+        call = partial(contextvars.copy_context().run, call)
+
+    return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+def is_parallel() -> bool:
+    """여러 작업을 나눠 동시에 실행할 의미가 있는지 여부"""
+    return CPU_EXECUTOR != "inline" and CPU_WORKERS > 1
+
+
+def shutdown_executor() -> None:
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
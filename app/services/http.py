@@ -0,0 +1,29 @@
+import httpx
+from typing import Optional
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """업스트림 호출용 공유 httpx 클라이언트를 반환합니다.
+
+    요청마다 클라이언트를 새로 만들면 매번 TCP/TLS 연결을 다시 맺으므로
+    프로세스 전체에서 하나의 커넥션 풀을 재사용합니다.
+    """
+
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60.0),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,7 +1,10 @@
-import httpx
 from typing import Optional
+from app.config import ICITE_API_URL, CITATION_CACHE_TTL
+from app.services.metrics import ERRORS
+from app.services.cache import get_cache
+from app.services.upstream import hedged_get
 
-ICITE_API_URL = "https://icite.od.nih.gov/api/pubs"
+citation_cache = get_cache("citations", maxsize=50000, ttl=CITATION_CACHE_TTL)
 
 
 async def fetch_citation_counts(pmids: list[str]) -> dict[str, int]:
@@ -10,39 +13,45 @@ async def fetch_citation_counts(pmids: list[str]) -> dict[str, int]:
     if not pmids:
         return {}
 
-    citation_counts = {}
+    citation_counts = await citation_cache.get_many(pmids)
+
+    missing = [pmid for pmid in pmids if pmid not in citation_counts]
 
     # iCite API는 한 번에 최대 1000개의 PMID를 처리할 수 있음
     batch_size = 1000
 
-    async with httpx.AsyncClient() as client:
-        for i in range(0, len(pmids), batch_size):
-            batch = pmids[i:i + batch_size]
-
-            try:
-                response = await client.get(
-                    ICITE_API_URL,
-                    params={
-                        "pmids": ",".join(batch),
-                        "format": "json"
-                    },
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # iCite 응답에서 피인용 횟수 추출
-                for paper in data.get("data", []):
-                    pmid = str(paper.get("pmid", ""))
-                    citation_count = paper.get("citation_count", 0)
-                    citation_counts[pmid] = citation_count if citation_count else 0
-
-            except Exception as e:
-                print(f"iCite API 오류: {e}")
-                # 오류 시 해당 배치의 PMID들은 0으로 설정
-                for pmid in batch:
-                    if pmid not in citation_counts:
-                        citation_counts[pmid] = 0
+    for i in range(0, len(missing), batch_size):
+        batch = missing[i:i + batch_size]
+
+        try:
+            response = await hedged_get(
+                "icite",
+                ICITE_API_URL,
+                30.0,
+                size=len(batch),
+                params={
+                    "pmids": ",".join(batch),
+                    "format": "json"
+                },
+            )
+            data = response.json()
+
+            # iCite 응답에서 피인용 횟수 추출
+            fetched = {}
+            for paper in data.get("data", []):
+                pmid = str(paper.get("pmid", ""))
+                citation_count = paper.get("citation_count", 0)
+                fetched[pmid] = citation_count if citation_count else 0
+            citation_counts.update(fetched)
+            await citation_cache.set_many(fetched)
+
+        except Exception as e:
+            ERRORS.labels(component="fetch_citation_counts").inc()
+            print(f"iCite API 오류: {e}")
+            # 오류 시 해당 배치의 PMID들은 0으로 설정 (캐시하지 않음)
+            for pmid in batch:
+                if pmid not in citation_counts:
+                    citation_counts[pmid] = 0
 
     return citation_counts
 
@@ -0,0 +1,318 @@
+import asyncio
+import fcntl
+import json
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+from app.config import JOBS_DIR, JOB_WORKERS, JOB_QUEUE_SIZE, JOB_RETENTION_SECONDS
+from app.models.schemas import JobRequest
+
+# 종료 상태 (더 이상 바뀌지 않음)
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class JobQueueFull(Exception):
+    """작업 대기열이 가득 찬 경우"""
+
+
+@dataclass
+class Job:
+    id: str
+    type: str
+    request: dict
+    status: str = "queued"
+    progress: float = 0.0
+    message: str = ""
+    error: Optional[str] = None
+    artifact: Optional[str] = None
+    media_type: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    owner: Optional[str] = None  # 작업을 실행하는 워커 프로세스의 JobManager.owner
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+class JobContext:
+    """작업 핸들러가 진행률을 보고하고 결과 파일을 쓰는 데 사용하는 인터페이스"""
+
+    def __init__(self, manager: "JobManager", job: Job):
+        self._manager = manager
+        self.job = job
+
+    @property
+    def request(self) -> JobRequest:
+        return JobRequest(**self.job.request)
+
+    def progress(self, value: float, message: str = "") -> None:
+        self.job.progress = max(0.0, min(1.0, value))
+        if message:
+            self.job.message = message
+        self._manager._changed(self.job)
+        # 다른 워커에서 받은 취소 요청은 진행률을 보고할 때 반영
+        if self._manager._cancel_marker(self.job.id).exists():
+            self._manager.cancel(self.job.id)
+
+    async def write_artifact(self, content: str | bytes, extension: str, media_type: str) -> None:
+        path = self._manager.artifacts_directory / f"{self.job.id}.{extension}"
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        await asyncio.to_thread(path.write_bytes, data)
+        self.job.artifact = path.name
+        self.job.media_type = media_type
+
+
+JobHandler = Callable[[JobContext], Awaitable[None]]
+
+
+class JobManager:
+    """제한된 워커 풀에서 장시간 작업을 실행하고 상태를 로컬 디스크에 저장합니다.
+
+    작업 상태는 JOBS_DIR/<id>.json, 결과 파일은 JOBS_DIR/artifacts/<id>.<확장자>로 저장되어
+    재시작 후에도 완료된 작업을 내려받을 수 있고, 실행 중이던 작업은 다시 대기열에 들어갑니다.
+
+    여러 워커 프로세스로 실행하면 작업은 제출받은 워커(owner)가 실행합니다. 다른 워커는 상태 파일을 읽어
+    조회/이벤트 요청에 응답하고, 취소는 JOBS_DIR/<id>.cancel 표시 파일로 실행 중인 워커에 전달합니다.
+    각 워커는 JOBS_DIR/owners/<owner>.lock 파일 잠금을 살아 있는 동안 쥐고 있어, 시작할 때 잠금이 풀린
+    (종료된) 워커의 미완료 작업만 넘겨받습니다.
+    """
+
+    def __init__(self, directory: Path, workers: int, queue_size: int):
+        self.directory = directory
+        self.artifacts_directory = directory / "artifacts"
+        self.workers = workers
+        self.queue_size = queue_size
+        self.jobs: dict[str, Job] = {}
+        self.handlers: dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self._running: dict[str, asyncio.Task] = {}
+        self._cancel_requested: set[str] = set()
+        self._listeners: dict[str, set[asyncio.Queue]] = {}
+        self.owner = uuid.uuid4().hex
+        self._owner_lock = None
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        self.handlers[job_type] = handler
+
+    async def start(self) -> None:
+        self.artifacts_directory.mkdir(parents=True, exist_ok=True)
+        self._queue = asyncio.Queue()
+        await asyncio.to_thread(self._hold_owner_lock)
+        await asyncio.to_thread(self._load)
+
+        # 재시작 전에 대기/실행 중이던 작업(실행하던 워커가 종료됨)은 처음부터 다시 실행
+        for job in await asyncio.to_thread(self._claim_orphans):
+            self._queue.put_nowait(job.id)
+
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._owner_lock is not None:
+            self._owner_lock_path(self.owner).unlink(missing_ok=True)
+            self._owner_lock.close()
+            self._owner_lock = None
+
+    def submit(self, request: JobRequest) -> Job:
+        if request.type not in self.handlers:
+            raise ValueError(f"지원하지 않는 작업 유형: {request.type}")
+
+        queued = sum(1 for job in self.jobs.values() if job.status == "queued")
+        if queued >= self.queue_size:
+            raise JobQueueFull("작업 대기열이 가득 찼습니다.")
+
+        job = Job(id=uuid.uuid4().hex, type=request.type, request=request.model_dump(), owner=self.owner)
+        self.jobs[job.id] = job
+        self._persist(job)
+        self._queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is not None and job.owner == self.owner:
+            return job
+        # 다른 워커가 실행하는 작업은 그 워커가 저장한 최신 상태를 읽음
+        return self._read(job_id) or job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is None or job.is_terminal:
+            return job
+
+        if job.owner != self.owner:
+            self._cancel_marker(job_id).touch()
+            return job
+
+        task = self._running.get(job_id)
+        if task is not None:
+            self._cancel_requested.add(job_id)
+            task.cancel()
+        else:
+            self._finish(job, "cancelled")
+        return job
+
+    def artifact_path(self, job: Job) -> Optional[Path]:
+        return self.artifacts_directory / job.artifact if job.artifact else None
+
+    async def events(self, job_id: str):
+        """작업 상태가 바뀔 때마다 Job을 내보내고, 종료 상태가 되면 끝납니다."""
+
+        job = self.get(job_id)
+        if job is None:
+            return
+
+        if job.owner != self.owner:
+            # 다른 워커의 작업은 상태 파일이 바뀌었는지 주기적으로 확인
+            yield job
+            while not job.is_terminal:
+                await asyncio.sleep(1.0)
+                latest = self.get(job_id)
+                if latest is not None and latest != job:
+                    job = latest
+                    yield job
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners.setdefault(job_id, set()).add(queue)
+        try:
+            yield job
+            while not job.is_terminal:
+                await queue.get()
+                yield job
+        finally:
+            self._listeners[job_id].discard(queue)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != "queued":
+                continue
+            if self._cancel_marker(job_id).exists():
+                self._finish(job, "cancelled")
+                continue
+
+            job.status = "running"
+            job.started_at = time.time()
+            self._changed(job)
+
+            task = asyncio.create_task(self.handlers[job.type](JobContext(self, job)))
+            self._running[job_id] = task
+            try:
+                await task
+                self._finish(job, "succeeded")
+            except asyncio.CancelledError:
+                if job_id not in self._cancel_requested:
+                    raise  # 워커 자체가 종료되는 경우 (재시작 시 다시 대기열에 들어감)
+                self._finish(job, "cancelled")
+            except Exception as e:
+                job.error = str(e)
+                self._finish(job, "failed")
+            finally:
+                self._running.pop(job_id, None)
+                self._cancel_requested.discard(job_id)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        if status == "succeeded":
+            job.progress = 1.0
+        self._changed(job)
+        self._cancel_marker(job.id).unlink(missing_ok=True)
+
+    def _changed(self, job: Job) -> None:
+        self._persist(job)
+        for queue in self._listeners.get(job.id, ()):
+            queue.put_nowait(None)
+
+    def _persist(self, job: Job) -> None:
+        path = self.directory / f"{job.id}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(job), ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _cancel_marker(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.cancel"
+
+    def _read(self, job_id: str) -> Optional[Job]:
+        if not job_id.isalnum():
+            return None
+        try:
+            return Job(**json.loads((self.directory / f"{job_id}.json").read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _owner_lock_path(self, owner: str) -> Path:
+        return self.directory / "owners" / f"{owner}.lock"
+
+    def _hold_owner_lock(self) -> None:
+        path = self._owner_lock_path(self.owner)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._owner_lock = open(path, "w")
+        fcntl.flock(self._owner_lock, fcntl.LOCK_EX)
+
+    def _owner_alive(self, owner: Optional[str]) -> bool:
+        if not owner:
+            return False
+        if owner == self.owner:
+            return True
+        path = self._owner_lock_path(owner)
+        try:
+            with open(path, "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except FileNotFoundError:
+            return False
+        except BlockingIOError:
+            return True
+        # 잠금을 얻었으면 그 워커는 이미 종료됨
+        path.unlink(missing_ok=True)
+        return False
+
+    def _claim_orphans(self) -> list[Job]:
+        """실행하던 워커가 종료된 미완료 작업을 이 워커 소유로 바꾸고 생성 순으로 반환합니다."""
+
+        claimed = []
+        # 동시에 시작한 워커들이 같은 작업을 넘겨받지 않도록 한 번에 하나씩 확인
+        with open(self.directory / ".claim.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            for job_id in [job.id for job in self.jobs.values() if not job.is_terminal]:
+                job = self._read(job_id)
+                if job is None or job.is_terminal or self._owner_alive(job.owner):
+                    continue
+                job.owner = self.owner
+                job.status = "queued"
+                job.progress = 0.0
+                job.message = "재시작 후 다시 대기 중"
+                self._persist(job)
+                self.jobs[job.id] = job
+                claimed.append(job)
+        return sorted(claimed, key=lambda job: job.created_at)
+
+    def _load(self) -> None:
+        now = time.time()
+        for path in self.directory.glob("*.json"):
+            try:
+                job = Job(**json.loads(path.read_text(encoding="utf-8")))
+            except Exception as e:
+                print(f"작업 상태 복원 오류 ({path.name}): {e}")
+                continue
+
+            # 보관 기간이 지난 완료 작업은 결과 파일과 함께 삭제
+            if job.is_terminal and job.finished_at and now - job.finished_at > JOB_RETENTION_SECONDS:
+                path.unlink(missing_ok=True)
+                if job.artifact:
+                    (self.artifacts_directory / job.artifact).unlink(missing_ok=True)
+                continue
+
+            self.jobs[job.id] = job
+
+
+job_manager = JobManager(Path(JOBS_DIR), workers=JOB_WORKERS, queue_size=JOB_QUEUE_SIZE)
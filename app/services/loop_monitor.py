@@ -0,0 +1,27 @@
+import asyncio
+import time
+from app.services.metrics import EVENT_LOOP_LAG_SECONDS, EVENT_LOOP_LAG_MAX_SECONDS
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    """주기적으로 sleep하고 예정보다 늦게 깨어난 시간을 이벤트 루프 지연으로 기록합니다.
+
+    동기 CPU 작업이 루프를 막으면 지연이 그만큼 커집니다.
+    """
+
+    window_max = 0.0
+    window_start = time.perf_counter()
+
+    while True:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - expected)
+
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        window_max = max(window_max, lag)
+
+        # 최근 10초 구간의 최대 지연
+        if time.perf_counter() - window_start >= 10:
+            EVENT_LOOP_LAG_MAX_SECONDS.set(window_max)
+            window_max = 0.0
+            window_start = time.perf_counter()
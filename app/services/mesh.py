@@ -0,0 +1,267 @@
+import json
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+from app.config import MESH_INDEX_PATH
+from app.models.record import PaperRecord
+from app.models.schemas import MeshRollup, MeshRollupItem
+
+# 인덱스 파일 형식: MAGIC, 헤더 길이(4바이트), JSON 헤더, 8바이트 정렬된 배열들
+MAGIC = b"MESHIDX1"
+
+
+def _tree_depth(tree_number: str) -> int:
+    return tree_number.count(".") + 1
+
+
+def write_mesh_index(path: Path, descriptors: list[tuple[str, str, list[str]]], source: str = "") -> dict:
+    """(디스크립터 UI, 이름, 트리 번호 목록)으로 MeSH 트리 인덱스 파일을 만들고 헤더를 반환합니다.
+
+    트리 번호(노드)마다 깊이 1 ~ max_depth의 조상 노드를 미리 계산해 두므로, 롤업할 때는
+    트리를 따라 올라가지 않고 배열 한 번 조회로 원하는 깊이의 상위 디스크립터를 찾습니다.
+    """
+
+    import numpy as np
+
+    descriptors = sorted(
+        (d for d in descriptors if d[0][:1] == "D" and d[0][1:].isdigit()),
+        key=lambda d: int(d[0][1:]),
+    )
+
+    tree_numbers: list[str] = []
+    node_desc: list[int] = []
+    desc_ptr = [0]
+    for index, (_, _, trees) in enumerate(descriptors):
+        for tree in trees:
+            tree_numbers.append(tree)
+            node_desc.append(index)
+        desc_ptr.append(len(tree_numbers))
+
+    node_of = {tree: node for node, tree in enumerate(tree_numbers)}
+    depths = [_tree_depth(tree) for tree in tree_numbers]
+    max_depth = max(depths, default=1)
+
+    # 조상[노드, k-1] = 깊이 k의 조상 노드 (노드가 더 얕으면 자기 자신)
+    ancestors = np.empty((len(tree_numbers), max_depth), dtype=np.int32)
+    for node, tree in enumerate(tree_numbers):
+        parts = tree.split(".")
+        previous = node
+        for k in range(1, max_depth + 1):
+            if k >= len(parts):
+                ancestors[node, k - 1] = node
+                continue
+            # 디스크립터 파일에 중간 노드가 빠져 있으면 한 단계 위 조상을 사용
+            previous = node_of.get(".".join(parts[:k]), previous if k > 1 else node)
+            ancestors[node, k - 1] = previous
+
+    def strings(values: list[str]) -> tuple:
+        encoded = [v.encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    name_offsets, name_blob = strings([d[1] for d in descriptors])
+    tree_offsets, tree_blob = strings(tree_numbers)
+
+    arrays = {
+        "desc_ui": np.array([int(d[0][1:]) for d in descriptors], dtype=np.int32),
+        "desc_ptr": np.array(desc_ptr, dtype=np.int32),
+        "name_offsets": name_offsets,
+        "name_blob": name_blob,
+        "node_desc": np.array(node_desc, dtype=np.int32),
+        "node_depth": np.array(depths, dtype=np.int8),
+        "node_category": np.frombuffer(b"".join(t[:1].encode("ascii") for t in tree_numbers), dtype=np.uint8),
+        "node_ancestors": ancestors,
+        "tree_offsets": tree_offsets,
+        "tree_blob": tree_blob,
+    }
+
+    header = {
+        "descriptors": len(descriptors),
+        "nodes": len(tree_numbers),
+        "max_depth": max_depth,
+        "source": source,
+        "arrays": {},
+    }
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += (array.nbytes + 7) // 8 * 8
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (-(len(MAGIC) + 4 + len(header_bytes)) % 8)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header_bytes).to_bytes(4, "little"))
+        f.write(header_bytes)
+        for array in arrays.values():
+            data = np.ascontiguousarray(array).tobytes()
+            f.write(data)
+            f.write(b"\0" * (-len(data) % 8))
+    tmp_path.replace(path)
+    return header
+
+
+class MeshTree:
+    """메모리 매핑된 MeSH 트리 인덱스 (읽기 전용)
+
+    배열은 파일을 그대로 가리키므로 로딩 비용이 거의 없고, 여러 워커 프로세스가 같은 페이지를 공유합니다.
+    """
+
+    def __init__(self, path: Path):
+        import numpy as np
+
+        self.path = path
+        self.mtime = os.stat(path).st_mtime
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"MeSH 트리 인덱스 파일이 아닙니다: {path}")
+        header_length = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 4], "little")
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mmap[start:start + header_length])
+        data_start = start + header_length
+
+        for name, spec in self.header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"])) if spec["shape"] else 1
+            array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=data_start + spec["offset"])
+            setattr(self, name, array.reshape(spec["shape"]))
+
+        self.descriptors = self.header["descriptors"]
+        self.max_depth = self.header["max_depth"]
+
+    def _string(self, offsets, blob, index: int) -> str:
+        return bytes(blob[offsets[index]:offsets[index + 1]]).decode("utf-8")
+
+    def name(self, desc: int) -> str:
+        return self._string(self.name_offsets, self.name_blob, desc)
+
+    def ui(self, desc: int) -> str:
+        return f"D{int(self.desc_ui[desc]):06d}"
+
+    def tree_numbers(self, desc: int) -> list[str]:
+        return [
+            self._string(self.tree_offsets, self.tree_blob, node)
+            for node in range(self.desc_ptr[desc], self.desc_ptr[desc + 1])
+        ]
+
+    def rollup(self, paper_ids: list[int], uis: list[str], depth: int, category: Optional[str] = None):
+        """(논문 번호, 디스크립터 UI) 쌍을 깊이 depth의 상위 디스크립터로 올려 셉니다.
+
+        반환값은 (디스크립터별 논문 수 배열, 하나 이상 집계된 논문 수)입니다. 한 논문은 같은 상위
+        디스크립터에 한 번만 세며, depth보다 얕은 디스크립터는 자기 자신으로 셉니다.
+        """
+
+        import numpy as np
+
+        counts = np.zeros(self.descriptors, dtype=np.int64)
+        if not uis or not self.descriptors:
+            return counts, 0
+
+        # 같은 UI가 반복되므로 숫자 변환은 고유 UI마다 한 번만
+        numbers = {ui: int(ui[1:]) for ui in set(uis) if ui[:1] == "D" and ui[1:].isdigit()}
+        nums = np.fromiter((numbers.get(ui, -1) for ui in uis), dtype=np.int32, count=len(uis))
+        papers = np.array(paper_ids, dtype=np.int64)
+
+        desc = np.minimum(np.searchsorted(self.desc_ui, nums), self.descriptors - 1)
+        known = self.desc_ui[desc] == nums
+        papers, desc = papers[known], desc[known]
+
+        # 디스크립터 → 트리 노드 (노드 번호는 디스크립터 순으로 연속이므로 범위를 한 번에 펼침)
+        starts = self.desc_ptr[desc].astype(np.int64)
+        lengths = self.desc_ptr[desc + 1].astype(np.int64) - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return counts, 0
+        papers = np.repeat(papers, lengths)
+        nodes = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+
+        if category:
+            keep = np.isin(self.node_category[nodes], np.frombuffer(category.encode("ascii"), dtype=np.uint8))
+            papers, nodes = papers[keep], nodes[keep]
+
+        level = min(max(depth, 1), self.max_depth) - 1
+        targets = self.node_desc[self.node_ancestors[nodes, level]].astype(np.int64)
+
+        pairs = np.unique(papers * self.descriptors + targets)
+        counts += np.bincount(pairs % self.descriptors, minlength=self.descriptors)
+        tagged = len(np.unique(pairs // self.descriptors))
+        return counts, tagged
+
+
+_tree: Optional[MeshTree] = None
+_tree_lock = threading.Lock()
+
+MESH_INDEX_MISSING = "MeSH 트리 인덱스가 없습니다. 먼저 python -m app.mesh_index 로 생성하세요."
+
+
+def get_mesh_tree() -> Optional[MeshTree]:
+    """MeSH 트리 인덱스를 반환합니다. 아직 만들지 않았으면 None입니다.
+
+    인덱스 파일이 다시 만들어지면(수정 시각 변경) 새 파일을 매핑합니다.
+    """
+
+    global _tree
+
+    path = Path(MESH_INDEX_PATH)
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+    with _tree_lock:
+        if _tree is None or _tree.mtime != mtime:
+            _tree = MeshTree(path)
+    return _tree
+
+
+def analyze_mesh_rollup(
+    papers: list[PaperRecord],
+    depth: int = 2,
+    top_n: int = 20,
+    category: Optional[str] = None,
+    major_only: bool = False,
+) -> MeshRollup:
+    """논문들의 MeSH 주제어를 트리 깊이 depth의 상위 디스크립터로 묶어 셉니다."""
+
+    tree = get_mesh_tree()
+    if tree is None:
+        raise RuntimeError(MESH_INDEX_MISSING)
+
+    import numpy as np
+
+    paper_ids, uis = [], []
+    for index, paper in enumerate(papers):
+        for heading in paper.mesh:
+            if heading.major or not major_only:
+                paper_ids.append(index)
+                uis.append(heading.ui)
+    counts, tagged = tree.rollup(paper_ids, uis, depth, category)
+
+    nonzero = np.flatnonzero(counts)
+    # 많은 순, 같으면 UI 순
+    top = nonzero[np.lexsort((nonzero, -counts[nonzero]))][:top_n]
+    items = [
+        MeshRollupItem(
+            ui=tree.ui(desc),
+            name=tree.name(desc),
+            tree_numbers=[t for t in tree.tree_numbers(desc) if not category or t[:1] in category],
+            count=int(counts[desc]),
+            percentage=round(int(counts[desc]) / tagged * 100, 1) if tagged else 0.0,
+        )
+        for desc in top.tolist()
+    ]
+    return MeshRollup(
+        depth=min(max(depth, 1), tree.max_depth),
+        category=category,
+        papers=len(papers),
+        tagged=tagged,
+        items=items,
+    )
@@ -0,0 +1,272 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from app.services.timing import span
+
+# 업스트림 호출은 수 초까지 걸리므로 기본 버킷보다 긴 구간까지 포함
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# XML 파싱은 ms 단위이므로 더 촘촘한 버킷 사용
+PARSE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+# HTTP 요청 지연 시간 (라우트 템플릿 기준)
+HTTP_REQUEST_SECONDS = Histogram(
+    "pubmed_http_request_seconds",
+    "HTTP 요청 처리 시간",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# 외부 API 호출 지연 시간 (esearch, efetch, icite, groq)
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "pubmed_upstream_request_seconds",
+    "외부 API 호출 시간",
+    ["upstream", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# PubMed XML 파싱 시간
+XML_PARSE_SECONDS = Histogram(
+    "pubmed_xml_parse_seconds",
+    "PubMed XML 파싱 시간",
+    buckets=PARSE_BUCKETS,
+)
+
+# 파싱된 논문 수
+PAPERS_PARSED = Counter(
+    "pubmed_papers_parsed_total",
+    "파싱된 논문 수",
+)
+
+# LLM 토큰 사용량 (operation: summarize, chat, ..., kind: prompt/completion)
+LLM_TOKENS = Counter(
+    "pubmed_llm_tokens_total",
+    "LLM 토큰 사용량",
+    ["operation", "kind"],
+)
+
+# 캐시 조회 결과 (result: hit/miss) - 적중률은 hit / (hit + miss)
+CACHE_REQUESTS = Counter(
+    "pubmed_cache_requests_total",
+    "캐시 조회 횟수",
+    ["cache", "result"],
+)
+
+# 여러 워커 모드에서 프로세스 안 캐시에 없어 공유 저장소를 조회한 결과 (result: hit/miss)
+SHARED_CACHE_REQUESTS = Counter(
+    "pubmed_shared_cache_requests_total",
+    "공유 캐시 조회 횟수",
+    ["cache", "result"],
+)
+
+# 컴포넌트별 오류 수
+ERRORS = Counter(
+    "pubmed_errors_total",
+    "오류 발생 횟수",
+    ["component"],
+)
+
+# 이벤트 루프 지연 (예정보다 늦게 깨어난 시간)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "pubmed_event_loop_lag_seconds",
+    "이벤트 루프 지연 시간",
+    buckets=PARSE_BUCKETS,
+)
+
+EVENT_LOOP_LAG_MAX_SECONDS = Gauge(
+    "pubmed_event_loop_lag_max_seconds",
+    "최근 10초 구간의 최대 이벤트 루프 지연",
+    multiprocess_mode="livemax",
+)
+
+# 레이트 리밋 토큰을 얻기까지 기다린 시간
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "pubmed_rate_limit_wait_seconds",
+    "레이트 리밋 대기 시간",
+    ["limiter"],
+    buckets=PARSE_BUCKETS + (5.0, 10.0),
+)
+
+# 백그라운드 작업이 남은 예산이 없어 호출을 포기한 횟수
+RATE_LIMIT_REJECTED = Counter(
+    "pubmed_rate_limit_rejected_total",
+    "예산 부족으로 생략된 백그라운드 호출 수",
+    ["limiter"],
+)
+
+# 다음 페이지 미리 가져오기 작업 결과 (outcome: completed/cancelled/budget/error)
+PREFETCH_TASKS = Counter(
+    "pubmed_prefetch_tasks_total",
+    "다음 페이지 미리 가져오기 작업 수",
+    ["outcome"],
+)
+
+# 미리 가져오기를 켠 클라이언트의 페이지 요청 (result: hit/miss) - 적중률은 hit / (hit + miss)
+PREFETCH_LOOKUPS = Counter(
+    "pubmed_prefetch_lookups_total",
+    "미리 가져온 페이지 사용 여부",
+    ["result"],
+)
+
+# 미리 가져오기에 쓴 업스트림 호출 수와 LLM 토큰
+PREFETCH_UPSTREAM_REQUESTS = Counter(
+    "pubmed_prefetch_upstream_requests_total",
+    "미리 가져오기의 외부 API 호출 수",
+    ["upstream"],
+)
+
+PREFETCH_LLM_TOKENS = Counter(
+    "pubmed_prefetch_llm_tokens_total",
+    "미리 가져오기의 LLM 토큰 사용량",
+    ["kind"],
+)
+
+# 클라이언트 연결 끊김 또는 마감 시각 초과로 취소된 요청 (reason: disconnect/deadline)
+REQUESTS_CANCELLED = Counter(
+    "pubmed_requests_cancelled_total",
+    "취소된 요청 수",
+    ["reason"],
+)
+
+# LLM 엔드포인트 종류별 입장 제어 상태 (class: chat/query/summary/classify)
+ADMISSION_IN_FLIGHT = Gauge(
+    "pubmed_admission_in_flight",
+    "실행 중인 LLM 작업 수",
+    ["class"],
+    multiprocess_mode="livesum",
+)
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "pubmed_admission_queue_depth",
+    "실행을 기다리는 LLM 작업 수",
+    ["class"],
+    multiprocess_mode="livesum",
+)
+
+ADMISSION_WAIT_SECONDS = Histogram(
+    "pubmed_admission_wait_seconds",
+    "LLM 작업이 실행되기까지 기다린 시간",
+    ["class"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# 대기열이 가득 차 503으로 거절한 요청 수
+ADMISSION_REJECTED = Counter(
+    "pubmed_admission_rejected_total",
+    "대기열이 가득 차 거절된 LLM 작업 수",
+    ["class"],
+)
+
+# 부하가 높아 생략한 부가 기능 (feature: ir_detection)
+LOAD_SHED = Counter(
+    "pubmed_load_shed_total",
+    "부하가 높아 생략한 부가 기능 실행 수",
+    ["feature"],
+)
+
+# 헤지 요청 결과 (outcome: primary_won/hedge_won/failed/skipped_budget)
+# 헤지 승률은 hedge_won / (primary_won + hedge_won)
+UPSTREAM_HEDGES = Counter(
+    "pubmed_upstream_hedges_total",
+    "지연된 업스트림 GET에 보낸 헤지 요청 수",
+    ["upstream", "outcome"],
+)
+
+# 요청 크기(ID 수) 구간별 최근 응답 시간 p95와 그로부터 정한 타임아웃 (워커가 여럿이면 가장 큰 값)
+UPSTREAM_LATENCY_P95_SECONDS = Gauge(
+    "pubmed_upstream_latency_p95_seconds",
+    "최근 업스트림 응답 시간 p95",
+    ["upstream", "size"],
+    multiprocess_mode="livemax",
+)
+
+UPSTREAM_ADAPTIVE_TIMEOUT_SECONDS = Gauge(
+    "pubmed_upstream_adaptive_timeout_seconds",
+    "관측 지연으로 정한 업스트림 타임아웃",
+    ["upstream", "size"],
+    multiprocess_mode="livemax",
+)
+
+# 현재 실행 흐름의 호출 목적 (interactive: 사용자 요청, prefetch: 미리 가져오기)
+upstream_purpose: ContextVar[str] = ContextVar("upstream_purpose", default="interactive")
+
+
+@contextmanager
+def track_upstream(upstream: str, span_name: str | None = None):
+    """외부 API 호출 시간을 측정합니다. 예외 발생 시 outcome=error, 요청 취소 시 outcome=cancelled로 기록합니다.
+
+    요청 추적 중이면 같은 구간을 스팬(기본 이름: upstream)으로도 남깁니다.
+    """
+
+    if upstream_purpose.get() == "prefetch":
+        PREFETCH_UPSTREAM_REQUESTS.labels(upstream=upstream).inc()
+
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        with span(span_name or upstream):
+            yield
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        UPSTREAM_REQUEST_SECONDS.labels(upstream=upstream, outcome=outcome).observe(
+            time.perf_counter() - start
+        )
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """캐시 적중/실패를 기록합니다."""
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_shared_cache(cache: str, hit: bool) -> None:
+    """공유 캐시 적중/실패를 기록합니다."""
+    SHARED_CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_llm_usage(operation: str, usage) -> None:
+    """Groq 응답의 usage 정보로 토큰 사용량을 기록합니다."""
+
+    if usage is None:
+        return
+
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    LLM_TOKENS.labels(operation=operation, kind="prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(operation=operation, kind="completion").inc(completion_tokens)
+    if upstream_purpose.get() == "prefetch":
+        PREFETCH_LLM_TOKENS.labels(kind="prompt").inc(prompt_tokens)
+        PREFETCH_LLM_TOKENS.labels(kind="completion").inc(completion_tokens)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Prometheus 텍스트 포맷으로 메트릭을 반환합니다.
+
+    여러 워커 모드(PROMETHEUS_MULTIPROC_DIR 설정)에서는 모든 워커의 메트릭 파일을 합쳐 내보내므로
+    어느 워커가 /metrics 요청을 받아도 같은 값이 나옵니다.
+    """
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import CollectorRegistry, multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """종료하는 워커의 live 게이지 파일을 정리합니다 (여러 워커 모드에서만 동작)."""
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,128 @@
+import asyncio
+import contextvars
+from typing import Optional
+from app.config import SEARCH_CACHE_TTL
+from app.services.cache import TTLCache
+from app.services.pubmed import search_pubmed, fetch_paper_details
+from app.services.icite import fetch_citation_counts
+from app.services.ai_summary import detect_ir_related_papers
+from app.services.ratelimit import RateBudgetExhausted
+from app.services.metrics import PREFETCH_TASKS, PREFETCH_LOOKUPS, ERRORS, upstream_purpose
+
+# 검색 조건 키 구성 순서 (page 포함)
+_KEY_FIELDS = ("query", "author", "start_date", "end_date", "sort_by", "page_size", "page")
+
+
+def _key(criteria: dict) -> tuple:
+    return tuple(criteria.get(name) for name in _KEY_FIELDS)
+
+
+async def _warm_page(criteria: dict) -> None:
+    """검색 페이지 하나에 필요한 PMID, 논문 정보, 피인용 수, IR 판정을 캐시에 채웁니다."""
+
+    _, pmids = await search_pubmed(**criteria)
+    papers = await fetch_paper_details(pmids) if pmids else []
+    if papers:
+        await asyncio.gather(
+            fetch_citation_counts([p.pmid for p in papers]),
+            detect_ir_related_papers(papers),
+        )
+
+
+class Prefetcher:
+    """사용자가 본 검색 페이지의 다음 페이지를 백그라운드에서 미리 가져옵니다.
+
+    클라이언트(client_id)마다 하나의 작업만 유지하며, 같은 클라이언트가 다른 검색이나 페이지를
+    요청하면 진행 중인 작업을 취소합니다. 미리 가져오기의 업스트림 호출은 레이트 리밋에서
+    사용자 요청 몫을 남겨둔 여유 토큰으로만 나가고, 여유가 없으면 그 자리에서 중단됩니다.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, tuple[tuple, asyncio.Task]] = {}
+        # 미리 가져오기를 마친 페이지 (적중률 측정용, 검색 캐시와 같은 수명)
+        self._warmed = TTLCache("prefetched_pages", maxsize=5000, ttl=SEARCH_CACHE_TTL)
+
+    async def before_search(self, client_id: str, criteria: dict) -> None:
+        """사용자의 페이지 요청을 처리하기 전에 호출합니다.
+
+        같은 페이지를 미리 가져오는 중이면 끝날 때까지 기다려 결과를 재사용하고,
+        다른 검색이나 페이지를 미리 가져오는 중이면 취소합니다.
+        """
+
+        key = _key(criteria)
+        entry = self._tasks.get(client_id)
+        if entry is not None:
+            task_key, task = entry
+            if task_key == key:
+                try:
+                    await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    # 미리 가져오기가 시작 전에 취소된 경우는 그냥 직접 조회 (사용자 요청 자체의 취소만 전파)
+                    if not task.cancelled():
+                        raise
+            else:
+                task.cancel()
+
+        if criteria["page"] > 1:
+            PREFETCH_LOOKUPS.labels(result="hit" if key in self._warmed else "miss").inc()
+
+    def schedule(self, client_id: str, criteria: dict) -> None:
+        """criteria 페이지를 미리 가져오는 작업을 시작합니다."""
+
+        key = _key(criteria)
+        if key in self._warmed:
+            return
+
+        entry = self._tasks.get(client_id)
+        if entry is not None:
+            if entry[0] == key:
+                return
+            entry[1].cancel()
+
+        # 요청의 추적 컨텍스트를 물려받지 않도록 빈 컨텍스트에서 실행
+        task = asyncio.create_task(self._run(key, criteria), context=contextvars.Context())
+        self._tasks[client_id] = (key, task)
+        task.add_done_callback(lambda t: self._forget(client_id, t))
+
+    def _forget(self, client_id: str, task: asyncio.Task) -> None:
+        entry = self._tasks.get(client_id)
+        if entry is not None and entry[1] is task:
+            del self._tasks[client_id]
+
+    async def _run(self, key: tuple, criteria: dict) -> None:
+        upstream_purpose.set("prefetch")
+        try:
+            await _warm_page(criteria)
+        except asyncio.CancelledError:
+            PREFETCH_TASKS.labels(outcome="cancelled").inc()
+            return
+        except RateBudgetExhausted:
+            PREFETCH_TASKS.labels(outcome="budget").inc()
+            return
+        except Exception as e:
+            PREFETCH_TASKS.labels(outcome="error").inc()
+            ERRORS.labels(component="prefetch").inc()
+            print(f"미리 가져오기 오류: {e}")
+            return
+
+        self._warmed.set(key, True)
+        PREFETCH_TASKS.labels(outcome="completed").inc()
+
+    async def stop(self) -> None:
+        tasks = [task for _, task in self._tasks.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+prefetcher = Prefetcher()
+
+
+def next_page_criteria(criteria: dict, total: int) -> Optional[dict]:
+    """다음 페이지 검색 조건을 반환합니다. 마지막 페이지이거나 esearch 조회 한도를 넘으면 None입니다."""
+
+    start = criteria["page"] * criteria["page_size"]
+    if start >= total or start + criteria["page_size"] > 10000:
+        return None
+    return {**criteria, "page": criteria["page"] + 1}
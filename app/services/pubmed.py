@@ -1,8 +1,36 @@
-import httpx
+import asyncio
+import copy
+import time
 import xml.etree.ElementTree as ET
-from typing import Optional
-from app.config import PUBMED_ESEARCH_URL, PUBMED_EFETCH_URL, NCBI_API_KEY
-from app.models.schemas import Paper
+from typing import AsyncIterator, Optional
+from app.config import (
+    PUBMED_ESEARCH_URL,
+    PUBMED_EFETCH_URL,
+    NCBI_API_KEY,
+    PARSE_CHUNK_SIZE,
+    EFETCH_CHUNK_SIZE,
+    EFETCH_CONCURRENCY,
+    SEARCH_CACHE_TTL,
+    PAPER_CACHE_TTL,
+    PAPER_CACHE_SIZE,
+)
+from app.models.record import PaperRecord, MeshHeading
+from app.services.metrics import XML_PARSE_SECONDS, PAPERS_PARSED, ERRORS
+from app.services.timing import span
+from app.services.executor import run_cpu, is_parallel
+from app.services.cache import get_cache
+from app.services.store import get_paper_store
+from app.services.ratelimit import ncbi_limiter
+from app.services.upstream import hedged_get, upstream_request
+from app.services.similarity import index_in_background
+
+# 이보다 많은 PMID는 efetch를 POST로 요청. 검색 페이지(최대 100편) 같은 작은 요청만 GET(헤징 대상)으로 보내고
+# 대량 조회의 꽉 찬 청크(EFETCH_CHUNK_SIZE편)는 URL 길이 제한이 없는 POST로 보냄
+EFETCH_GET_MAX_IDS = EFETCH_CHUNK_SIZE // 2
+
+# 검색 결과(PMID 목록)와 파싱된 논문 캐시
+search_cache = get_cache("esearch", maxsize=2000, ttl=SEARCH_CACHE_TTL)
+paper_cache = get_cache("papers", maxsize=PAPER_CACHE_SIZE, ttl=PAPER_CACHE_TTL)
 
 
 async def search_pubmed(
@@ -13,8 +41,16 @@ async def search_pubmed(
     page: int = 1,
     page_size: int = 20,
     sort_by: str = "relevance",
+    mindate: Optional[str] = None,
+    maxdate: Optional[str] = None,
+    datetype: str = "edat",
+    use_cache: bool = True,
 ) -> tuple[int, list[str]]:
-    """PubMed에서 논문을 검색하고 PMID 목록을 반환합니다."""
+    """PubMed에서 논문을 검색하고 PMID 목록을 반환합니다.
+
+    mindate/maxdate(YYYY/MM/DD)를 주면 datetype 기준(기본 edat: PubMed 등록일)으로 기간을 제한합니다.
+    use_cache=False이면 캐시된 결과를 쓰지 않고 항상 새로 조회합니다 (결과는 캐시에 저장).
+    """
 
     # 검색 쿼리 구성
     search_term = query
@@ -44,26 +80,111 @@ async def search_pubmed(
         "sort": pubmed_sort,
     }
 
+    # E-utilities는 mindate와 maxdate를 함께 요구함
+    if mindate or maxdate:
+        params["datetype"] = datetype
+        params["mindate"] = mindate or "1800/01/01"
+        params["maxdate"] = maxdate or "3000/12/31"
+
+    cache_key = tuple(sorted(params.items()))
+    cached = (await search_cache.get_many([cache_key])).get(cache_key) if use_cache else None
+    if cached is not None:
+        total, pmids = cached
+        return total, list(pmids)
+
     if NCBI_API_KEY:
         params["api_key"] = NCBI_API_KEY
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(PUBMED_ESEARCH_URL, params=params, timeout=30.0)
-        response.raise_for_status()
-        data = response.json()
+    await ncbi_limiter.acquire()
+    response = await hedged_get(
+        "esearch", PUBMED_ESEARCH_URL, 30.0, limiter=ncbi_limiter, size=page_size, params=params
+    )
+    data = response.json()
 
     result = data.get("esearchresult", {})
     total = int(result.get("count", 0))
     pmids = result.get("idlist", [])
 
+    await search_cache.set_many({cache_key: (total, tuple(pmids))})
+
     return total, pmids
 
 
-async def fetch_paper_details(pmids: list[str]) -> list[Paper]:
+async def fetch_paper_details(pmids: list[str]) -> list[PaperRecord]:
     """PMID 목록으로 논문 상세 정보를 가져옵니다."""
 
+    papers = []
+    async for chunk in iter_paper_details(pmids):
+        papers.extend(chunk)
+    return papers
+
+
+async def iter_paper_details(
+    pmids: list[str],
+    chunk_size: int = EFETCH_CHUNK_SIZE,
+) -> AsyncIterator[list[PaperRecord]]:
+    """PMID 목록의 논문 정보를 요청 순서대로 나누어 내보냅니다.
+
+    캐시와 로컬 저장소에 없는 PMID만 chunk_size개씩 나누어 efetch하며, 청크 요청은
+    NCBI 요청 한도 안에서 동시에 진행됩니다. 앞쪽 청크가 끝나는 대로 해당 구간의 논문을 내보내므로
+    수천 편을 가져올 때도 전송과 파싱, 호출 측 처리가 겹쳐서 진행됩니다.
+    """
+
     if not pmids:
-        return []
+        return
+
+    # 캐시(공유 저장소 포함)는 요청마다 한 번에 조회
+    found = await paper_cache.get_many(list(dict.fromkeys(pmids)))
+
+    # 로컬 저장소에 수집된 논문은 E-utilities를 거치지 않음
+    missing = list(dict.fromkeys(pmid for pmid in pmids if pmid not in found))
+    store = get_paper_store()
+    if missing and store is not None:
+        with span("store"):
+            stored = await asyncio.to_thread(store.get_many, missing)
+            await paper_cache.set_many({paper.pmid: paper for paper in stored.values()})
+            found.update((paper.pmid, paper) for paper in stored.values())
+        missing = [pmid for pmid in missing if pmid not in found]
+
+    first_index = {}
+    for index, pmid in enumerate(pmids):
+        first_index.setdefault(pmid, index)
+
+    chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+    semaphore = asyncio.Semaphore(EFETCH_CONCURRENCY)
+
+    async def fetch_chunk(chunk: list[str]) -> list[PaperRecord]:
+        async with semaphore:
+            return await _efetch(chunk)
+
+    tasks = [asyncio.create_task(fetch_chunk(chunk)) for chunk in chunks]
+    try:
+        position = 0
+        for k, task in enumerate(tasks):
+            for paper in await task:
+                found[paper.pmid] = paper
+
+            # 다음 청크의 첫 PMID 앞까지는 모두 준비됨
+            boundary = first_index[chunks[k + 1][0]] if k + 1 < len(chunks) else len(pmids)
+            # 호출 측에서 피인용 수 등을 채우므로 캐시 객체 대신 복사본을 반환
+            ready = [copy.copy(found[pmid]) for pmid in pmids[position:boundary] if pmid in found]
+            position = boundary
+            if ready:
+                yield ready
+
+        if position < len(pmids):
+            ready = [copy.copy(found[pmid]) for pmid in pmids[position:] if pmid in found]
+            if ready:
+                yield ready
+    finally:
+        # 호출 측이 중간에 그만두거나 오류가 나면 남은 요청 취소
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _efetch(pmids: list[str]) -> list[PaperRecord]:
+    """efetch 한 번으로 논문 정보를 가져와 파싱하고 캐시에 저장합니다."""
 
     params = {
         "db": "pubmed",
@@ -74,107 +195,194 @@ async def fetch_paper_details(pmids: list[str]) -> list[Paper]:
     if NCBI_API_KEY:
         params["api_key"] = NCBI_API_KEY
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(PUBMED_EFETCH_URL, params=params, timeout=30.0)
-        response.raise_for_status()
-        xml_data = response.text
+    await ncbi_limiter.acquire()
+    if len(pmids) > EFETCH_GET_MAX_IDS:
+        # ID가 많으면 URL 길이 제한을 피하도록 POST 사용 (NCBI 권장, 헤징하지 않음)
+        response = await upstream_request("efetch", "POST", PUBMED_EFETCH_URL, 60.0, size=len(pmids), data=params)
+    else:
+        response = await hedged_get(
+            "efetch", PUBMED_EFETCH_URL, 30.0, limiter=ncbi_limiter, size=len(pmids), params=params
+        )
+    xml_data = response.text
+
+    papers = await parse_pubmed_xml_async(xml_data)
+    await paper_cache.set_many({paper.pmid: paper for paper in papers})
+    index_in_background(papers)
+    return papers
+
+
+async def parse_pubmed_xml_async(xml_data: str) -> list[PaperRecord]:
+    """이벤트 루프를 막지 않도록 executor에서 XML을 파싱합니다.
 
-    return parse_pubmed_xml(xml_data)
+    큰 응답은 논문 단위 청크로 나누어 병렬로 파싱하며, 결과 순서는 원본과 같습니다.
+    """
 
+    start = time.perf_counter()
 
-def parse_pubmed_xml(xml_data: str) -> list[Paper]:
-    """PubMed XML 응답을 파싱하여 Paper 객체 목록을 반환합니다."""
+    with span("parse"):
+        chunks = split_pubmed_xml(xml_data, PARSE_CHUNK_SIZE) if is_parallel() else [xml_data]
+        if len(chunks) == 1:
+            papers = await run_cpu(parse_pubmed_xml, chunks[0])
+        else:
+            results = await asyncio.gather(*(run_cpu(parse_pubmed_xml, chunk) for chunk in chunks))
+            papers = [paper for result in results for paper in result]
+
+    XML_PARSE_SECONDS.observe(time.perf_counter() - start)
+    PAPERS_PARSED.inc(len(papers))
+
+    return papers
+
+
+def split_pubmed_xml(xml_data: str, chunk_size: int) -> list[str]:
+    """efetch XML을 chunk_size개 논문씩 담은 독립된 XML 문서들로 나눕니다.
+
+    문자열 검색만 하므로 전체 파싱보다 훨씬 가볍습니다.
+    """
+
+    open_tag, close_tag = "<PubmedArticle>", "</PubmedArticle>"
+    articles = []
+    pos = 0
+    while True:
+        begin = xml_data.find(open_tag, pos)
+        if begin == -1:
+            break
+        end = xml_data.find(close_tag, begin)
+        if end == -1:
+            break
+        end += len(close_tag)
+        articles.append(xml_data[begin:end])
+        pos = end
+
+    if len(articles) <= chunk_size:
+        return [xml_data]
+
+    return [
+        "<PubmedArticleSet>" + "".join(articles[i:i + chunk_size]) + "</PubmedArticleSet>"
+        for i in range(0, len(articles), chunk_size)
+    ]
+
+
+def parse_pubmed_xml(xml_data: str) -> list[PaperRecord]:
+    """PubMed XML 응답을 파싱하여 PaperRecord 목록을 반환합니다."""
 
     papers = []
     root = ET.fromstring(xml_data)
 
     for article in root.findall(".//PubmedArticle"):
         try:
-            # PMID
-            pmid_elem = article.find(".//PMID")
-            pmid = pmid_elem.text if pmid_elem is not None else ""
-
-            # 제목
-            title_elem = article.find(".//ArticleTitle")
-            title = title_elem.text if title_elem is not None and title_elem.text else ""
-
-            # 저자 목록
-            authors = []
-            for author in article.findall(".//Author"):
-                lastname = author.find("LastName")
-                forename = author.find("ForeName")
-                if lastname is not None and lastname.text:
-                    name = lastname.text
-                    if forename is not None and forename.text:
-                        name += f" {forename.text}"
-                    authors.append(name)
-
-            # 초록
-            abstract_parts = []
-            for abstract_text in article.findall(".//AbstractText"):
-                if abstract_text.text:
-                    label = abstract_text.get("Label", "")
-                    if label:
-                        abstract_parts.append(f"{label}: {abstract_text.text}")
-                    else:
-                        abstract_parts.append(abstract_text.text)
-            abstract = " ".join(abstract_parts)
-
-            # 출판일
-            pub_date = ""
-            pub_date_elem = article.find(".//PubDate")
-            if pub_date_elem is not None:
-                year = pub_date_elem.find("Year")
-                month = pub_date_elem.find("Month")
-                day = pub_date_elem.find("Day")
-
-                if year is not None and year.text:
-                    pub_date = year.text
-                    if month is not None and month.text:
-                        pub_date += f"-{month.text}"
-                        if day is not None and day.text:
-                            pub_date += f"-{day.text}"
-
-            # 저널명
-            journal_elem = article.find(".//Journal/Title")
-            journal = journal_elem.text if journal_elem is not None and journal_elem.text else ""
-
-            # 키워드
-            keywords = []
-            for keyword in article.findall(".//Keyword"):
-                if keyword.text:
-                    keywords.append(keyword.text)
-
-            # MeSH 용어도 키워드에 추가
-            for mesh in article.findall(".//MeshHeading/DescriptorName"):
-                if mesh.text:
-                    keywords.append(mesh.text)
-
-            # PMC ID 추출 (무료 전문 PDF 제공 여부)
-            pmc_id = None
-            for article_id in article.findall(".//ArticleId"):
-                if article_id.get("IdType") == "pmc":
-                    pmc_id = article_id.text
-                    break
-
-            papers.append(Paper(
-                pmid=pmid,
-                title=title,
-                authors=authors,
-                abstract=abstract,
-                pub_date=pub_date,
-                journal=journal,
-                keywords=keywords,
-                pmc_id=pmc_id,
-            ))
+            papers.append(parse_article(article))
         except Exception as e:
+            ERRORS.labels(component="parse_pubmed_xml").inc()
             print(f"Error parsing article: {e}")
             continue
 
     return papers
 
 
-async def get_paper_by_pmid(pmid: str) -> Optional[Paper]:
+def parse_article(article: ET.Element) -> PaperRecord:
+    """<PubmedArticle> 요소 하나를 PaperRecord로 변환합니다.
+
+    efetch 응답과 연간 baseline/update 파일 스트리밍 파싱이 같은 필드 규칙을 쓰도록 공유합니다.
+    """
+
+    # PMID
+    pmid_elem = article.find(".//PMID")
+    pmid = pmid_elem.text if pmid_elem is not None else ""
+
+    # 제목
+    title_elem = article.find(".//ArticleTitle")
+    title = title_elem.text if title_elem is not None and title_elem.text else ""
+
+    # 저자 목록
+    authors = []
+    for author in article.findall(".//Author"):
+        lastname = author.find("LastName")
+        forename = author.find("ForeName")
+        if lastname is not None and lastname.text:
+            name = lastname.text
+            if forename is not None and forename.text:
+                name += f" {forename.text}"
+            authors.append(name)
+
+    # 초록 (구조화 초록의 섹션 위치는 (이름, 시작, 끝) 오프셋으로 함께 보관)
+    abstract_parts = []
+    abstract_sections = []
+    offset = 0
+    for abstract_text in article.findall(".//AbstractText"):
+        if abstract_text.text:
+            label = abstract_text.get("Label", "")
+            if label:
+                part = f"{label}: {abstract_text.text}"
+                start = offset + len(label) + 2
+            else:
+                part = abstract_text.text
+                start = offset
+            abstract_parts.append(part)
+            abstract_sections.append((label, start, offset + len(part)))
+            offset += len(part) + 1
+    abstract = " ".join(abstract_parts)
+
+    # 출판일
+    pub_date = ""
+    pub_date_elem = article.find(".//PubDate")
+    if pub_date_elem is not None:
+        year = pub_date_elem.find("Year")
+        month = pub_date_elem.find("Month")
+        day = pub_date_elem.find("Day")
+
+        if year is not None and year.text:
+            pub_date = year.text
+            if month is not None and month.text:
+                pub_date += f"-{month.text}"
+                if day is not None and day.text:
+                    pub_date += f"-{day.text}"
+
+    # 저널명
+    journal_elem = article.find(".//Journal/Title")
+    journal = journal_elem.text if journal_elem is not None and journal_elem.text else ""
+
+    # 저자 키워드
+    keywords = []
+    for keyword in article.findall(".//Keyword"):
+        if keyword.text:
+            keywords.append(keyword.text)
+
+    # MeSH 주제어 (디스크립터 UI와 한정어는 별도 필드로 보관)
+    mesh = []
+    for heading in article.findall(".//MeshHeading"):
+        descriptor = heading.find("DescriptorName")
+        if descriptor is None or not descriptor.text:
+            continue
+        qualifiers = [q for q in heading.findall("QualifierName") if q.text]
+        mesh.append(MeshHeading(
+            ui=descriptor.get("UI", ""),
+            name=descriptor.text,
+            qualifiers=tuple(q.text for q in qualifiers),
+            major=descriptor.get("MajorTopicYN") == "Y" or any(q.get("MajorTopicYN") == "Y" for q in qualifiers),
+        ))
+
+    # PMC ID 추출 (무료 전문 PDF 제공 여부)
+    pmc_id = None
+    for article_id in article.findall(".//ArticleId"):
+        if article_id.get("IdType") == "pmc":
+            pmc_id = article_id.text
+            break
+
+    return PaperRecord(
+        pmid=pmid,
+        title=title,
+        authors=tuple(authors),
+        abstract=abstract,
+        abstract_sections=tuple(abstract_sections),
+        pub_date=pub_date,
+        journal=journal,
+        keywords=tuple(keywords),
+        mesh=tuple(mesh),
+        pmc_id=pmc_id,
+    )
+
+
+async def get_paper_by_pmid(pmid: str) -> Optional[PaperRecord]:
     """단일 논문의 상세 정보를 가져옵니다."""
     papers = await fetch_paper_details([pmid])
     return papers[0] if papers else None
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from app.config import WEB_CONCURRENCY, NCBI_RATE_LIMIT, GROQ_RATE_LIMIT, GROQ_RATE_BURST, PREFETCH_RESERVE_TOKENS
+from app.services.metrics import RATE_LIMIT_WAIT_SECONDS, RATE_LIMIT_REJECTED, ERRORS, upstream_purpose
+from app.services.shared import SharedBackend, get_shared_backend
+
+
+class RateBudgetExhausted(Exception):
+    """백그라운드 호출에 쓸 여유 토큰이 없는 경우"""
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷 (최대 capacity개)
+
+    사용자 요청은 토큰이 생길 때까지 기다리고, 미리 가져오기 같은 백그라운드 호출은
+    reserve개를 남겨둘 수 있을 때만 토큰을 가져가며 그렇지 않으면 바로 포기합니다.
+
+    backend가 있으면 버킷 상태를 공유 저장소에 두어 모든 워커 프로세스가 하나의 한도를 나눠 씁니다.
+    공유 저장소 호출은 스레드에서 실행하며, 접근할 수 없거나 SHARED_STATE_TIMEOUT 안에 잠금을 얻지 못하면
+    프로세스 안 버킷으로 계속 동작합니다. 이때 워커마다 한도 전체를 쓰지 않도록 rate와 capacity를
+    WEB_CONCURRENCY로 나눈 몫만 사용하고, 시작 토큰은 마지막으로 본 공유 버킷 값입니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        capacity: float | None = None,
+        reserve: float = 0.0,
+        backend: SharedBackend | None = None,
+    ):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.reserve = reserve
+        self.backend = backend
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, share: int = 1) -> None:
+        now = time.monotonic()
+        capacity = max(self.capacity / share, 1.0)
+        self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate / share)
+        self._updated = now
+
+    def _take_local(self, reserve: float, share: int = 1) -> bool:
+        self._refill(share)
+        if self._tokens - 1 >= reserve:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def try_acquire(self, reserve: float = 0.0) -> bool:
+        if self.backend is None:
+            return self._take_local(reserve)
+
+        try:
+            ok, tokens = await asyncio.to_thread(
+                self.backend.take_token, self.name, self.rate, self.capacity, reserve
+            )
+        except Exception as e:
+            ERRORS.labels(component="shared_ratelimit").inc()
+            print(f"공유 레이트 리밋 오류 ({self.name}): {e}")
+            return self._take_local(reserve, share=max(WEB_CONCURRENCY, 1))
+
+        # 공유 버킷 상태를 그대로 따라가 두어야 장애 시 프로세스 안 버킷이 가득 찬 상태로 시작하지 않음
+        self._tokens = tokens
+        self._updated = time.monotonic()
+        return ok
+
+    async def acquire(self) -> None:
+        if upstream_purpose.get() != "interactive":
+            if not await self.try_acquire(self.reserve):
+                RATE_LIMIT_REJECTED.labels(limiter=self.name).inc()
+                raise RateBudgetExhausted(f"{self.name} 호출 예산 부족")
+            return
+
+        start = time.perf_counter()
+        while not await self.try_acquire():
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+        RATE_LIMIT_WAIT_SECONDS.labels(limiter=self.name).observe(time.perf_counter() - start)
+
+
+# NCBI E-utilities (esearch, efetch) 공용 한도
+ncbi_limiter = TokenBucket("ncbi", NCBI_RATE_LIMIT, reserve=PREFETCH_RESERVE_TOKENS, backend=get_shared_backend())
+
+# Groq 채팅 완성 API 한도
+groq_limiter = TokenBucket(
+    "groq", GROQ_RATE_LIMIT, capacity=GROQ_RATE_BURST, reserve=PREFETCH_RESERVE_TOKENS, backend=get_shared_backend()
+)
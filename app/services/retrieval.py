@@ -0,0 +1,180 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from app.config import CHAT_CONTEXT_TOKENS
+from app.models.record import PaperRecord
+
+# BM25 매개변수
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 구절 하나에 담을 최대 문장 수 (섹션이 길면 이 단위로 나눔)
+SENTENCES_PER_PASSAGE = 3
+
+# 한 논문에서 가져올 최대 구절 수 (소수 논문이 예산을 독차지하지 않도록)
+MAX_PASSAGES_PER_PAPER = 3
+
+# 질문과 겹치는 단어가 없을 때 우선 사용할 섹션 (앞쪽일수록 우선)
+FALLBACK_SECTIONS = ("CONCLUSION", "CONCLUSIONS", "RESULTS", "FINDINGS", "")
+
+_TOKEN_RE = re.compile(r"\w+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\[])")
+# 섹션 위치 정보 없이 저장된 초록(로컬 저장소 등)의 "BACKGROUND: ..." 형태 섹션 구분
+_INLINE_LABEL_RE = re.compile(r"(?:^|(?<=\s))([A-Z][A-Z /&,-]{2,40}):\s")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was were with "
+    "we our these those which who what how than then there their its into between after before "
+    "during not no can may also been all more most other such".split()
+)
+
+
+@dataclass(slots=True)
+class Passage:
+    pmid: str
+    paper_index: int
+    position: int
+    label: str
+    text: str
+
+
+def _tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _split_inline_sections(abstract: str) -> list[tuple[str, str]]:
+    """섹션 오프셋이 없는 초록을 본문 안의 대문자 섹션 이름으로 나눕니다."""
+
+    matches = list(_INLINE_LABEL_RE.finditer(abstract))
+    if not matches or matches[0].start() != 0:
+        return [("", abstract)] if abstract else []
+
+    sections = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(abstract)
+        text = abstract[match.end():end].strip()
+        if text:
+            sections.append((match.group(1), text))
+    return sections
+
+
+def _passages(paper: PaperRecord, paper_index: int) -> list[Passage]:
+    """논문 초록을 섹션 단위로, 긴 섹션은 문장 묶음 단위로 나눕니다."""
+
+    sections = paper.sections() if paper.abstract_sections else _split_inline_sections(paper.abstract)
+    passages = []
+    for label, text in sections:
+        sentences = _SENTENCE_RE.split(text)
+        for i in range(0, len(sentences), SENTENCES_PER_PASSAGE):
+            chunk = " ".join(sentences[i:i + SENTENCES_PER_PASSAGE]).strip()
+            if chunk:
+                passages.append(Passage(paper.pmid, paper_index, len(passages), label, chunk))
+    return passages
+
+
+def _bm25_scores(passages: list[Passage], titles: list[list[str]], query: list[str]) -> list[float]:
+    """구절별 BM25 점수를 계산합니다. 구절에는 소속 논문의 제목 단어도 함께 색인합니다."""
+
+    docs = [Counter(titles[p.paper_index] + _tokenize(p.text)) for p in passages]
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = sum(lengths) / len(docs) if docs else 0.0
+
+    terms = set(query)
+    df = Counter(term for doc in docs for term in terms if term in doc)
+    idf = {
+        term: math.log(1 + (len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+        for term in terms if df[term]
+    }
+
+    scores = []
+    for doc, length in zip(docs, lengths):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) if avg_length else BM25_K1
+        score = 0.0
+        for term, weight in idf.items():
+            tf = doc.get(term, 0)
+            if tf:
+                score += weight * tf * (BM25_K1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def _fallback_order(passages: list[Passage], paper_count: int) -> list[Passage]:
+    """질문과 겹치는 단어가 없을 때: 논문마다 결론/결과 구절을 우선하여 돌아가며 고릅니다."""
+
+    def rank(p: Passage) -> int:
+        label = p.label.upper()
+        return FALLBACK_SECTIONS.index(label) if label in FALLBACK_SECTIONS else len(FALLBACK_SECTIONS)
+
+    by_paper: list[list[Passage]] = [[] for _ in range(paper_count)]
+    for p in passages:
+        by_paper[p.paper_index].append(p)
+    for items in by_paper:
+        items.sort(key=rank)
+
+    ordered = []
+    for depth in range(MAX_PASSAGES_PER_PAPER):
+        ordered.extend(items[depth] for items in by_paper if depth < len(items))
+    return ordered
+
+
+def build_chat_context(
+    papers: list[PaperRecord],
+    query: str,
+    token_budget: int = CHAT_CONTEXT_TOKENS,
+) -> tuple[str, list[str]]:
+    """질문과 관련된 초록 구절만 골라 채팅 프롬프트용 컨텍스트를 만듭니다.
+
+    선택한 논문들의 초록을 구절로 나누어 BM25로 순위를 매긴 뒤, 토큰 예산 안에서 높은 점수의
+    구절부터 담습니다. 반환값은 (논문별로 묶은 컨텍스트 문자열, 인용된 PMID 목록)입니다.
+    """
+
+    passages = [p for i, paper in enumerate(papers) for p in _passages(paper, i)]
+    if not passages:
+        return "", []
+
+    query_terms = _tokenize(query)
+    titles = [_tokenize(paper.title) for paper in papers]
+    scores = _bm25_scores(passages, titles, query_terms) if query_terms else [0.0] * len(passages)
+
+    ranked = sorted(
+        (i for i, score in enumerate(scores) if score > 0),
+        key=lambda i: (-scores[i], i),
+    )
+    candidates = [passages[i] for i in ranked] or _fallback_order(passages, len(papers))
+
+    # 논문 머리말(PMID, 제목)도 예산에 포함
+    headers = {
+        i: f"[PMID {paper.pmid}] {paper.title} ({paper.journal}, {paper.pub_date})"
+        for i, paper in enumerate(papers)
+    }
+    selected: dict[int, list[Passage]] = {}
+    used = 0
+    for passage in candidates:
+        chosen = selected.get(passage.paper_index)
+        if chosen is not None and len(chosen) >= MAX_PASSAGES_PER_PAPER:
+            continue
+        cost = _estimate_tokens(passage.text)
+        if chosen is None:
+            cost += _estimate_tokens(headers[passage.paper_index])
+        if used + cost > token_budget:
+            continue
+        selected.setdefault(passage.paper_index, []).append(passage)
+        used += cost
+
+    # 가장 관련 높은 구절을 가진 논문부터, 논문 안에서는 초록 순서대로 배치
+    blocks = []
+    sources = []
+    for index, chosen in selected.items():
+        chosen.sort(key=lambda p: p.position)
+        lines = [headers[index]]
+        for p in chosen:
+            lines.append(f"- ({p.label}) {p.text}" if p.label else f"- {p.text}")
+        blocks.append("\n".join(lines))
+        sources.append(papers[index].pmid)
+
+    return "\n\n".join(blocks), sources
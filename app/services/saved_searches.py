@@ -0,0 +1,189 @@
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from app.config import SAVED_SEARCHES_DIR, GROQ_API_KEY
+from app.models.schemas import SavedSearchCreate
+from app.services.pubmed import search_pubmed, iter_paper_details
+from app.services.ai_summary import detect_ir_related_papers
+from app.services.timing import span
+
+# 증분 검색은 결과를 빠짐없이 가져와야 하므로 이 단위로 페이지를 넘기며 조회
+DELTA_PAGE_SIZE = 500
+# esearch는 retstart가 이 값을 넘는 요청을 거부함
+ESEARCH_MAX_RETSTART = 9999
+# detect_ir_related_papers가 한 번에 판단하는 논문 수와 동시 호출 수
+IR_BATCH_SIZE = 20
+IR_CONCURRENCY = 4
+
+
+@dataclass
+class SavedSearch:
+    id: str
+    name: str
+    query: str
+    author: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    max_results: int = 500
+    pmids: list[str] = field(default_factory=list)  # 최근 추가된 순
+    ir_pmids: list[str] = field(default_factory=list)
+    unclassified: list[str] = field(default_factory=list)  # IR 판정을 받지 못해 다음 갱신 때 다시 판정할 PMID
+    watermark: Optional[str] = None  # 마지막 갱신일 (YYYY/MM/DD, EDAT 기준)
+    created_at: float = field(default_factory=time.time)
+    refreshed_at: Optional[float] = None
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y/%m/%d")
+
+
+async def _classify(papers: list) -> dict[str, bool]:
+    """PMID별 IR 관련 여부를 반환합니다 (배치 단위로 동시 판단, 판정하지 못한 논문은 빠짐)."""
+
+    semaphore = asyncio.Semaphore(IR_CONCURRENCY)
+
+    async def classify_batch(batch):
+        async with semaphore:
+            return await detect_ir_related_papers(batch, degrade=False)
+
+    batches = [papers[i:i + IR_BATCH_SIZE] for i in range(0, len(papers), IR_BATCH_SIZE)]
+    results = await asyncio.gather(*(classify_batch(batch) for batch in batches))
+    return {pmid: related for result in results for pmid, related in result.items()}
+
+
+class SavedSearchManager:
+    """저장된 검색을 관리합니다.
+
+    검색마다 본 PMID 목록과 워터마크(마지막 갱신일)를 SAVED_SEARCHES_DIR/<id>.json에 저장하고,
+    갱신 시에는 워터마크 이후 PubMed에 등록된(EDAT) 논문만 조회·분류해 기존 결과에 병합합니다.
+    따라서 갱신 비용은 전체 결과 수가 아니라 새로 출판된 논문 수에 비례합니다.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _path(self, search_id: str) -> Path:
+        return self.directory / f"{search_id}.json"
+
+    def _read(self, search_id: str) -> Optional[SavedSearch]:
+        path = self._path(search_id)
+        if not search_id.isalnum() or not path.exists():
+            return None
+        return SavedSearch(**json.loads(path.read_text(encoding="utf-8")))
+
+    def _write(self, saved: SavedSearch) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(saved.id)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(saved), ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def _list(self) -> list[SavedSearch]:
+        searches = []
+        for path in self.directory.glob("*.json"):
+            try:
+                searches.append(SavedSearch(**json.loads(path.read_text(encoding="utf-8"))))
+            except Exception as e:
+                print(f"저장된 검색 읽기 오류 ({path.name}): {e}")
+        return sorted(searches, key=lambda s: s.created_at)
+
+    async def list_all(self) -> list[SavedSearch]:
+        return await asyncio.to_thread(self._list)
+
+    async def get(self, search_id: str) -> Optional[SavedSearch]:
+        return await asyncio.to_thread(self._read, search_id)
+
+    async def create(self, request: SavedSearchCreate) -> SavedSearch:
+        saved = SavedSearch(id=uuid.uuid4().hex, **request.model_dump())
+        await asyncio.to_thread(self._write, saved)
+        return saved
+
+    async def delete(self, search_id: str) -> bool:
+        saved = await self.get(search_id)
+        if saved is None:
+            return False
+        await asyncio.to_thread(self._path(search_id).unlink, True)
+        self._locks.pop(search_id, None)
+        return True
+
+    async def _search_new(self, saved: SavedSearch, today: str) -> list[str]:
+        criteria = dict(
+            query=saved.query,
+            author=saved.author,
+            start_date=saved.start_date,
+            end_date=saved.end_date,
+            sort_by="date",
+        )
+
+        if saved.watermark is None:
+            # 첫 실행: 최신순으로 max_results편까지
+            _, pmids = await search_pubmed(**criteria, page=1, page_size=saved.max_results, use_cache=False)
+            return pmids
+
+        # 워터마크 당일도 포함해 조회 (같은 날 늦게 등록된 논문 누락 방지, 중복은 병합 시 제거)
+        # 같은 날 다시 갱신해도 새로 등록된 논문이 보이도록 검색 캐시는 쓰지 않음
+        pmids: list[str] = []
+        page = 1
+        while True:
+            if (page - 1) * DELTA_PAGE_SIZE > ESEARCH_MAX_RETSTART:
+                print(f"저장된 검색 {saved.id}: 새 논문이 너무 많아 {len(pmids)}편까지만 가져옵니다.")
+                return pmids
+            total, page_pmids = await search_pubmed(
+                **criteria,
+                page=page,
+                page_size=DELTA_PAGE_SIZE,
+                mindate=saved.watermark,
+                maxdate=today,
+                datetype="edat",
+                use_cache=False,
+            )
+            pmids.extend(page_pmids)
+            if not page_pmids or len(pmids) >= total:
+                return pmids
+            page += 1
+
+    async def refresh(self, search_id: str) -> Optional[tuple[SavedSearch, list[str]]]:
+        """워터마크 이후의 새 논문만 가져와 병합하고 (저장된 검색, 새 PMID 목록)을 반환합니다."""
+
+        lock = self._locks.setdefault(search_id, asyncio.Lock())
+        async with lock:
+            saved = await self.get(search_id)
+            if saved is None:
+                return None
+
+            today = _today()
+            with span("saved_search.esearch"):
+                found = await self._search_new(saved, today)
+
+            known = set(saved.pmids)
+            new_pmids = list(dict.fromkeys(pmid for pmid in found if pmid not in known))
+
+            # 지난 갱신에서 판정하지 못한 논문(이미 pmids에 있음)도 함께 다시 판정
+            retry_pmids = saved.unclassified
+            verdicts: dict[str, bool] = {}
+            fetched: list[str] = []
+            async for papers in iter_paper_details(new_pmids + retry_pmids):
+                fetched.extend(paper.pmid for paper in papers)
+                with span("saved_search.classify"):
+                    verdicts.update(await _classify(papers))
+
+            ir_pmids = {pmid for pmid, related in verdicts.items() if related is True}
+            saved.pmids = new_pmids + saved.pmids
+            saved.ir_pmids = [pmid for pmid in new_pmids + retry_pmids if pmid in ir_pmids] + saved.ir_pmids
+            # Groq 오류 등으로 판정이 빠진 논문은 IR 아님으로 확정하지 않고 다음 갱신 때 다시 판정
+            # (GROQ_API_KEY가 없으면 판정 자체를 하지 않으므로 기록하지 않음)
+            saved.unclassified = [pmid for pmid in fetched if pmid not in verdicts] if GROQ_API_KEY else []
+            saved.watermark = today
+            saved.refreshed_at = time.time()
+            await asyncio.to_thread(self._write, saved)
+
+            return saved, new_pmids
+
+
+saved_search_manager = SavedSearchManager(Path(SAVED_SEARCHES_DIR))
@@ -0,0 +1,364 @@
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+from app.config import SHARED_STATE_URL, SHARED_STATE_TIMEOUT
+
+# 토큰 버킷 상태는 마지막 사용 후 이 시간이 지나면 버려도 됨 (그 사이 가득 찼을 것)
+_BUCKET_TTL = 3600
+
+
+def _refill(tokens: float, updated: float, now: float, rate: float, capacity: float) -> float:
+    return min(capacity, tokens + max(now - updated, 0.0) * rate)
+
+
+class SharedBackend(ABC):
+    """여러 워커 프로세스가 함께 쓰는 캐시 저장소와 토큰 버킷 상태
+
+    값은 직렬화된 bytes로 주고받으며, 토큰 버킷 시각은 프로세스 간에 같은 기준이 필요하므로
+    monotonic 대신 time.time()을 씁니다. 모든 메서드는 블로킹 I/O이므로 이벤트 루프에서는
+    asyncio.to_thread로 호출하고, 여러 키는 get_many/set_many로 한 번에 주고받습니다.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.set_many({key: value}, ttl)
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        """만료되지 않은 키의 값만 담은 딕셔너리를 반환합니다."""
+
+    @abstractmethod
+    def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        """여러 값을 같은 ttl(초)로 저장합니다."""
+
+    @abstractmethod
+    def take_token(self, name: str, rate: float, capacity: float, reserve: float) -> tuple[bool, float]:
+        """토큰을 채운 뒤 reserve개를 남길 수 있으면 하나 가져갑니다. (성공 여부, 남은 토큰 수)를 반환합니다."""
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(SharedBackend):
+    """프로세스 안에서만 공유되는 구현 (테스트와 로컬 실행용 대역)"""
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, bytes]] = {}
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        now = time.time()
+        found = {}
+        with self._lock:
+            for key in keys:
+                item = self._data.get(key)
+                if item is None:
+                    continue
+                if item[0] < now:
+                    del self._data[key]
+                else:
+                    found[key] = item[1]
+        return found
+
+    def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        expires_at = time.time() + ttl
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (expires_at, value)
+
+    def take_token(self, name: str, rate: float, capacity: float, reserve: float) -> tuple[bool, float]:
+        now = time.time()
+        with self._lock:
+            tokens, updated = self._buckets.get(name, (capacity, now))
+            tokens = _refill(tokens, updated, now, rate, capacity)
+            ok = tokens - 1 >= reserve
+            if ok:
+                tokens -= 1
+            self._buckets[name] = (tokens, now)
+        return ok, tokens
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    value BLOB NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SQLiteBackend(SharedBackend):
+    """같은 머신의 워커들이 공유하는 SQLite 파일 구현
+
+    WAL 모드라 읽기는 서로 막지 않고, 토큰 버킷은 BEGIN IMMEDIATE 트랜잭션으로 프로세스 간 원자적으로 갱신합니다.
+    쓰기 잠금은 timeout초까지만 기다리고 넘기면 sqlite3.OperationalError를 냅니다 (호출 측은 프로세스 안 상태로 진행).
+    만료된 캐시 항목은 쓰기 PURGE_EVERY번마다 한 번씩 지웁니다.
+    """
+
+    PURGE_EVERY = 1000
+    # 한 번의 SELECT ... IN (...)에 넣는 최대 키 수 (SQLite 매개변수 개수 제한)
+    BATCH_SIZE = 500
+
+    def __init__(self, path: Path, timeout: float = SHARED_STATE_TIMEOUT):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=timeout)
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SQLITE_SCHEMA)
+
+    def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        now = time.time()
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), self.BATCH_SIZE):
+                batch = keys[i:i + self.BATCH_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({','.join('?' * len(batch))}) AND expires_at >= ?",
+                    (*batch, now),
+                )
+                found.update(rows)
+        return found
+
+    def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+                    [(key, now + ttl, value) for key, value in items.items()],
+                )
+                self._writes += len(items)
+                if self._writes >= self.PURGE_EVERY:
+                    self._writes = 0
+                    self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def take_token(self, name: str, rate: float, capacity: float, reserve: float) -> tuple[bool, float]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+                tokens = _refill(*row, now, rate, capacity) if row else capacity
+                ok = tokens - 1 >= reserve
+                if ok:
+                    tokens -= 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)", (name, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ok, tokens
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisError(Exception):
+    """Redis 서버가 오류 응답(-ERR ...)을 보낸 경우"""
+
+
+# 토큰 버킷 갱신을 서버에서 원자적으로 수행 (KEYS[1] = 버킷, ARGV = rate, capacity, reserve, now)
+_TAKE_TOKEN_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate, capacity, reserve, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated, 0) * rate)
+local ok = 0
+if tokens - 1 >= reserve then
+    tokens = tokens - 1
+    ok = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+return {ok, tostring(tokens)}
+"""
+
+
+class RedisBackend(SharedBackend):
+    """Redis 프로토콜(RESP) 서버 구현 (Redis, Valkey, KeyDB 등)
+
+    MGET/SET/EVAL만 쓰므로 클라이언트 라이브러리 없이 소켓 하나로 직접 통신하며, 여러 키 저장은
+    명령을 한꺼번에 보내고 응답을 모아 읽는 파이프라인으로 왕복 한 번에 처리합니다.
+    연결이 끊기면 다음 명령에서 한 번 다시 연결합니다.
+    """
+
+    def __init__(self, url: str, timeout: float = SHARED_STATE_TIMEOUT):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.prefix = "pubmed:"
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rb")
+        if self.password:
+            self._roundtrip(b"AUTH", self.password.encode())
+        if self.db:
+            self._roundtrip(b"SELECT", str(self.db).encode())
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        args = [a if isinstance(a, bytes) else str(a).encode() for a in args]
+        command = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            command.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(command)
+
+    def _roundtrip(self, *args: bytes):
+        self._sock.sendall(self._encode(args))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Redis 연결이 끊겼습니다.")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body
+        if kind == b"-":
+            raise RedisError(body.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"알 수 없는 Redis 응답: {line[:20]!r}")
+
+    def pipeline(self, commands: list[tuple]) -> list:
+        """명령들을 한꺼번에 보내고 응답 목록을 반환합니다. 오류 응답은 예외 대신 RedisError 객체로 담습니다."""
+
+        payload = b"".join(self._encode(args) for args in commands)
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(payload)
+                    replies = []
+                    for _ in commands:
+                        try:
+                            replies.append(self._read_reply())
+                        except RedisError as e:
+                            replies.append(e)
+                    return replies
+                except (OSError, ConnectionError):
+                    self._disconnect()
+                    if attempt:
+                        raise
+
+    def command(self, *args):
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        if not keys:
+            return {}
+        values = self.command(b"MGET", *(self.prefix + key for key in keys))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, items: dict[str, bytes], ttl: float) -> None:
+        if not items:
+            return
+        ttl_ms = max(int(ttl * 1000), 1)
+        replies = self.pipeline([(b"SET", self.prefix + key, value, b"PX", ttl_ms) for key, value in items.items()])
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+
+    def take_token(self, name: str, rate: float, capacity: float, reserve: float) -> tuple[bool, float]:
+        ok, tokens = self.command(
+            b"EVAL", _TAKE_TOKEN_SCRIPT, 1, f"{self.prefix}bucket:{name}",
+            repr(rate), repr(capacity), repr(reserve), repr(time.time()), _BUCKET_TTL,
+        )
+        return ok == 1, float(tokens)
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+
+def create_backend(url: str) -> Optional[SharedBackend]:
+    """SHARED_STATE_URL 형식의 주소로 공유 저장소를 만듭니다. 빈 문자열이면 None입니다.
+
+    - sqlite:///data/shared.db (상대 경로), sqlite:////var/lib/app/shared.db (절대 경로)
+    - redis://[:password@]host:port/db
+    - memory (프로세스 내부, 테스트용)
+    """
+
+    if not url:
+        return None
+    if url == "memory":
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(Path(url[len("sqlite:///"):]))
+    if url.startswith("redis://"):
+        return RedisBackend(url)
+    raise ValueError(f"지원하지 않는 SHARED_STATE_URL: {url}")
+
+
+_backend: Optional[SharedBackend] = None
+_backend_created = False
+
+
+def get_shared_backend() -> Optional[SharedBackend]:
+    """설정된 공유 저장소를 반환합니다. 단일 프로세스 모드(SHARED_STATE_URL 미설정)면 None입니다."""
+
+    global _backend, _backend_created
+
+    if not _backend_created:
+        _backend = create_backend(SHARED_STATE_URL)
+        _backend_created = True
+    return _backend
@@ -0,0 +1,349 @@
+import asyncio
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Iterable, Optional
+from app.config import MINHASH_INDEX_PATH
+from app.models.record import PaperRecord
+from app.services.executor import run_cpu
+from app.services.metrics import ERRORS
+from app.services.retrieval import STOPWORDS
+
+# 서명 길이와 LSH 밴드 구성 (BANDS × ROWS = NUM_PERM)
+# 밴드 하나가 4행이면 Jaccard 0.5인 쌍은 약 87%, 0.05인 쌍은 0.02%만 후보가 됨
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    pmid INTEGER PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket INTEGER NOT NULL,
+    pmid INTEGER NOT NULL,
+    PRIMARY KEY (bucket, pmid)
+) WITHOUT ROWID;
+"""
+
+_permutations = None
+
+
+def _hash_params():
+    """서명 계산용 해시 계수. 프로세스마다 같은 값이 나오도록 고정 시드 사용"""
+
+    global _permutations
+
+    if _permutations is None:
+        # numpy는 import 비용이 커서 서명을 처음 계산할 때 불러옴
+        import numpy as np
+
+        rng = np.random.default_rng(1)
+        # 곱셈-시프트 해시 (a·h + b mod 2^64의 상위 32비트), a는 홀수
+        a = rng.integers(0, 1 << 63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        b = rng.integers(0, 1 << 63, size=NUM_PERM, dtype=np.uint64)
+        # 밴드 키 계산용 행별 계수 (홀수)
+        rows = rng.integers(0, 1 << 63, size=ROWS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        _permutations = (a, b, rows)
+    return _permutations
+
+
+def shingles(paper: PaperRecord) -> set[str]:
+    """제목과 초록의 내용어 집합 (불용어와 두 글자 이하 단어 제외)"""
+
+    text = f"{paper.title} {paper.abstract}".lower()
+    return {word for word in _WORD_RE.findall(text) if word not in STOPWORDS}
+
+
+def signature(paper: PaperRecord):
+    """논문의 MinHash 서명(uint32 배열)을 계산합니다. 단어가 없으면 None입니다."""
+
+    import numpy as np
+
+    words = shingles(paper)
+    if not words:
+        return None
+
+    a, b, _ = _hash_params()
+    hashes = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    # uint64 배열 곱셈은 2^64에서 자연스럽게 넘침
+    values = (np.outer(a, hashes) + b[:, None]) >> np.uint64(32)
+    return values.min(axis=1).astype(np.uint32)
+
+
+def compute_signatures(papers: list[PaperRecord]) -> list[tuple[str, bytes]]:
+    """논문 목록의 (PMID, 서명 바이트) 목록을 반환합니다 (executor에서 실행)."""
+
+    result = []
+    for paper in papers:
+        sig = signature(paper)
+        if sig is not None and paper.pmid.isdigit():
+            result.append((paper.pmid, sig.tobytes()))
+    return result
+
+
+def band_keys(signatures):
+    """서명 행렬(N × NUM_PERM)을 밴드별 버킷 키 행렬(N × BANDS, int64)로 변환합니다.
+
+    밴드의 ROWS개 값을 섞은 64비트 값에 밴드 번호를 더해 밴드끼리 키가 겹치지 않게 합니다.
+    """
+
+    import numpy as np
+
+    _, _, rows = _hash_params()
+    bands = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    keys = (bands * rows).sum(axis=2, dtype=np.uint64)
+    keys = (keys ^ (keys >> np.uint64(29))) * np.uint64(0xBF58476D1CE4E5B9) + np.arange(BANDS, dtype=np.uint64)
+    return keys.view(np.int64)
+
+
+def estimate_similarity(a, b) -> float:
+    """두 서명의 일치 비율 = Jaccard 유사도 추정값"""
+    return float((a == b).mean())
+
+
+def _from_bytes(data: bytes):
+    import numpy as np
+    return np.frombuffer(data, dtype=np.uint32)
+
+
+def _bucket_rows(items: list[tuple[int, bytes]]) -> list[tuple[int, int]]:
+    """(버킷 키, PMID) 행 목록. B-트리에 차례로 들어가도록 키 순으로 정렬"""
+
+    import numpy as np
+
+    if not items:
+        return []
+    sigs = np.frombuffer(b"".join(data for _, data in items), dtype=np.uint32).reshape(len(items), NUM_PERM)
+    keys = band_keys(sigs).ravel()
+    pmids = np.repeat(np.array([pmid for pmid, _ in items], dtype=np.int64), BANDS)
+    order = np.argsort(keys, kind="stable")
+    return list(zip(keys[order].tolist(), pmids[order].tolist()))
+
+
+class MinHashIndex:
+    """제목·초록 MinHash 서명의 LSH 인덱스 (SQLite)
+
+    서명은 signatures 테이블에, 밴드별 버킷 키는 (bucket, pmid) 기본 키 테이블에 저장합니다.
+    후보 조회는 질의 서명의 버킷 키 BANDS개를 인덱스에서 찾는 것이라 색인된 논문 수가 늘어도
+    비용이 거의 늘지 않습니다. 연결 하나를 락으로 보호해 여러 스레드에서 사용합니다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _delete_locked(self, ids: list[int]) -> None:
+        for i in range(0, len(ids), 900):
+            chunk = ids[i:i + 900]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT pmid, signature FROM signatures WHERE pmid IN ({placeholders})", chunk
+            ).fetchall()
+            self._conn.executemany("DELETE FROM buckets WHERE bucket = ? AND pmid = ?", _bucket_rows(rows))
+            self._conn.execute(f"DELETE FROM signatures WHERE pmid IN ({placeholders})", chunk)
+
+    def write_batch(self, items: Iterable[tuple[str, bytes]], deleted_pmids: Iterable[str] = ()) -> None:
+        """서명 추가/교체와 삭제를 하나의 트랜잭션으로 처리합니다."""
+
+        # 같은 배치에 한 논문의 여러 버전이 있으면 마지막 것을 사용
+        items = list({int(pmid): data for pmid, data in items}.items())
+        deleted = [int(p) for p in deleted_pmids if p.isdigit()]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 개정된 논문은 예전 버킷을 지운 뒤 다시 색인
+                self._delete_locked([pmid for pmid, _ in items] + deleted)
+                self._conn.executemany("INSERT INTO signatures (pmid, signature) VALUES (?, ?)", items)
+                self._conn.executemany("INSERT OR IGNORE INTO buckets (bucket, pmid) VALUES (?, ?)", _bucket_rows(items))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_signatures(self, pmids: list[str]) -> dict[str, bytes]:
+        ids = [int(p) for p in pmids if p.isdigit()]
+        found = {}
+        with self._lock:
+            for i in range(0, len(ids), 900):
+                chunk = ids[i:i + 900]
+                placeholders = ",".join("?" * len(chunk))
+                for pmid, data in self._conn.execute(
+                    f"SELECT pmid, signature FROM signatures WHERE pmid IN ({placeholders})", chunk
+                ):
+                    found[str(pmid)] = data
+        return found
+
+    def query(self, data: bytes, limit: int, min_similarity: float, exclude: str = "") -> list[tuple[str, float]]:
+        """서명과 버킷을 공유하는 후보의 유사도를 추정해 (PMID, 유사도)를 높은 순으로 반환합니다."""
+
+        sig = _from_bytes(data)
+        keys = band_keys(sig.reshape(1, NUM_PERM))[0].tolist()
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT pmid, signature FROM signatures WHERE pmid IN "
+                f"(SELECT DISTINCT pmid FROM buckets WHERE bucket IN ({placeholders}))",
+                keys,
+            ).fetchall()
+
+        scored = []
+        for pmid, other in rows:
+            pmid = str(pmid)
+            if pmid == exclude:
+                continue
+            score = estimate_similarity(sig, _from_bytes(other))
+            if score >= min_similarity:
+                scored.append((pmid, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+
+_index: Optional[MinHashIndex] = None
+_index_lock = threading.Lock()
+
+# 진행 중인 백그라운드 색인 작업 (완료 전에 가비지 컬렉션되지 않도록 보관)
+_pending: set[asyncio.Task] = set()
+
+
+def get_minhash_index() -> MinHashIndex:
+    global _index
+
+    with _index_lock:
+        if _index is None:
+            _index = MinHashIndex(Path(MINHASH_INDEX_PATH))
+    return _index
+
+
+async def _index_papers(papers: list[PaperRecord], missing_only: bool) -> None:
+    try:
+        index = get_minhash_index()
+        if missing_only:
+            found = await asyncio.to_thread(index.get_signatures, [p.pmid for p in papers])
+            papers = [p for p in papers if p.pmid not in found]
+        items = await run_cpu(compute_signatures, papers) if papers else []
+        if items:
+            await asyncio.to_thread(index.write_batch, items)
+    except Exception as e:
+        ERRORS.labels(component="minhash").inc()
+        print(f"MinHash 색인 오류: {e}")
+
+
+def index_in_background(papers: list[PaperRecord], missing_only: bool = False) -> None:
+    """논문을 응답을 기다리게 하지 않고 백그라운드에서 색인합니다.
+
+    missing_only면 아직 색인되지 않은 논문만 색인합니다 (복원된 캐시 등).
+    """
+
+    if not papers:
+        return
+    task = asyncio.create_task(_index_papers(papers, missing_only))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+async def paper_signature(paper: PaperRecord) -> Optional[bytes]:
+    """논문의 서명을 인덱스에서 찾고, 없으면 계산해 색인합니다."""
+
+    index = get_minhash_index()
+    found = await asyncio.to_thread(index.get_signatures, [paper.pmid])
+    if paper.pmid in found:
+        return found[paper.pmid]
+
+    items = await run_cpu(compute_signatures, [paper])
+    if not items:
+        return None
+    await asyncio.to_thread(index.write_batch, items)
+    return items[0][1]
+
+
+async def find_related(paper: PaperRecord, limit: int, min_similarity: float) -> list[tuple[str, float]]:
+    """색인된 모든 논문 중 paper와 제목·초록이 비슷한 논문을 (PMID, 유사도)로 반환합니다."""
+
+    data = await paper_signature(paper)
+    if data is None:
+        return []
+    return await asyncio.to_thread(get_minhash_index().query, data, limit, min_similarity, paper.pmid)
+
+
+def group_duplicates(items: list[tuple[str, bytes]], threshold: float) -> dict[str, list[str]]:
+    """서명 목록에서 거의 같은 논문을 묶어 {대표 PMID: [중복 PMID, ...]}로 반환합니다.
+
+    같은 버킷에 들어간 쌍만 비교하며, 목록에서 먼저 나온 논문을 대표로 남깁니다.
+    """
+
+    import numpy as np
+
+    if not items:
+        return {}
+
+    sigs = [_from_bytes(data) for _, data in items]
+    buckets: dict[int, list[int]] = {}
+    for i, keys in enumerate(band_keys(np.stack(sigs)).tolist()):
+        for key in keys:
+            buckets.setdefault(key, []).append(i)
+
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                pair = (members[x], members[y])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if estimate_similarity(sigs[pair[0]], sigs[pair[1]]) >= threshold:
+                    a, b = find(pair[0]), find(pair[1])
+                    if a != b:
+                        parent[max(a, b)] = min(a, b)
+
+    groups: dict[str, list[str]] = {}
+    for i, (pmid, _) in enumerate(items):
+        root = find(i)
+        if root != i:
+            groups.setdefault(items[root][0], []).append(pmid)
+    return groups
+
+
+async def find_duplicates(papers: list[PaperRecord], threshold: float) -> dict[str, list[str]]:
+    """논문 목록 안의 거의 같은 논문(정오표, 재게재 초록 등)을 찾습니다.
+
+    이미 색인된 서명을 재사용하고, 없는 서명만 계산합니다. 대표는 목록에서 먼저 나온 논문입니다.
+    """
+
+    found = await asyncio.to_thread(get_minhash_index().get_signatures, [p.pmid for p in papers])
+    missing = [p for p in papers if p.pmid not in found]
+    if missing:
+        found.update(await run_cpu(compute_signatures, missing))
+
+    pmids = dict.fromkeys(p.pmid for p in papers)
+    items = [(pmid, found[pmid]) for pmid in pmids if pmid in found]
+    return await run_cpu(group_duplicates, items, threshold)
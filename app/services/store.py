@@ -0,0 +1,311 @@
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+from app.config import PAPER_STORE_PATH
+from app.models.record import PaperRecord, MeshHeading
+
+# 저자/키워드 목록 저장 시 구분자 (이름에 나오지 않는 제어 문자)
+_SEP = "\x1f"
+# MeSH 주제어 안의 필드(UI, 이름, 한정어, 주요 주제) 구분자와 한정어 구분자
+_FIELD_SEP = "\x1e"
+_QUALIFIER_SEP = "\x1d"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    pmid INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    pub_date TEXT NOT NULL,
+    pub_year INTEGER,
+    journal TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    pmc_id TEXT,
+    mesh TEXT NOT NULL DEFAULT ''
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, authors, keywords,
+    content='papers', content_rowid='pmid', tokenize='porter unicode61'
+);
+
+CREATE TABLE IF NOT EXISTS ingest_files (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    articles INTEGER NOT NULL,
+    deleted INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+"""
+
+# MeSH 주제어도 FTS keywords 열에 함께 색인 (구분 문자는 토크나이저가 단어 경계로 처리)
+_TRIGGERS = """
+DROP TRIGGER IF EXISTS papers_ai;
+DROP TRIGGER IF EXISTS papers_ad;
+DROP TRIGGER IF EXISTS papers_au;
+
+CREATE TRIGGER papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, abstract, authors, keywords)
+    VALUES (new.pmid, new.title, new.abstract, new.authors, new.keywords || char(31) || new.mesh);
+END;
+
+CREATE TRIGGER papers_ad AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors, keywords)
+    VALUES ('delete', old.pmid, old.title, old.abstract, old.authors, old.keywords || char(31) || old.mesh);
+END;
+
+CREATE TRIGGER papers_au AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors, keywords)
+    VALUES ('delete', old.pmid, old.title, old.abstract, old.authors, old.keywords || char(31) || old.mesh);
+    INSERT INTO papers_fts(rowid, title, abstract, authors, keywords)
+    VALUES (new.pmid, new.title, new.abstract, new.authors, new.keywords || char(31) || new.mesh);
+END;
+"""
+
+_UPSERT = """
+INSERT INTO papers (pmid, title, authors, abstract, pub_date, pub_year, journal, keywords, pmc_id, mesh)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(pmid) DO UPDATE SET
+    title = excluded.title,
+    authors = excluded.authors,
+    abstract = excluded.abstract,
+    pub_date = excluded.pub_date,
+    pub_year = excluded.pub_year,
+    journal = excluded.journal,
+    keywords = excluded.keywords,
+    pmc_id = excluded.pmc_id,
+    mesh = excluded.mesh
+"""
+
+_BOOLEAN_OPERATORS = {"AND", "OR", "NOT"}
+_TOKEN_RE = re.compile(r"\(|\)|\"[^\"]+\"|[^\s()\"]+")
+
+
+def _row(record: PaperRecord) -> tuple:
+    year = record.pub_date[:4]
+    return (
+        int(record.pmid),
+        record.title,
+        _SEP.join(record.authors),
+        record.abstract,
+        record.pub_date,
+        int(year) if year.isdigit() else None,
+        record.journal,
+        _SEP.join(record.keywords),
+        record.pmc_id,
+        _SEP.join(
+            _FIELD_SEP.join((h.ui, h.name, _QUALIFIER_SEP.join(h.qualifiers), "1" if h.major else ""))
+            for h in record.mesh
+        ),
+    )
+
+
+def _mesh(value: str) -> tuple[MeshHeading, ...]:
+    headings = []
+    for entry in value.split(_SEP) if value else ():
+        ui, name, qualifiers, major = entry.split(_FIELD_SEP)
+        qualifiers = tuple(qualifiers.split(_QUALIFIER_SEP)) if qualifiers else ()
+        headings.append(MeshHeading(ui, name, qualifiers, major == "1"))
+    return tuple(headings)
+
+
+def _record(row: sqlite3.Row) -> PaperRecord:
+    return PaperRecord(
+        pmid=str(row["pmid"]),
+        title=row["title"],
+        authors=tuple(row["authors"].split(_SEP)) if row["authors"] else (),
+        abstract=row["abstract"],
+        pub_date=row["pub_date"],
+        journal=row["journal"],
+        keywords=tuple(row["keywords"].split(_SEP)) if row["keywords"] else (),
+        pmc_id=row["pmc_id"],
+        mesh=_mesh(row["mesh"]),
+    )
+
+
+def to_fts_query(query: str) -> str:
+    """PubMed 스타일 검색어를 FTS5 MATCH 구문으로 변환합니다.
+
+    AND/OR/NOT과 괄호는 유지하고, 나머지 단어는 따옴표로 감싸 FTS 문법 오류를 피합니다.
+    [MeSH Terms] 같은 필드 태그는 무시합니다.
+    """
+
+    query = re.sub(r"\[[^\]]*\]", " ", query)
+    parts = []
+    for token in _TOKEN_RE.findall(query):
+        if token in ("(", ")") or token.upper() in _BOOLEAN_OPERATORS:
+            parts.append(token.upper())
+            continue
+        term = token.strip('"').replace('"', "")
+        if term and any(ch.isalnum() for ch in term):
+            parts.append(f'"{term}"')
+    return " ".join(parts)
+
+
+class PaperStore:
+    """로컬 논문 저장소 (SQLite + FTS5 검색 인덱스)
+
+    PMID를 rowid로 쓰는 papers 테이블과 외부 콘텐츠 FTS5 인덱스로 구성되며,
+    트리거로 인덱스를 자동 갱신합니다. 연결 하나를 락으로 보호해 여러 스레드에서 사용합니다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            # MeSH 열이 생기기 전에 만든 저장소 (그때 수집한 논문은 MeSH가 keywords에 섞여 있음)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(papers)")}
+            if "mesh" not in columns:
+                self._conn.execute("ALTER TABLE papers ADD COLUMN mesh TEXT NOT NULL DEFAULT ''")
+            self._conn.executescript(_TRIGGERS)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def write_batch(
+        self,
+        records: Iterable[PaperRecord],
+        deleted_pmids: Iterable[str] = (),
+        checkpoint: Optional[dict] = None,
+    ) -> None:
+        """논문 추가/갱신, 삭제, 체크포인트 기록을 하나의 트랜잭션으로 처리합니다."""
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(_UPSERT, (_row(r) for r in records if r.pmid.isdigit()))
+                self._conn.executemany(
+                    "DELETE FROM papers WHERE pmid = ?",
+                    ((int(p),) for p in deleted_pmids if p.isdigit()),
+                )
+                if checkpoint is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO ingest_files (name, size, mtime, articles, deleted, finished_at) "
+                        "VALUES (:name, :size, :mtime, :articles, :deleted, :finished_at)",
+                        {"finished_at": time.time(), **checkpoint},
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def is_ingested(self, name: str, size: int, mtime: float) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM ingest_files WHERE name = ? AND size = ? AND mtime = ?",
+                (name, size, mtime),
+            ).fetchone()
+        return row is not None
+
+    def get_many(self, pmids: list[str]) -> dict[str, PaperRecord]:
+        ids = [int(p) for p in pmids if p.isdigit()]
+        if not ids:
+            return {}
+
+        found = {}
+        with self._lock:
+            # SQLite 변수 개수 제한을 넘지 않도록 나누어 조회
+            for i in range(0, len(ids), 900):
+                chunk = ids[i:i + 900]
+                placeholders = ",".join("?" * len(chunk))
+                for row in self._conn.execute(f"SELECT * FROM papers WHERE pmid IN ({placeholders})", chunk):
+                    found[str(row["pmid"])] = _record(row)
+        return found
+
+    def search(
+        self,
+        query: str,
+        author: Optional[str] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[int, list[str]]:
+        """전문 검색 후 (전체 건수, 관련도순 PMID 목록)을 반환합니다."""
+
+        match = to_fts_query(query)
+        if author:
+            author_terms = " ".join(f'"{t}"' for t in re.findall(r"\w+", author))
+            match = f"({match}) AND authors : ({author_terms})" if match else f"authors : ({author_terms})"
+        if not match:
+            return 0, []
+
+        where = "papers_fts MATCH ?"
+        params: list = [match]
+        if start_year is not None:
+            where += " AND papers.pub_year >= ?"
+            params.append(start_year)
+        if end_year is not None:
+            where += " AND papers.pub_year <= ?"
+            params.append(end_year)
+
+        base = f"FROM papers_fts JOIN papers ON papers.pmid = papers_fts.rowid WHERE {where}"
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT papers.pmid {base} ORDER BY bm25(papers_fts) LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return total, [str(row[0]) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+
+_store: Optional[PaperStore] = None
+
+
+def get_paper_store(create: bool = False) -> Optional[PaperStore]:
+    """로컬 논문 저장소를 반환합니다. 아직 수집된 데이터가 없으면(create=False) None입니다."""
+
+    global _store
+
+    if _store is None:
+        path = Path(PAPER_STORE_PATH)
+        if not create and not path.exists():
+            return None
+        _store = PaperStore(path)
+    return _store
+
+
+def _year(value: Optional[str]) -> Optional[int]:
+    return int(value[:4]) if value and value[:4].isdigit() else None
+
+
+async def search_local(
+    query: str,
+    author: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 20,
+    sort_by: str = "relevance",
+) -> tuple[int, list[str]]:
+    """search_pubmed와 같은 형태로 로컬 저장소를 검색합니다."""
+
+    store = get_paper_store()
+    if store is None:
+        raise RuntimeError("로컬 논문 저장소가 없습니다. 먼저 python -m app.ingest 로 수집하세요.")
+
+    return await asyncio.to_thread(
+        store.search,
+        query,
+        author,
+        _year(start_date),
+        _year(end_date),
+        page_size,
+        (page - 1) * page_size,
+    )
@@ -0,0 +1,99 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+slow_request_logger = logging.getLogger("app.slow_request")
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    end: Optional[float] = None
+    children: list["Span"] = field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def to_dict(self, origin: float) -> dict:
+        """슬로우 로그용 트리 구조로 변환합니다. offset은 요청 시작 기준 ms입니다."""
+        return {
+            "name": self.name,
+            "offset_ms": round((self.start - origin) * 1000, 1),
+            "duration_ms": round(self.duration_ms, 1),
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+
+# 요청 단위 루트 스팬과 현재 열린 스팬
+# asyncio.gather로 만든 태스크는 컨텍스트를 복사하므로 병렬 구간도 같은 트리에 기록됨
+_root_span: ContextVar[Optional[Span]] = ContextVar("root_span", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def start_trace(name: str = "total") -> Span:
+    """요청의 루트 스팬을 시작합니다."""
+
+    root = Span(name=name, start=time.perf_counter())
+    _root_span.set(root)
+    _current_span.set(root)
+    return root
+
+
+@contextmanager
+def span(name: str):
+    """현재 요청 트리에 하위 스팬을 기록합니다. 추적 중이 아니면 아무것도 하지 않습니다."""
+
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name=name, start=time.perf_counter())
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+def _collect_durations(node: Span, totals: dict[str, float]) -> None:
+    for child in node.children:
+        totals[child.name] = totals.get(child.name, 0.0) + child.duration_ms
+        _collect_durations(child, totals)
+
+
+def server_timing_header(root: Span) -> str:
+    """Server-Timing 헤더 값을 생성합니다. 같은 이름의 스팬은 합산합니다."""
+
+    totals: dict[str, float] = {}
+    _collect_durations(root, totals)
+
+    entries = [f"{name};dur={duration:.1f}" for name, duration in totals.items()]
+    entries.append(f"{root.name};dur={root.duration_ms:.1f}")
+    return ", ".join(entries)
+
+
+def log_slow_request(root: Span, method: str, path: str, status: int, threshold_ms: float) -> None:
+    """임계값을 넘은 요청을 스팬 트리와 함께 구조화 로그로 남깁니다."""
+
+    duration_ms = root.duration_ms
+    if duration_ms < threshold_ms:
+        return
+
+    slow_request_logger.warning(json.dumps({
+        "event": "slow_request",
+        "method": method,
+        "path": path,
+        "status": status,
+        "duration_ms": round(duration_ms, 1),
+        "spans": root.to_dict(root.start)["children"],
+    }, ensure_ascii=False))
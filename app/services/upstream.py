@@ -0,0 +1,180 @@
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+import httpx
+from app.config import (
+    UPSTREAM_HEDGING,
+    HEDGE_PERCENTILE,
+    UPSTREAM_TIMEOUT_FACTOR,
+    UPSTREAM_TIMEOUT_FLOOR,
+)
+from app.services.metrics import (
+    track_upstream,
+    upstream_purpose,
+    UPSTREAM_HEDGES,
+    UPSTREAM_LATENCY_P95_SECONDS,
+    UPSTREAM_ADAPTIVE_TIMEOUT_SECONDS,
+)
+from app.services.deadline import upstream_timeout
+from app.services.http import get_http_client
+from app.services.ratelimit import TokenBucket
+
+# 분위수 계산에 쓰는 최근 응답 수와, 적응형 동작을 시작하기 위한 최소 표본 수
+WINDOW_SIZE = 200
+MIN_SAMPLES = 20
+
+# 요청 크기(한 번에 보내는 ID 수) 구간의 상한. 응답 시간은 ID 수에 비례하므로 구간마다 따로 관측해
+# 작은 요청(검색 페이지)의 지연으로 큰 요청(대량 조회 청크)의 타임아웃과 헤지 시점을 정하지 않음
+SIZE_BUCKETS = (1, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def size_bucket(size: int) -> str:
+    for bound in SIZE_BUCKETS:
+        if size <= bound:
+            return str(bound)
+    return "inf"
+
+
+class LatencyTracker:
+    """업스트림·요청 크기 구간별 최근 응답 시간 분포
+
+    성공한 응답 시간과, 다른 요청이 먼저 끝나 취소된 요청의 그때까지 걸린 시간(실제로는 그 이상)을
+    함께 기록합니다. 느린 요청이 취소되어 표본에서 빠지면 꼬리 지연이 실제보다 작게 보이기 때문입니다.
+    워커 프로세스마다 따로 관측합니다.
+    """
+
+    def __init__(self, name: str, size: str):
+        self.name = name
+        self.size = size
+        self._samples: deque[float] = deque(maxlen=WINDOW_SIZE)
+        self._sorted: Optional[list[float]] = None
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._sorted = None
+        if len(self._samples) >= MIN_SAMPLES:
+            UPSTREAM_LATENCY_P95_SECONDS.labels(upstream=self.name, size=self.size).set(self.percentile(0.95))
+
+    def percentile(self, q: float) -> Optional[float]:
+        """최근 응답 시간의 q 분위수 (표본이 부족하면 None)"""
+
+        if len(self._samples) < MIN_SAMPLES:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        return self._sorted[min(int(q * len(self._sorted)), len(self._sorted) - 1)]
+
+    def timeout(self, default: float) -> float:
+        """관측된 p95의 UPSTREAM_TIMEOUT_FACTOR배 (UPSTREAM_TIMEOUT_FLOOR 이상, default 이하)"""
+
+        p95 = self.percentile(0.95)
+        if p95 is None:
+            return default
+        value = min(default, max(UPSTREAM_TIMEOUT_FLOOR, p95 * UPSTREAM_TIMEOUT_FACTOR))
+        UPSTREAM_ADAPTIVE_TIMEOUT_SECONDS.labels(upstream=self.name, size=self.size).set(value)
+        return value
+
+
+_trackers: dict[tuple[str, str], LatencyTracker] = {}
+
+
+def get_tracker(upstream: str, size: int = 1) -> LatencyTracker:
+    key = (upstream, size_bucket(size))
+    if key not in _trackers:
+        _trackers[key] = LatencyTracker(*key)
+    return _trackers[key]
+
+
+def adaptive_timeout(upstream: str, default: float, size: int = 1) -> float:
+    """업스트림 호출 타임아웃: 같은 크기 구간의 관측 지연으로 정한 값과 요청 마감까지 남은 시간 중 짧은 쪽"""
+    return upstream_timeout(get_tracker(upstream, size).timeout(default))
+
+
+async def _attempt(upstream: str, method: str, url: str, timeout: float, size: int, **kwargs) -> httpx.Response:
+    tracker = get_tracker(upstream, size)
+    start = time.perf_counter()
+    try:
+        with track_upstream(upstream):
+            response = await get_http_client().request(method, url, timeout=timeout, **kwargs)
+            response.raise_for_status()
+    except httpx.TimeoutException:
+        # 타임아웃도 꼬리 지연의 표본 (오류 응답은 빨리 끝나도 지연 분포에 넣지 않음)
+        tracker.record(time.perf_counter() - start)
+        raise
+    tracker.record(time.perf_counter() - start)
+    return response
+
+
+async def upstream_request(
+    upstream: str,
+    method: str,
+    url: str,
+    default_timeout: float,
+    size: int = 1,
+    **kwargs,
+) -> httpx.Response:
+    """업스트림을 한 번 호출하고 지연을 기록합니다 (헤징하지 않음).
+
+    대량 조회용 경로이므로 타임아웃은 관측 지연으로 줄이지 않고 default_timeout(요청 마감 이내)을 그대로 씁니다.
+    """
+    return await _attempt(upstream, method, url, upstream_timeout(default_timeout), size, **kwargs)
+
+
+async def hedged_get(
+    upstream: str,
+    url: str,
+    default_timeout: float,
+    limiter: Optional[TokenBucket] = None,
+    size: int = 1,
+    **kwargs,
+) -> httpx.Response:
+    """멱등 GET 요청을 보내고, HEDGE_PERCENTILE 분위 지연을 넘기면 같은 요청을 한 번 더 보내 먼저 온 응답을 씁니다.
+
+    size는 요청에 담은 ID 수로, 타임아웃과 헤지 시점은 같은 크기 구간의 관측 지연으로 정합니다.
+
+    두 번째 요청(헤지)은 사용자 요청에만 보내며, limiter가 있으면 예약분을 남길 수 있을 때만 토큰을 가져가
+    레이트 리밋을 넘지 않습니다. 헤지를 보내면 먼저 성공한 쪽을 쓰고 나머지는 취소합니다.
+    """
+
+    tracker = get_tracker(upstream, size)
+    timeout = adaptive_timeout(upstream, default_timeout, size)
+    primary = asyncio.create_task(_attempt(upstream, "GET", url, timeout, size, **kwargs))
+
+    delay = tracker.percentile(HEDGE_PERCENTILE)
+    if not UPSTREAM_HEDGING or delay is None or upstream_purpose.get() != "interactive":
+        return await primary
+
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+    except asyncio.CancelledError:
+        primary.cancel()
+        raise
+    if done:
+        return primary.result()
+
+    if limiter is not None and not await limiter.try_acquire(limiter.reserve):
+        UPSTREAM_HEDGES.labels(upstream=upstream, outcome="skipped_budget").inc()
+        return await primary
+
+    hedge = asyncio.create_task(_attempt(upstream, "GET", url, timeout, size, **kwargs))
+    hedged_at = time.perf_counter()
+    attempts = {primary: "primary_won", hedge: "hedge_won"}
+    pending = set(attempts)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    UPSTREAM_HEDGES.labels(upstream=upstream, outcome=attempts[task]).inc()
+                    return task.result()
+        # 둘 다 실패하면 원래 요청의 오류를 그대로 전달
+        UPSTREAM_HEDGES.labels(upstream=upstream, outcome="failed").inc()
+        return primary.result()
+    finally:
+        for task, started in ((primary, hedged_at - delay), (hedge, hedged_at)):
+            if not task.done():
+                # 진 요청은 적어도 지금까지 걸린 만큼 느렸음
+                tracker.record(time.perf_counter() - started)
+                task.cancel()
+        await asyncio.gather(*attempts, return_exceptions=True)
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from pathlib import Path
+from app.config import CACHE_DIR, PUBMED_EUTILS_BASE_URL, ICITE_API_URL, GROQ_API_KEY
+from app.services.cache import snapshot_caches, write_snapshot, read_snapshot, restore_snapshot
+from app.services.http import get_http_client
+from app.services.pubmed import paper_cache
+from app.services.similarity import index_in_background
+
+CACHE_SNAPSHOT_PATH = Path(CACHE_DIR) / "caches.pkl"
+
+
+async def restore_caches() -> int:
+    """디스크에 저장된 캐시를 복원합니다. 파일 읽기와 역직렬화는 스레드에서 수행합니다."""
+
+    snapshot = await asyncio.to_thread(read_snapshot, CACHE_SNAPSHOT_PATH)
+    restored = restore_snapshot(snapshot)
+    # 유사 논문 인덱스에 없는 캐시 논문(인덱스가 생기기 전에 파싱된 논문 등)도 색인
+    index_in_background([paper for _, _, paper in paper_cache.dump()], missing_only=True)
+    return restored
+
+
+async def save_caches() -> None:
+    snapshot = snapshot_caches()
+    await asyncio.to_thread(write_snapshot, CACHE_SNAPSHOT_PATH, snapshot)
+
+
+async def periodic_cache_save(interval: float) -> None:
+    """머신이 정리 없이 종료되어도 최근 캐시가 남도록 주기적으로 저장합니다."""
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await save_caches()
+        except Exception as e:
+            print(f"캐시 저장 오류: {e}")
+
+
+async def _preconnect(url: str) -> None:
+    # 응답 내용과 무관하게 TCP/TLS 연결을 미리 맺어 커넥션 풀에 남겨둠
+    try:
+        await get_http_client().head(url, timeout=5.0)
+    except Exception:
+        pass
+
+
+def _load_groq_client() -> None:
+    from app.services.ai_summary import get_groq_client
+    get_groq_client()
+
+
+async def prewarm() -> None:
+    """포트 바인딩을 막지 않도록 백그라운드에서 캐시 복원, SDK 로딩, 커넥션 예열을 수행합니다."""
+
+    start = time.perf_counter()
+
+    restored = await restore_caches()
+
+    tasks = [_preconnect(f"{PUBMED_EUTILS_BASE_URL}/einfo.fcgi"), _preconnect(ICITE_API_URL)]
+    if GROQ_API_KEY:
+        tasks.append(asyncio.to_thread(_load_groq_client))
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    print(f"예열 완료: 캐시 {restored}개 복원, {time.perf_counter() - start:.2f}초")
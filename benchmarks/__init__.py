@@ -0,0 +1 @@
+"""오프라인 벤치마크 모음 (fixtures, 업스트림 스텁, 마이크로/부하 벤치마크)"""
@@ -0,0 +1,51 @@
+"""두 벤치마크 결과 파일 비교
+
+    python -m benchmarks.compare benchmarks/results/micro-abc123.json benchmarks/results/micro-def456.json
+"""
+
+import argparse
+
+from benchmarks.results import load_results
+
+# 낮을수록 좋은 지표 / 높을수록 좋은 지표
+LOWER_IS_BETTER = ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "bytes_per_paper", "seconds")
+HIGHER_IS_BETTER = ("rps", "papers_per_s", "articles_per_s")
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[tuple[str, str, float, float, float, str]]:
+    rows = []
+    for case, head_stats in head["results"].items():
+        base_stats = base["results"].get(case)
+        if not isinstance(head_stats, dict) or not isinstance(base_stats, dict):
+            continue
+
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            before, after = base_stats.get(metric), head_stats.get(metric)
+            if not isinstance(before, (int, float)) or not isinstance(after, (int, float)) or not before:
+                continue
+
+            change = (after - before) / before * 100
+            improved = change < 0 if metric in LOWER_IS_BETTER else change > 0
+            verdict = ""
+            if abs(change) >= threshold:
+                verdict = "개선" if improved else "악화"
+            rows.append((case, metric, before, after, change, verdict))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=5.0, help="변화로 표시할 최소 비율(%%)")
+    args = parser.parse_args()
+
+    base, head = load_results(args.base), load_results(args.head)
+    print(f"base: {base['environment']['git_revision']}  head: {head['environment']['git_revision']}\n")
+
+    for case, metric, before, after, change, verdict in compare(base, head, args.threshold):
+        print(f"{case:<32} {metric:<14} {before:12.3f} -> {after:12.3f}  {change:+7.1f}%  {verdict}")
+
+
+if __name__ == "__main__":
+    main()
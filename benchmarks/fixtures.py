@@ -0,0 +1,109 @@
+"""벤치마크용 녹화 응답(fixtures) 로더와 대용량 코퍼스 생성기"""
+
+import json
+import random
+import re
+from functools import lru_cache
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+_ARTICLE_RE = re.compile(r"<PubmedArticle>.*?</PubmedArticle>", re.S)
+_PMID_RE = re.compile(r"(<PMID[^>]*>)\d+(</PMID>)")
+_ARTICLE_ID_RE = re.compile(r'(<ArticleId IdType="pubmed">)\d+(</ArticleId>)')
+_PUB_YEAR_RE = re.compile(r"(<PubDate><Year>)\d{4}(</Year>)")
+
+# 분석 함수가 현실적인 분포를 보도록 합성 논문마다 저자/키워드를 섞어줌
+_LAST_NAMES = ["Kim", "Lee", "Park", "Choi", "Jung", "Chen", "Wang", "Smith", "Schmidt", "Tanaka"]
+_FIRST_NAMES = ["Jin Woo", "Seung Hyun", "Min Ji", "Wei", "Anna", "Hiroshi", "John", "Soo Jin"]
+_KEYWORDS = [
+    "TACE", "TARE", "radiofrequency ablation", "microwave ablation", "cryoablation",
+    "TIPS", "embolization", "stent", "thrombectomy", "biopsy", "vertebroplasty",
+    "hepatocellular carcinoma", "liver metastases", "deep learning", "CT", "MRI",
+]
+
+
+def load_text(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def load_json(name: str) -> dict:
+    return json.loads(load_text(name))
+
+
+@lru_cache(maxsize=1)
+def template_articles() -> list[str]:
+    """녹화된 efetch 응답에서 <PubmedArticle> 블록을 추출합니다."""
+    return _ARTICLE_RE.findall(load_text("efetch.xml"))
+
+
+def synthetic_pmids(n: int, start: int = 30000000) -> list[str]:
+    return [str(start + i) for i in range(n)]
+
+
+def _synthesize_article(template: str, pmid: str, rng: random.Random) -> str:
+    article = _PMID_RE.sub(rf"\g<1>{pmid}\g<2>", template, count=1)
+    article = _ARTICLE_ID_RE.sub(rf"\g<1>{pmid}\g<2>", article, count=1)
+    article = _PUB_YEAR_RE.sub(rf"\g<1>{rng.randint(2000, 2025)}\g<2>", article, count=1)
+
+    authors = "".join(
+        f"<Author ValidYN=\"Y\"><LastName>{rng.choice(_LAST_NAMES)}</LastName>"
+        f"<ForeName>{rng.choice(_FIRST_NAMES)}</ForeName></Author>"
+        for _ in range(rng.randint(2, 8))
+    )
+    keywords = "".join(
+        f"<Keyword MajorTopicYN=\"N\">{kw}</Keyword>"
+        for kw in rng.sample(_KEYWORDS, rng.randint(2, 6))
+    )
+    article = article.replace("</AuthorList>", f"{authors}</AuthorList>", 1)
+    article = article.replace(
+        "</MedlineCitation>",
+        f"<KeywordList Owner=\"NOTNLM\">{keywords}</KeywordList></MedlineCitation>",
+        1,
+    )
+    return article
+
+
+def synthesize_efetch_xml(pmids: list[str], seed: int = 42) -> str:
+    """녹화된 논문을 템플릿으로 요청한 PMID 수만큼 efetch XML을 생성합니다.
+
+    같은 PMID 목록과 seed에 대해 항상 같은 결과를 만들어 커밋 간 비교가 가능합니다.
+    """
+
+    templates = template_articles()
+    rng = random.Random(seed)
+    articles = [
+        _synthesize_article(templates[i % len(templates)], pmid, rng)
+        for i, pmid in enumerate(pmids)
+    ]
+    return (
+        '<?xml version="1.0" ?>\n<PubmedArticleSet>\n'
+        + "\n".join(articles)
+        + "\n</PubmedArticleSet>\n"
+    )
+
+
+def esearch_response(pmids: list[str], total: int) -> dict:
+    data = load_json("esearch.json")
+    data["esearchresult"]["idlist"] = pmids
+    data["esearchresult"]["retmax"] = str(len(pmids))
+    data["esearchresult"]["count"] = str(total)
+    return data
+
+
+def icite_response(pmids: list[str]) -> dict:
+    template = load_json("icite.json")["data"]
+    data = []
+    for i, pmid in enumerate(pmids):
+        record = dict(template[i % len(template)])
+        record["pmid"] = int(pmid) if pmid.isdigit() else pmid
+        record["citation_count"] = (int(pmid) % 97) if pmid.isdigit() else 0
+        data.append(record)
+    return {"meta": {"pmids": ",".join(pmids)}, "links": {}, "data": data}
+
+
+def groq_response(content: str | None = None) -> dict:
+    data = load_json("groq_chat.json")
+    if content is not None:
+        data["choices"][0]["message"]["content"] = content
+    return data
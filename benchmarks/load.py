@@ -0,0 +1,194 @@
+"""API 부하 테스트 (로컬 업스트림 스텁 사용)
+
+스텁 서버와 앱을 서브프로세스로 띄우고, 시나리오별로 동시 요청을 보내
+처리량과 지연 시간 분포를 측정합니다.
+
+    python -m benchmarks.load --concurrency 8 --requests 200
+    python -m benchmarks.load --scenarios search chat --latency-ms 200
+    python -m benchmarks.load --app-url http://127.0.0.1:8000   # 이미 떠 있는 앱 대상
+    python -m benchmarks.load --workers 4 --concurrency 32      # 여러 워커 모드
+    python -m benchmarks.load --scenarios search_cold --workers 2   # 캐시 미스 경로 (워커 수별 확장성)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+
+from benchmarks.results import save_results, summarize_samples
+from benchmarks.stubs import stub_env
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+CHAT_PMIDS = [str(10000000 + i) for i in range(10)]
+
+# 실행마다 다른 검색어를 써서 이전 실행이 공유 저장소에 남긴 캐시를 피함
+RUN_ID = os.urandom(3).hex()
+
+SCENARIOS = {
+    "search": ("GET", "/api/search", {"query": "TACE hepatocellular carcinoma", "page_size": 20}),
+    "analyze_keywords": ("GET", "/api/analyze/keywords", {"query": "TACE"}),
+    "analyze_trends": ("GET", "/api/analyze/trends", {"query": "TACE"}),
+    "analyze_authors": ("GET", "/api/analyze/authors", {"query": "TACE"}),
+    "export_csv": ("GET", "/api/export/csv", {"query": "TACE", "max_results": 200}),
+    "chat": ("POST", "/api/chat", {"pmids": CHAT_PMIDS, "message": "TACE와 RFA의 합병증을 비교해줘"}),
+    # 요청마다 다른 검색어: 캐시 미스 경로(esearch, efetch, iCite, IR 판정과 공유 저장소 읽기/쓰기) 측정
+    "search_cold": ("GET", "/api/search", lambda i: {"query": f"TACE {RUN_ID} {i}", "page_size": 100}),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} 응답 없음")
+
+
+@contextmanager
+def run_process(args: list[str], env: dict[str, str], ready_url: str):
+    process = subprocess.Popen(args, cwd=ROOT_DIR, env={**os.environ, **env})
+    try:
+        wait_until_ready(ready_url)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+@contextmanager
+def stub_and_app(latency_ms: float, jitter_ms: float, error_rate: float, app_env: dict[str, str], workers: int = 1):
+    """스텁 서버와 앱 서버를 띄우고 앱 base URL을 반환합니다."""
+
+    stub_port = free_port()
+    app_port = free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    stub_args = [
+        sys.executable, "-m", "benchmarks.stubs", "--port", str(stub_port),
+        "--latency-ms", str(latency_ms), "--jitter-ms", str(jitter_ms),
+        "--error-rate", str(error_rate),
+    ]
+    app_args = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(app_port), "--log-level", "warning",
+        "--workers", str(workers),
+    ]
+
+    with run_process(stub_args, {}, f"{stub_url}/_stub/stats"):
+        with run_process(app_args, {**stub_env(stub_url), **app_env}, f"{app_url}/health"):
+            if workers > 1:
+                # 모든 워커가 요청을 받을 준비가 될 때까지 잠시 대기
+                time.sleep(1.0 + 0.5 * workers)
+            yield app_url
+
+
+async def run_scenario(app_url: str, name: str, concurrency: int, total: int) -> dict:
+    method, path, payload = SCENARIOS[name]
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient):
+        for index in counter:
+            body = payload(index) if callable(payload) else payload
+            start = time.perf_counter()
+            try:
+                if method == "GET":
+                    response = await client.get(path, params=body)
+                else:
+                    response = await client.post(path, json=body)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=app_url, timeout=120.0, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    stats = summarize_samples(latencies)
+    stats.update({
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else None,
+        "statuses": statuses,
+    })
+    return stats
+
+
+async def run_all(app_url: str, scenarios: list[str], concurrency: int, total: int) -> dict:
+    results = {}
+    for name in scenarios:
+        stats = await run_scenario(app_url, name, concurrency, total)
+        results[name] = stats
+        print(
+            f"{name:<18} rps={stats['rps']:8.1f}  p50={stats['p50_ms']:8.1f} ms  "
+            f"p95={stats['p95_ms']:8.1f} ms  p99={stats['p99_ms']:8.1f} ms  {stats['statuses']}"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 부하 테스트")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="시나리오별 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="스텁 업스트림 지연")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--app-url", default=None, help="이미 실행 중인 앱 대상으로 측정")
+    parser.add_argument("--app-env", default="{}", help="앱에 추가로 넘길 환경 변수 JSON")
+    parser.add_argument("--workers", type=int, default=1, help="앱 워커 프로세스 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    def measure(app_url: str) -> dict:
+        return asyncio.run(run_all(app_url, args.scenarios, args.concurrency, args.requests))
+
+    if args.app_url:
+        results = measure(args.app_url)
+    else:
+        app_env = {"WEB_CONCURRENCY": str(args.workers), **json.loads(args.app_env)}
+        with stub_and_app(args.latency_ms, args.jitter_ms, args.error_rate, app_env, args.workers) as app_url:
+            results = measure(app_url)
+
+    results["_config"] = {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "workers": args.workers,
+    }
+    path = save_results("load", results, args.output)
+    print(f"\n결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
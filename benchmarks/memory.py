@@ -0,0 +1,80 @@
+"""논문 1만 건 기준 메모리 사용량 비교: pydantic Paper vs PaperRecord
+
+    python -m benchmarks.memory --papers 10000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from app.models.schemas import Paper
+from app.services.pubmed import parse_pubmed_xml
+from benchmarks.fixtures import synthesize_efetch_xml, synthetic_pmids
+from benchmarks.results import save_results
+
+
+def _fresh(value: str) -> str:
+    """intern되지 않은 새 문자열 객체를 만듭니다 (XML 파서가 요소마다 새 문자열을 만드는 것과 동일)."""
+    return value.encode("utf-8").decode("utf-8")
+
+
+def build_pydantic(records) -> list[Paper]:
+    """기존 방식처럼 요소마다 새 문자열과 리스트를 가진 Paper 모델을 만듭니다."""
+    return [
+        Paper(
+            pmid=_fresh(r.pmid),
+            title=_fresh(r.title),
+            authors=[_fresh(a) for a in r.authors],
+            abstract=_fresh(r.abstract),
+            pub_date=_fresh(r.pub_date),
+            journal=_fresh(r.journal),
+            keywords=[_fresh(k) for k in r.terms()],
+            pmc_id=r.pmc_id,
+        )
+        for r in records
+    ]
+
+
+def retained_bytes(factory) -> tuple[int, object]:
+    """factory()가 만든 객체가 유지하는 메모리(바이트)를 측정합니다."""
+
+    gc.collect()
+    tracemalloc.start()
+    result = factory()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def run(n: int) -> dict:
+    xml_data = synthesize_efetch_xml(synthetic_pmids(n))
+
+    record_bytes, records = retained_bytes(lambda: parse_pubmed_xml(xml_data))
+    paper_bytes, papers = retained_bytes(lambda: build_pydantic(records))
+
+    results = {
+        "pydantic_paper": {"papers": n, "bytes": paper_bytes, "bytes_per_paper": paper_bytes / n},
+        "paper_record": {"papers": n, "bytes": record_bytes, "bytes_per_paper": record_bytes / n},
+    }
+
+    for name, stats in results.items():
+        print(f"{name:<16} {stats['bytes'] / 1024 / 1024:8.2f} MiB  {stats['bytes_per_paper']:8.0f} B/paper")
+    print(f"절감률: {(1 - record_bytes / paper_bytes) * 100:.1f}%")
+
+    del papers
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="논문 모델 메모리 벤치마크")
+    parser.add_argument("--papers", type=int, default=10000)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    path = save_results("memory", run(args.papers), args.output)
+    print(f"\n결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
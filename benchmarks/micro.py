@@ -0,0 +1,68 @@
+"""CPU 핫패스 마이크로벤치마크 (XML 파싱, 분석 함수, CSV 생성)
+
+    python -m benchmarks.micro --sizes 20 100 500 --repeat 7
+"""
+
+import argparse
+import time
+
+from app.routers.export import build_csv_content
+from app.services.analyzer import analyze_keywords, analyze_trends, analyze_authors
+from app.services.pubmed import parse_pubmed_xml
+from benchmarks.fixtures import synthesize_efetch_xml, synthetic_pmids
+from benchmarks.results import save_results, summarize_samples
+
+
+def measure(func, *args, repeat: int = 7, warmup: int = 1) -> list[float]:
+    """func(*args)를 repeat번 실행한 소요 시간(초) 목록을 반환합니다."""
+
+    for _ in range(warmup):
+        func(*args)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(sizes: list[int], repeat: int) -> dict:
+    results = {}
+
+    for size in sizes:
+        xml_data = synthesize_efetch_xml(synthetic_pmids(size))
+        papers = parse_pubmed_xml(xml_data)
+
+        cases = {
+            "parse_pubmed_xml": (parse_pubmed_xml, xml_data),
+            "analyze_keywords": (analyze_keywords, papers, 20),
+            "analyze_trends": (analyze_trends, papers),
+            "analyze_authors": (analyze_authors, papers, 20),
+            "build_csv_content": (build_csv_content, papers),
+        }
+
+        for name, (func, *args) in cases.items():
+            stats = summarize_samples(measure(func, *args, repeat=repeat))
+            stats["papers"] = size
+            stats["papers_per_s"] = size / (stats["mean_ms"] / 1000) if stats["mean_ms"] else None
+            results[f"{name}[{size}]"] = stats
+            print(f"{name:<20} n={size:<6} mean={stats['mean_ms']:9.3f} ms  p95={stats['p95_ms']:9.3f} ms")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마이크로벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    path = save_results("micro", results, args.output)
+    print(f"\n결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
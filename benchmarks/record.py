@@ -0,0 +1,45 @@
+"""실제 업스트림에서 fixtures를 다시 녹화합니다 (네트워크 필요).
+
+    python -m benchmarks.record --query "chemoembolization hepatocellular carcinoma" --retmax 3
+
+Groq 응답은 API 키 노출과 비용 문제로 녹화하지 않고 groq_chat.json을 유지합니다.
+"""
+
+import argparse
+import json
+
+import httpx
+
+from app.config import PUBMED_ESEARCH_URL, PUBMED_EFETCH_URL, ICITE_API_URL, NCBI_API_KEY
+from benchmarks.fixtures import FIXTURES_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fixtures 녹화")
+    parser.add_argument("--query", default="chemoembolization hepatocellular carcinoma")
+    parser.add_argument("--retmax", type=int, default=3)
+    args = parser.parse_args()
+
+    params = {"db": "pubmed", "term": args.query, "retmax": args.retmax, "retmode": "json"}
+    if NCBI_API_KEY:
+        params["api_key"] = NCBI_API_KEY
+
+    with httpx.Client(timeout=30.0) as client:
+        esearch = client.get(PUBMED_ESEARCH_URL, params=params)
+        esearch.raise_for_status()
+        pmids = esearch.json()["esearchresult"]["idlist"]
+
+        efetch = client.get(PUBMED_EFETCH_URL, params={"db": "pubmed", "id": ",".join(pmids), "retmode": "xml"})
+        efetch.raise_for_status()
+
+        icite = client.get(ICITE_API_URL, params={"pmids": ",".join(pmids), "format": "json"})
+        icite.raise_for_status()
+
+    (FIXTURES_DIR / "esearch.json").write_text(json.dumps(esearch.json(), indent=2), encoding="utf-8")
+    (FIXTURES_DIR / "efetch.xml").write_text(efetch.text, encoding="utf-8")
+    (FIXTURES_DIR / "icite.json").write_text(json.dumps(icite.json(), indent=2), encoding="utf-8")
+    print(f"{len(pmids)}개 논문 녹화 완료: {', '.join(pmids)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""벤치마크 결과 저장/비교 공통 유틸"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment() -> dict:
+    """결과를 커밋/머신 간 비교할 수 있도록 실행 환경을 기록합니다."""
+    return {
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def summarize_samples(samples: list[float]) -> dict:
+    """초 단위 샘플을 ms 단위 통계로 요약합니다."""
+
+    if not samples:
+        return {"n": 0}
+
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def save_results(kind: str, results: dict, output: str | None = None) -> Path:
+    """결과를 benchmarks/results/<kind>-<git rev>.json (또는 지정 경로)에 저장합니다."""
+
+    payload = {"kind": kind, "environment": environment(), "results": results}
+    path = Path(output) if output else RESULTS_DIR / f"{kind}-{payload['environment']['git_revision']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def load_results(path: str) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
@@ -0,0 +1,95 @@
+"""콜드 스타트 벤치마크: 프로세스 시작부터 첫 /api/search 성공까지 걸리는 시간
+
+캐시 파일이 없는 완전 콜드 스타트와, 직전 실행이 남긴 캐시를 복원하는 재시작을 각각 측정합니다.
+
+    python -m benchmarks.startup --runs 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.load import ROOT_DIR, free_port, run_process
+from benchmarks.results import save_results, summarize_samples
+from benchmarks.stubs import stub_env
+
+SEARCH_PARAMS = {"query": "TACE hepatocellular carcinoma", "page_size": 20}
+
+
+def time_to_first_search(stub_url: str, cache_dir: str, app_env: dict[str, str]) -> dict:
+    port = free_port()
+    app_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, **stub_env(stub_url), "CACHE_DIR": cache_dir, **app_env}
+    args = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(args, cwd=ROOT_DIR, env=env)
+    first_health = None
+    try:
+        while True:
+            if time.perf_counter() - started > 60:
+                raise RuntimeError("60초 안에 검색 응답 없음")
+            try:
+                if first_health is None and httpx.get(f"{app_url}/health", timeout=1.0).status_code == 200:
+                    first_health = time.perf_counter() - started
+                if first_health is not None:
+                    response = httpx.get(f"{app_url}/api/search", params=SEARCH_PARAMS, timeout=30.0)
+                    if response.status_code == 200:
+                        return {
+                            "to_health_s": first_health,
+                            "to_first_search_s": time.perf_counter() - started,
+                        }
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+    finally:
+        # 정상 종료 시 캐시가 저장되어 다음 실행에서 복원됨
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="콜드 스타트 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="스텁 업스트림 지연")
+    parser.add_argument("--fast-startup", choices=["true", "false"], default="true")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    stub_port = free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    stub_args = [sys.executable, "-m", "benchmarks.stubs", "--port", str(stub_port), "--latency-ms", str(args.latency_ms)]
+    app_env = {"FAST_STARTUP": args.fast_startup}
+
+    samples = {"cold": [], "warm_cache": []}
+    with run_process(stub_args, {}, f"{stub_url}/_stub/stats"):
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                samples["cold"].append(time_to_first_search(stub_url, cache_dir, app_env))
+                samples["warm_cache"].append(time_to_first_search(stub_url, cache_dir, app_env))
+
+    results = {}
+    for mode, runs in samples.items():
+        for metric in ("to_health_s", "to_first_search_s"):
+            stats = summarize_samples([run[metric] for run in runs])
+            results[f"{mode}.{metric}"] = stats
+            print(f"{mode:<11} {metric:<18} p50={stats['p50_ms']:8.1f} ms  max={stats['max_ms']:8.1f} ms")
+    results["_config"] = {"runs": args.runs, "latency_ms": args.latency_ms, "fast_startup": args.fast_startup}
+
+    path = save_results("startup", results, args.output)
+    print(f"\n결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
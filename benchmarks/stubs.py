@@ -0,0 +1,235 @@
+"""E-utilities, iCite, Groq 로컬 스텁 서버
+
+네트워크 없이 앱 전체를 돌려보기 위한 대역입니다. 녹화된 응답(fixtures)을 기반으로
+요청한 PMID에 맞는 응답을 만들어 주며, 업스트림별 지연 시간과 오류 주입을 설정할 수 있습니다.
+
+    python -m benchmarks.stubs --port 9100 --latency-ms 150 --jitter-ms 50 --error-rate 0.01
+
+앱은 다음 환경 변수로 스텁을 바라보게 합니다.
+
+    PUBMED_EUTILS_BASE_URL=http://127.0.0.1:9100/entrez/eutils
+    ICITE_API_URL=http://127.0.0.1:9100/api/pubs
+    GROQ_BASE_URL=http://127.0.0.1:9100
+    GROQ_API_KEY=stub
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+from dataclasses import dataclass, asdict, field
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from benchmarks.fixtures import (
+    esearch_response,
+    groq_response,
+    icite_response,
+    synthesize_efetch_xml,
+)
+
+UPSTREAMS = ("esearch", "efetch", "icite", "groq")
+
+# 검색어 하나당 가짜 전체 결과 수
+STUB_TOTAL_RESULTS = 5000
+
+
+@dataclass
+class UpstreamBehavior:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # 꼬리 지연: slow_rate 비율의 요청에 slow_ms를 더함
+    slow_rate: float = 0.0
+    slow_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+
+@dataclass
+class StubConfig:
+    seed: int = 42
+    upstreams: dict[str, UpstreamBehavior] = field(
+        default_factory=lambda: {name: UpstreamBehavior() for name in UPSTREAMS}
+    )
+
+    def update(self, data: dict) -> None:
+        """{"default": {...}, "efetch": {...}} 형태로 동작을 바꿉니다."""
+
+        default = data.get("default", {})
+        for name in UPSTREAMS:
+            behavior = self.upstreams[name]
+            for key, value in {**default, **data.get(name, {})}.items():
+                if hasattr(behavior, key):
+                    setattr(behavior, key, type(getattr(behavior, key))(value))
+
+
+config = StubConfig()
+stats = {name: {"requests": 0, "errors": 0} for name in UPSTREAMS}
+_rng = random.Random(config.seed)
+
+app = FastAPI(title="PubMed Analyzer upstream stubs")
+
+
+async def _inject(upstream: str) -> Response | None:
+    """설정된 지연을 적용하고, 오류를 주입할 차례면 오류 응답을 반환합니다."""
+
+    behavior = config.upstreams[upstream]
+    stats[upstream]["requests"] += 1
+
+    delay = behavior.latency_ms + _rng.uniform(-behavior.jitter_ms, behavior.jitter_ms)
+    if behavior.slow_rate and _rng.random() < behavior.slow_rate:
+        delay += behavior.slow_ms
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+
+    if behavior.error_rate and _rng.random() < behavior.error_rate:
+        stats[upstream]["errors"] += 1
+        return JSONResponse({"error": "injected"}, status_code=behavior.error_status)
+    return None
+
+
+def _pmids_for_term(term: str, retstart: int, retmax: int) -> list[str]:
+    """검색어마다 고정된 PMID 목록을 만듭니다."""
+
+    base = int(hashlib.sha1(term.encode("utf-8")).hexdigest()[:6], 16) * 100
+    end = min(retstart + retmax, STUB_TOTAL_RESULTS)
+    return [str(10000000 + base + i) for i in range(retstart, end)]
+
+
+async def _params(request: Request) -> dict:
+    params = dict(request.query_params)
+    if request.method == "POST":
+        form = await request.form()
+        params.update({k: str(v) for k, v in form.items()})
+    return params
+
+
+@app.api_route("/entrez/eutils/esearch.fcgi", methods=["GET", "POST"])
+async def esearch(request: Request):
+    if (error := await _inject("esearch")) is not None:
+        return error
+
+    params = await _params(request)
+    retstart = int(params.get("retstart", 0))
+    retmax = int(params.get("retmax", 20))
+    pmids = _pmids_for_term(params.get("term", ""), retstart, retmax)
+    return JSONResponse(esearch_response(pmids, STUB_TOTAL_RESULTS))
+
+
+@app.api_route("/entrez/eutils/efetch.fcgi", methods=["GET", "POST"])
+async def efetch(request: Request):
+    if (error := await _inject("efetch")) is not None:
+        return error
+
+    params = await _params(request)
+    pmids = [p for p in params.get("id", "").split(",") if p]
+    xml = synthesize_efetch_xml(pmids, seed=config.seed)
+    return Response(content=xml, media_type="text/xml")
+
+
+@app.get("/api/pubs")
+async def icite(request: Request):
+    if (error := await _inject("icite")) is not None:
+        return error
+
+    pmids = [p for p in request.query_params.get("pmids", "").split(",") if p]
+    return JSONResponse(icite_response(pmids))
+
+
+@app.post("/openai/v1/chat/completions")
+async def groq_chat(request: Request):
+    if (error := await _inject("groq")) is not None:
+        return error
+
+    body = await request.json()
+    prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+
+    # IR 감지 프롬프트: 입력된 PMID마다 판정을 돌려줌
+    pmids = re.findall(r'"pmid":\s*"(\d+)"', prompt)
+    if pmids:
+        verdicts = {pmid: int(pmid) % 3 == 0 for pmid in pmids}
+        return JSONResponse(groq_response(json.dumps(verdicts)))
+
+    # 검색 쿼리 생성 프롬프트
+    if "QUERY:" in prompt:
+        return JSONResponse(groq_response(
+            "QUERY: (chemoembolization[MeSH Terms]) AND (hepatocellular carcinoma[Title/Abstract])\n"
+            "EXPLANATION: 간세포암 화학색전술 관련 논문을 찾기 위한 쿼리입니다.\n"
+            "KEYWORDS: TACE, hepatocellular carcinoma, chemoembolization"
+        ))
+
+    return JSONResponse(groq_response())
+
+
+@app.get("/_stub/config")
+async def get_config():
+    return {"seed": config.seed, "upstreams": {k: asdict(v) for k, v in config.upstreams.items()}}
+
+
+@app.post("/_stub/config")
+async def set_config(request: Request):
+    config.update(await request.json())
+    return await get_config()
+
+
+@app.get("/_stub/stats")
+async def get_stats():
+    return stats
+
+
+@app.post("/_stub/reset")
+async def reset_stats():
+    for counters in stats.values():
+        counters["requests"] = counters["errors"] = 0
+    return stats
+
+
+def stub_env(base_url: str) -> dict[str, str]:
+    """앱이 스텁 서버를 바라보게 하는 환경 변수를 반환합니다."""
+
+    base_url = base_url.rstrip("/")
+    return {
+        "PUBMED_EUTILS_BASE_URL": f"{base_url}/entrez/eutils",
+        "ICITE_API_URL": f"{base_url}/api/pubs",
+        "GROQ_BASE_URL": base_url,
+        "GROQ_API_KEY": "stub",
+        "NCBI_API_KEY": "",
+        # 스텁에는 호출 한도가 없으므로 앱 측 레이트 리밋을 풀어 처리량 자체를 측정
+        "NCBI_RATE_LIMIT": "100000",
+        "GROQ_RATE_LIMIT": "100000",
+        "GROQ_RATE_BURST": "100000",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업스트림 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--upstream-config",
+        default="{}",
+        help='업스트림별 설정 JSON, 예: \'{"efetch": {"latency_ms": 800}}\'',
+    )
+    args = parser.parse_args()
+
+    config.update({
+        "default": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+        },
+        **json.loads(args.upstream_config),
+    })
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,18 @@ let generatedQuery = null;
 const BOOKMARKS_KEY = 'pubmed_bookmarks';
 const HISTORY_KEY = 'pubmed_search_history';
 
+// 다음 페이지 미리 가져오기용 클라이언트 ID (탭마다 하나)
+const CLIENT_ID_KEY = 'pubmed_client_id';
+
+function getClientId() {
+    let clientId = sessionStorage.getItem(CLIENT_ID_KEY);
+    if (!clientId) {
+        clientId = Math.random().toString(36).slice(2) + Date.now().toString(36);
+        sessionStorage.setItem(CLIENT_ID_KEY, clientId);
+    }
+    return clientId;
+}
+
 // DOM 요소
 const searchForm = document.getElementById('search-form');
 const resultsSection = document.getElementById('results-section');
@@ -503,7 +515,14 @@ async function useGeneratedQuery() {
     await loadAnalysis();
 }
 
+// 진행 중인 검색 요청 (새 검색을 시작하면 취소해 서버 측 처리도 중단되게 함)
+let searchController = null;
+
 async function searchPapers() {
+    if (searchController) searchController.abort();
+    const controller = new AbortController();
+    searchController = controller;
+
     showLoading();
 
     try {
@@ -511,14 +530,16 @@ async function searchPapers() {
             query: currentSearch.query,
             page: currentSearch.page,
             page_size: currentSearch.page_size,
-            sort_by: currentSearch.sort_by
+            sort_by: currentSearch.sort_by,
+            prefetch: 'true',
+            client_id: getClientId()
         });
 
         if (currentSearch.author) params.append('author', currentSearch.author);
         if (currentSearch.start_date) params.append('start_date', currentSearch.start_date);
         if (currentSearch.end_date) params.append('end_date', currentSearch.end_date);
 
-        const response = await fetch(`/api/search?${params}`);
+        const response = await fetch(`/api/search?${params}`, { signal: controller.signal });
         const data = await response.json();
 
         currentSearch.total = data.total;
@@ -528,9 +549,13 @@ async function searchPapers() {
         resultsSection.style.display = 'block';
         exportBtn.disabled = false;
     } catch (error) {
+        if (error.name === 'AbortError') return;
         alert('검색 중 오류가 발생했습니다: ' + error.message);
     } finally {
-        hideLoading();
+        if (searchController === controller) {
+            searchController = null;
+            hideLoading();
+        }
     }
 }
 